@@ -15,6 +15,8 @@ if not BASE_MODELS_DIR:
 DINOV2_REPO_PATH = settings.DINO_MODEL_PATH or os.path.join(BASE_MODELS_DIR, "DINOv2")
 # Path to local weights if not downloading automatically
 DINOV2_WEIGHTS_PATH = os.path.join(DINOV2_REPO_PATH, "model.safetensors")
+# ONNX export used when DINO_BACKEND=onnx (see scripts/export_dino_onnx.py)
+DINOV2_ONNX_PATH = settings.DINO_ONNX_PATH or os.path.join(DINOV2_REPO_PATH, "dinov2.onnx")
 
 # --- SwinIR Configuration ---
 # If using a local clone of the SwinIR repository
@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str | None = None
     PERF_PROFILE: str = "balanced"
     PP1_MAX_DETECTIONS: int = 1
+    PP1_MIN_DET_CONF: float = 0.25
+    PP1_MIN_CROP_SIDE: int = 8
+    PP1_MIN_CROP_AREA: int = 256
+    PP1_MAX_CONCURRENCY: int = 2
+    PP1_CROP_CACHE_SIZE: int = 256
+    PP1_EMBED_FMT: str = "float"
     PP1_ENABLE_REASONER: bool = True
     PP1_GEMINI_INCLUDE_IMAGE: bool = True
     PP1_GEMINI_MODEL: str = "models/gemini-2.5-flash"
@@ -25,7 +31,14 @@ class Settings(BaseSettings):
     PP1_GEMINI_TEMPERATURE: float = 0.1
     PP1_GEMINI_MAX_OUTPUT_TOKENS: int = 320
     PP1_GEMINI_THINKING_LEVEL: str = "low"
+    PP1_USE_BATCH: bool = False
+    PP1_GEMINI_BATCH_MAX_ITEMS: int = 64
+    PP1_GEMINI_BATCH_IDLE_S: float = 5.0
+    PP1_GEMINI_BATCH_POLL_S: float = 30.0
+    PP1_GEMINI_BATCH_TIMEOUT_S: int = 86400
     PP1_DINO_TIMEOUT_S: int = 10
+    PP1_INCLUDE_TIMINGS_IN_RESPONSE: bool = False
+    PP1_TIMINGS_LOG_PATH: str | None = None
     FLORENCE_FAST_MAX_NEW_TOKENS: int = 96
     FLORENCE_FAST_NUM_BEAMS: int = 1
     FLORENCE_TIMEOUT_MS: int = 120000
@@ -58,6 +71,18 @@ class Settings(BaseSettings):
     DINO_INPUT_SIZE: int = 224
     DINO_ENABLE_AMP: bool = True
     DINO_USE_FP16: bool = True
+    YOLO_BACKEND: str = "torch"
+    YOLO_HALF: bool = True
+    YOLO_IMGSZ: int = 640
+    YOLO_PRESHRINK: bool = True
+    YOLO_MAX_BATCH: int = 1
+    YOLO_BATCH_WAIT_MS: int = 5
+    TORCH_FAST_MATMUL: bool = True
+    WARMUP_MODELS_ON_STARTUP: bool = True
+    DINO_BACKEND: str = "torch"
+    DINO_EMBED_CACHE_SIZE: int = 1024
+    DINO_COMPILE: bool = False
+    DINO_ONNX_PATH: str | None = None
     FLORENCE_LITE_TIMEOUT_MS: int = 60000
     FLORENCE_LITE_RETRY_COUNT: int = 0
     FLORENCE_LITE_PAD_RATIO: float = 0.20
@@ -73,6 +98,7 @@ class Settings(BaseSettings):
     FLORENCE_OD_DEFAULT_CONF: float = 0.5
 
     # Gemini circuit breaker
+    GPU_MAX_CONCURRENT_INFERENCE: int = 1
     GEMINI_CB_FAILURE_THRESHOLD: int = 5
     GEMINI_CB_RECOVERY_TIMEOUT_S: int = 60
 
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import logging
 from contextlib import asynccontextmanager
@@ -11,10 +12,12 @@ from app.models import item_models  # noqa: F401
 from app.models.item_models import ensure_founder_prefill_feedback_schema
 
 # Services
-from app.services.yolo_service import YoloService
-from app.services.florence_service import FlorenceService
-from app.services.dino_embedder import DINOEmbedder
-from app.services.reasoner_factory import create_reasoner_from_settings
+from app.services.service_registry import (
+    get_dino_embedder,
+    get_florence_service,
+    get_reasoner,
+    get_yolo_service,
+)
 from app.services.unified_pipeline import UnifiedPipeline
 from app.services.faiss_service import FaissService
 from app.services.pp2_geometric_verifier import GeometricVerifier
@@ -36,6 +39,35 @@ try:
 except ImportError:
     logger.warning("pillow-heif not installed — HEIC/HEIF images from iOS gallery will fail analysis. Run: pip install pillow-heif")
 
+
+def configure_torch_inference() -> None:
+    """Enable TF32 matmuls and cuDNN autotuning for inference-only GPU workloads."""
+    if not bool(getattr(settings, "TORCH_FAST_MATMUL", True)):
+        return
+    try:
+        import torch
+
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cudnn.benchmark = True
+        logger.info("Torch inference tuning enabled (TF32 matmul, cuDNN benchmark).")
+    except Exception as e:
+        logger.warning(f"Torch inference tuning skipped: {e}")
+
+
+async def warmup_models(*services) -> None:
+    """Run the optional warmup() of each service concurrently; failures only log."""
+    async def _warm(service) -> None:
+        warmup = getattr(service, "warmup", None)
+        if warmup is None:
+            return
+        try:
+            await asyncio.to_thread(warmup)
+        except Exception:
+            logger.warning("%s warmup failed; first request will load it.", type(service).__name__, exc_info=True)
+
+    await asyncio.gather(*(_warm(service) for service in services))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # --- Startup ---
@@ -66,6 +98,7 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database configuration warning: {e}")
 
     # 4. Initialize Services
+    configure_torch_inference()
     try:
         logger.info("Initializing ML Services and Vectors...")
 
@@ -78,16 +111,18 @@ async def lifespan(app: FastAPI):
         faiss_service.load_or_create()
 
         # Initialize Model Services
-        yolo_service = YoloService()
+        yolo_service = get_yolo_service()
         try:
             yolo_service.warmup()
         except Exception:
             if yolo_service.model is None:
                 raise
             logger.warning("YOLO warmup failed; continuing with loaded model.", exc_info=True)
-        florence_service = FlorenceService()
-        dino_embedder = DINOEmbedder()
-        reasoner = create_reasoner_from_settings() if bool(getattr(settings, "PP1_ENABLE_REASONER", True)) else None
+        florence_service = get_florence_service()
+        dino_embedder = get_dino_embedder()
+        if bool(getattr(settings, "WARMUP_MODELS_ON_STARTUP", True)):
+            await warmup_models(florence_service, dino_embedder)
+        reasoner = get_reasoner() if bool(getattr(settings, "PP1_ENABLE_REASONER", True)) else None
 
         # Initialize Logic Services
         geometric_verifier = GeometricVerifier()
@@ -1,6 +1,8 @@
 """Shared bounding-box helpers used across PP1, PP2 and search."""
 
-from typing import Tuple
+from typing import Sequence, Tuple
+
+import numpy as np
 
 
 def clip_bbox(
@@ -15,3 +17,42 @@ def clip_bbox(
     x2 = max(0, min(width, int(x2)))
     y2 = max(0, min(height, int(y2)))
     return x1, y1, x2, y2
+
+
+def clip_bboxes(
+    bboxes: Sequence[Tuple[int, int, int, int]],
+    width: int,
+    height: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Clamp many (x1, y1, x2, y2) boxes at once.
+
+    Returns the clamped boxes as an (N, 4) integer array and a boolean mask
+    marking boxes that still have positive width and height.
+    """
+    boxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    xs = boxes[:, 0::2]
+    ys = boxes[:, 1::2]
+    np.clip(xs, 0, width, out=xs)
+    np.clip(ys, 0, height, out=ys)
+    valid = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+    return boxes, valid
+
+
+def usable_bbox_mask(
+    boxes: np.ndarray,
+    min_side: int,
+    min_area: int,
+    image_area: int,
+    min_area_ratio: float,
+) -> np.ndarray:
+    """Return a boolean mask of clamped (N, 4) boxes large enough to crop and analyze."""
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    box_w = boxes[:, 2] - boxes[:, 0]
+    box_h = boxes[:, 3] - boxes[:, 1]
+    areas = box_w * box_h
+    mask = (box_w > 0) & (box_h > 0)
+    mask &= np.minimum(box_w, box_h) >= min_side
+    mask &= areas >= min_area
+    if image_area > 0:
+        mask &= (areas / float(image_area)) >= min_area_ratio
+    return mask
@@ -93,6 +93,8 @@ def canonicalize_label(label: str) -> Optional[str]:
 
 # Category Specifications for Grounding & Validation
 # Used by Florence-2 (Grounding) and Gemini (Reasoning)
+# Optional boolean gates ("run_ocr", "run_color") let VLM crop analysis skip
+# sub-steps that add nothing for a category; both default to True.
 CATEGORY_SPECS = {
     "Wallet": {
         "features": ["logo", "brand name", "pattern", "texture", "card slots", "coin pouch", "zipper", "button clasp", "stitched logo", "stitching", "flap closure", "snap button", "zipper compartment", "bill compartment"],
@@ -153,7 +155,9 @@ CATEGORY_SPECS = {
             "bent key", "rust", "broken key head", "worn teeth", "scratches",
             "damaged keyring", "chipped edge", "surface corrosion"
         ],
-        "attachments": ["metal key ring attached", "lanyard attached", "tag attached", "remote key fob attached", "carabiner attached", "hook attached"]
+        "attachments": ["metal key ring attached", "lanyard attached", "tag attached", "remote key fob attached", "carabiner attached", "hook attached"],
+        # Key blade/head text is too small to read reliably; OCR only adds noise.
+        "run_ocr": False
     },
     "Power Bank": {
         "features": ["logo", "brand name", "indicator lights", "ports"],
@@ -205,3 +209,10 @@ CATEGORY_SPECS = {
         "attachments": ["lanyard", "card holder", "clip"]
     }
 }
+
+
+def spec_flag(label: Optional[str], flag: str, default: bool = True) -> bool:
+    """Return a boolean gate from CATEGORY_SPECS, falling back to default."""
+    if not label:
+        return default
+    return bool(CATEGORY_SPECS.get(label, {}).get(flag, default))
@@ -0,0 +1,74 @@
+"""
+Shared RGB image decoding for PP1, PP2 and search uploads.
+
+JPEG uploads are decoded with libjpeg-turbo (PyTurboJPEG) when it is
+installed, which uses SIMD IDCT and is several times faster than the stock
+Pillow decoder on multi-megapixel photos. Every other format, and any
+environment without the library, goes through Pillow as before.
+"""
+
+import io
+import logging
+import threading
+from typing import Any, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+_turbo_lock = threading.Lock()
+_turbo_loaded = False
+_turbo: Optional[Any] = None
+_turbo_rgb: Optional[int] = None
+
+
+def _get_turbojpeg() -> Tuple[Optional[Any], Optional[int]]:
+    """Return (TurboJPEG instance, TJPF_RGB), or (None, None) when unavailable."""
+    global _turbo_loaded, _turbo, _turbo_rgb
+    if _turbo_loaded:
+        return _turbo, _turbo_rgb
+    with _turbo_lock:
+        if not _turbo_loaded:
+            try:
+                from turbojpeg import TJPF_RGB, TurboJPEG  # type: ignore
+
+                _turbo, _turbo_rgb = TurboJPEG(), TJPF_RGB
+                logger.info("TurboJPEG decoder enabled for JPEG uploads.")
+            except Exception as exc:
+                # Missing package or libturbojpeg shared library.
+                logger.debug("TurboJPEG unavailable, using Pillow decoder: %s", exc)
+                _turbo, _turbo_rgb = None, None
+            _turbo_loaded = True
+    return _turbo, _turbo_rgb
+
+
+def decode_rgb_bytes(data: bytes) -> Tuple[Image.Image, Optional[str]]:
+    """
+    Decode encoded image bytes into a loaded RGB image.
+
+    Returns (image, source_format). Raises the same Pillow errors as
+    Image.open() for unreadable input.
+    """
+    if data[:3] == _JPEG_MAGIC:
+        turbo, pixel_format = _get_turbojpeg()
+        if turbo is not None:
+            try:
+                return Image.fromarray(turbo.decode(data, pixel_format=pixel_format)), "JPEG"
+            except Exception:
+                logger.debug("TurboJPEG decode failed, retrying with Pillow", exc_info=True)
+
+    image = Image.open(io.BytesIO(data))
+    image_format = image.format
+    image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image, image_format
+
+
+def open_rgb_image(path: str) -> Tuple[Image.Image, Optional[str]]:
+    """Read and decode an image file into RGB; see decode_rgb_bytes()."""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    return decode_rgb_bytes(data)
@@ -15,9 +15,9 @@ import shutil
 import os
 import uuid
 import logging
-from typing import List
+from typing import Any, List
 
-from fastapi import BackgroundTasks, FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import BackgroundTasks, Depends, FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from PIL import Image as PILImage
 from pydantic import BaseModel
@@ -25,9 +25,10 @@ from pydantic import BaseModel
 from app.core.lifespan import lifespan
 from app.routers import pp2_router
 from app.routers import search_router
-from app.core.db import SessionLocal, get_db
+from app.core.db import SessionLocal
 from app.models.item_models import FounderPrefillFeedbackRecord
 from app.services.storage_service import StorageService
+from app.services.crop_cache import CropResultCache
 from app.services.founder_prefill_analytics import compute_founder_prefill_analytics
 from app.services.pre_analysis_job_store import get_job, save_job, update_job
 from app.config.settings import settings
@@ -205,9 +206,14 @@ def _save_upload_to_temp(file: UploadFile) -> tuple[str, str]:
 
     with open(temp_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
+        saved_size = buffer.tell()
 
     with open(temp_path, "rb") as saved_file:
         raw_header = saved_file.read(16)
+    logger.info(
+        "PP1_TEMP_SAVE: path=%s ext=%s size=%d magic=%s",
+        temp_path, file_ext, saved_size, raw_header.hex(),
+    )
 
     is_heic = (
         len(raw_header) >= 12
@@ -259,6 +265,19 @@ def _select_accepted_pp1_detection(result: dict | list) -> dict | None:
     return None
 
 
+def _store_accepted_pp1_results(result: Any) -> None:
+    """Persist accepted PP1 detections in one short-lived DB session."""
+    db = SessionLocal()
+    try:
+        storage = StorageService(db)
+        for item in result if isinstance(result, list) else [result]:
+            item_id = item.get("item_id")
+            if item_id and item.get("status") in ("accepted", "accepted_degraded"):
+                storage.store_pp1_result(item_id, item)
+    finally:
+        db.close()
+
+
 async def _run_pp1_analysis_job(app: FastAPI, task_id: str, temp_path: str) -> None:
     """Run PP1 after the app has already received a task id."""
 
@@ -280,15 +299,7 @@ async def _run_pp1_analysis_job(app: FastAPI, task_id: str, temp_path: str) -> N
         update_job(task_id, _stage_payload("finalizing", "pp1", 1))
 
         try:
-            db = SessionLocal()
-            try:
-                storage = StorageService(db)
-                for item in result if isinstance(result, list) else [result]:
-                    item_id = item.get("item_id")
-                    if item_id and item.get("status") in ("accepted", "accepted_degraded"):
-                        storage.store_pp1_result(item_id, item)
-            finally:
-                db.close()
+            await asyncio.to_thread(_store_accepted_pp1_results, result)
         except Exception:
             logger.warning("PP1 async storage failed (non-fatal)", exc_info=True)
 
@@ -301,11 +312,42 @@ async def _run_pp1_analysis_job(app: FastAPI, task_id: str, temp_path: str) -> N
     finally:
         _cleanup_temp_paths([temp_path])
 
+def _current_unified_pipeline(app_obj: FastAPI) -> Any:
+    """Return the lifespan-built UnifiedPipeline (or the module fallback), else None."""
+    current = getattr(app_obj.state, "unified_pipeline", None)
+    return current if current is not None else globals().get("pipeline")
+
+
+def get_unified_pipeline(request: Request) -> Any:
+    """
+    Dependency returning the process-wide UnifiedPipeline.
+
+    The lifespan builds it once with the shared model services; routes must
+    never construct their own, which would reload YOLO, Florence and DINO.
+    """
+    current = _current_unified_pipeline(request.app)
+    if current is None:
+        raise HTTPException(status_code=500, detail="UnifiedPipeline not initialized.")
+    return current
+
+
 @app.get("/")
 def read_root():
     return {"message": "Vision Core Backend is running."}
 
 
+@app.get("/metrics")
+def read_metrics(request: Request):
+    """Report in-process cache hit/miss counters for the shared PP1 pipeline."""
+    pipeline_obj = _current_unified_pipeline(request.app)
+    crop_cache = getattr(pipeline_obj, "_crop_cache", None)
+    dino_cache = getattr(getattr(pipeline_obj, "dino", None), "_embed_cache", None)
+    return {
+        "pp1_crop_cache": crop_cache.stats() if isinstance(crop_cache, CropResultCache) else None,
+        "dino_embed_cache": dino_cache.stats() if isinstance(dino_cache, CropResultCache) else None,
+    }
+
+
 @app.post("/feedback/founder-prefill")
 async def log_founder_prefill_feedback(payload: FounderPrefillFeedbackPayload):
     db = SessionLocal()
@@ -371,8 +413,8 @@ async def log_founder_prefill_feedback(payload: FounderPrefillFeedbackPayload):
 
 @app.post("/pp1/analyze")
 async def analyze_pp1(
-    request: Request,
     files: List[UploadFile] = File(...),
+    pipeline: Any = Depends(get_unified_pipeline),
 ):
     """
     Phase 1 Analysis: Single Image -> YOLO -> Florence -> Gemini.
@@ -385,90 +427,33 @@ async def analyze_pp1(
         raise HTTPException(status_code=400, detail="PP1 requires exactly one image.")
     
     file = files[0]
-    # Basic extension check/sanitization
     filename = file.filename or "image.jpg"
-    file_ext = filename.split(".")[-1] if "." in filename else "jpg"
-    temp_filename = f"{uuid.uuid4()}.{file_ext}"
-    temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-
     logger.info("PP1_UPLOAD: filename=%s content_type=%s", filename, file.content_type)
-    
-    try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Log saved file size and magic bytes to diagnose format issues
-        saved_size = os.path.getsize(temp_path)
-        with open(temp_path, "rb") as f:
-            raw_header = f.read(16)
-        magic = raw_header.hex()
-        logger.info("PP1_TEMP_SAVE: path=%s ext=%s size=%d magic=%s", temp_path, file_ext, saved_size, magic)
-
-        # Detect HEIC/HEIF by magic bytes (ftyp box at offset 4) and convert to JPEG
-        # This handles iOS gallery images which are always HEIC regardless of the filename extension
-        _is_heic = len(raw_header) >= 12 and raw_header[4:8] == b"ftyp" and raw_header[8:12] in (
-            b"heic", b"heif", b"heix", b"hevc", b"hevx", b"mif1", b"msf1"
-        )
-        if _is_heic:
-            logger.info("PP1_HEIC_DETECTED: Converting HEIC -> JPEG for %s", temp_path)
-            try:
-                import pillow_heif as _pillow_heif
-                _heif = _pillow_heif.open_heif(temp_path, convert_hdr_to_8bit=True)
-                _pil = _heif.to_pillow()
-                _jpeg_path = os.path.splitext(temp_path)[0] + "_converted.jpg"
-                _pil.save(_jpeg_path, "JPEG", quality=92)
-                os.remove(temp_path)
-                temp_path = _jpeg_path
-                logger.info("PP1_HEIC_CONVERTED: saved JPEG -> %s", temp_path)
-            except ImportError:
-                logger.error(
-                    "PP1_HEIC_CONVERT_FAILED: pillow-heif not installed. "
-                    "Run: .\\venv\\Scripts\\python -m pip install pillow-heif"
-                )
-                raise HTTPException(
-                    status_code=422,
-                    detail="HEIC image format requires pillow-heif. Please use a JPEG/PNG image or contact support."
-                )
-            except Exception as _heic_err:
-                logger.error("PP1_HEIC_CONVERT_FAILED: %r", str(_heic_err))
-                raise HTTPException(status_code=422, detail=f"Failed to convert HEIC image: {_heic_err}")
 
-        # Call the pipeline from app state (shared service instances). This is
+    # Disk writes, HEIC conversion, model inference, and DB writes all block,
+    # so they run in worker threads to keep the event loop serving requests.
+    temp_path, _ = await asyncio.to_thread(_save_upload_to_temp, file)
+    try:
+        # The pipeline comes from app state (shared service instances). This is
         # why expensive model objects are initialized once at startup instead
         # of being recreated for every upload.
         try:
-            pipeline = getattr(request.app.state, "unified_pipeline", None)
-            if pipeline is None:
-                pipeline = globals().get("pipeline")
-            if pipeline is None:
-                raise HTTPException(status_code=500, detail="UnifiedPipeline not initialized.")
-            result = pipeline.process_pp1(temp_path)
-        except HTTPException:
-            raise
+            result = await asyncio.to_thread(pipeline.process_pp1, temp_path)
         except Exception:
             logger.exception("PP1 processing failed unexpectedly.")
             raise HTTPException(status_code=500, detail="PP1 processing failed")
 
         # Persist PP1 results to DB
         try:
-            db = next(get_db())
-            storage = StorageService(db)
-            for item in result if isinstance(result, list) else [result]:
-                item_id = item.get("item_id")
-                if item_id and item.get("status") in ("accepted", "accepted_degraded"):
-                    storage.store_pp1_result(item_id, item)
+            await asyncio.to_thread(_store_accepted_pp1_results, result)
         except Exception:
             logger.warning("PP1 storage failed (non-fatal)", exc_info=True)
 
         return result
-        
+
     finally:
-        # Cleanup — temp_path may have been reassigned to the converted JPEG path
-        if os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except Exception:
-                logger.debug("Failed to remove temp file %s", temp_path, exc_info=True)
+        # temp_path already points at the converted JPEG for HEIC uploads.
+        _cleanup_temp_paths([temp_path])
 
 
 @app.post("/pp1/analyze_async")
@@ -480,7 +465,7 @@ async def analyze_pp1_async(
     if len(files) != 1:
         raise HTTPException(status_code=400, detail="PP1 requires exactly one image.")
 
-    temp_path, _ = _save_upload_to_temp(files[0])
+    temp_path, _ = await asyncio.to_thread(_save_upload_to_temp, files[0])
     task_id = str(uuid.uuid4())
     initial_payload = _stage_payload("queued", "pp1", 1)
     save_job(task_id, initial_payload)
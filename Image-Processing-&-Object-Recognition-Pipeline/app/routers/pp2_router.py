@@ -12,7 +12,6 @@ import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Depends, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import io
 import os
 import time
 import uuid
@@ -20,6 +19,7 @@ import logging
 from PIL import Image
 from tempfile import NamedTemporaryFile
 from app.core.db import get_db, SessionLocal
+from app.domain.image_decode import decode_rgb_bytes
 from app.services.pre_analysis_job_store import save_job, update_job
 
 # Internal
@@ -185,7 +185,7 @@ async def verify_pair(
         def process_image(upload_file: UploadFile) -> Image.Image:
             content = upload_file.file.read()
             upload_file.file.seek(0)
-            img = Image.open(io.BytesIO(content)).convert("RGB")
+            img, _ = decode_rgb_bytes(content)
             
             # Detect
             detections = pipeline.yolo.detect_objects(img)
@@ -214,9 +214,13 @@ async def verify_pair(
         crop1 = process_image(files[0])
         crop2 = process_image(files[1])
 
-        # Embeddings
-        vec1 = pipeline.dino.embed_128(crop1)
-        vec2 = pipeline.dino.embed_128(crop2)
+        # Embeddings (both crops share one DINO forward pass when supported)
+        if hasattr(pipeline.dino, "embed_both_batch"):
+            _, vecs_128 = pipeline.dino.embed_both_batch([crop1, crop2])
+            vec1, vec2 = vecs_128[0], vecs_128[1]
+        else:
+            vec1 = pipeline.dino.embed_128(crop1)
+            vec2 = pipeline.dino.embed_128(crop2)
 
         # Similarity
         sim_score = pipeline.faiss.pair_similarity(vec1, vec2)
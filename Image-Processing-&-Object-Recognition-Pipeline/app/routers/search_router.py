@@ -10,7 +10,6 @@ Module overview:
 
 from __future__ import annotations
 
-from io import BytesIO
 from typing import Any, Optional
 
 from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
@@ -18,6 +17,7 @@ import numpy as np
 from PIL import Image
 
 from app.domain.bbox_utils import clip_bbox
+from app.domain.image_decode import decode_rgb_bytes
 from app.domain.category_specs import canonicalize_label
 from app.schemas.search_schemas import IndexVectorRequest, IndexVectorResponse, SearchByImageResponse, SearchMatch
 from app.services.image_preprocessing import extract_pixel_dominant_color
@@ -118,13 +118,18 @@ def _extract_query_context(
             ocr_text = ""
 
     query_vec_768 = None
-    if hasattr(pipeline.dino, "embed_768"):
-        try:
-            query_vec_768 = np.asarray(pipeline.dino.embed_768(primary_crop), dtype=np.float32)
-        except Exception:
-            query_vec_768 = None
-
-    query_vec_128 = np.asarray(pipeline.dino.embed_128(primary_crop), dtype=np.float32)
+    if hasattr(pipeline.dino, "embed_both"):
+        # One backbone pass yields both the rerank and the FAISS query vector.
+        vec_768, vec_128 = pipeline.dino.embed_both(primary_crop)
+        query_vec_768 = np.asarray(vec_768, dtype=np.float32)
+        query_vec_128 = np.asarray(vec_128, dtype=np.float32)
+    else:
+        if hasattr(pipeline.dino, "embed_768"):
+            try:
+                query_vec_768 = np.asarray(pipeline.dino.embed_768(primary_crop), dtype=np.float32)
+            except Exception:
+                query_vec_768 = None
+        query_vec_128 = np.asarray(pipeline.dino.embed_128(primary_crop), dtype=np.float32)
     return SearchQueryContext(
         category=inferred_category,
         normalized_color=query_color,
@@ -190,7 +195,7 @@ async def search_by_image(
         content = await file.read()
         if len(content) > MAX_UPLOAD_BYTES:
             raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.")
-        image = Image.open(BytesIO(content)).convert("RGB")
+        image, _ = decode_rgb_bytes(content)
     except HTTPException:
         raise
     except Exception as exc:
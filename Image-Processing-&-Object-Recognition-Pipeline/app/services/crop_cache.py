@@ -0,0 +1,66 @@
+"""In-memory LRU cache for per-crop model outputs.
+
+Duplicate photos, re-uploads, and mirrored listings produce byte-identical
+crops. Keying Florence outputs on the crop content lets those repeats skip
+the forward pass; the DINO embedder keeps its own instance of this cache.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import hashlib
+import threading
+
+from PIL import Image
+
+
+class CropResultCache:
+    """Thread-safe LRU map from crop-derived keys to model outputs."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Create an empty cache holding at most maxsize entries."""
+        self.maxsize = max(1, int(maxsize))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(crop: Image.Image) -> str:
+        """Return a content hash for a crop, including its size and mode."""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{crop.mode}:{crop.size[0]}x{crop.size[1]}".encode("ascii"))
+        hasher.update(crop.tobytes())
+        return hasher.hexdigest()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current fill level."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -19,14 +19,17 @@ Module overview:
 
 from __future__ import annotations
 
+from contextlib import nullcontext
 from dataclasses import dataclass
 import logging
 import os
 import threading
+import time
 from typing import List, Optional, Tuple
 
 import numpy as np
 from PIL import Image
+from app.services.crop_cache import CropResultCache
 from app.services.gpu_semaphore import gpu_inference_guard
 from app.config import model_paths
 from app.config.settings import settings
@@ -44,6 +47,13 @@ class DINOEmbedder:
     _shared_model_key = None
     _shared_using_fp16 = False
     _shared_lock = threading.Lock()
+    # Dedicated CUDA stream so DINO kernels can overlap Florence work on the
+    # default stream when the GPU gate admits more than one inference.
+    _shared_cuda_stream = None
+    # ONNX Runtime session used when DINO_BACKEND=onnx (TensorRT/CUDA EPs).
+    _shared_onnx_session = None
+    _shared_onnx_processor = None
+    _shared_onnx_key = None
 
     def __init__(
         self,
@@ -67,12 +77,42 @@ class DINOEmbedder:
         self.input_size = int(getattr(settings, "DINO_INPUT_SIZE", 224))
         self.enable_amp = bool(getattr(settings, "DINO_ENABLE_AMP", True))
         self.use_fp16 = bool(getattr(settings, "DINO_USE_FP16", True))
+        self.backend = str(getattr(settings, "DINO_BACKEND", "torch") or "torch").strip().lower()
+        self.onnx_path = model_paths.DINOV2_ONNX_PATH
         self._using_fp16 = False
 
         self._processor = None
         self._model = None
         self._proj = None  # np.ndarray (D x projection_dim)
         self._model_load_lock = threading.Lock()
+        # Embeddings keyed by the prepared (resized/cropped) input, so repeat
+        # uploads of the same item skip the forward pass.
+        cache_size = int(getattr(settings, "DINO_EMBED_CACHE_SIZE", 0))
+        self._embed_cache = CropResultCache(cache_size) if cache_size > 0 else None
+        self._warmup_lock = threading.Lock()
+        self._warmup_done = False
+
+    def warmup(self) -> None:
+        """
+        Run one dummy forward pass so model loading, kernel selection and
+        allocator growth happen before the first real request.
+        """
+        if self._warmup_done:
+            return
+        with self._warmup_lock:
+            if self._warmup_done:
+                return
+            start = time.perf_counter()
+            logger.debug("DINO_WARMUP_START")
+            try:
+                # Bypass the embedding cache so the blank image is not stored.
+                dummy = self._prepare_embedding_image(Image.new("RGB", (self.input_size, self.input_size), (0, 0, 0)))
+                self._forward_768([dummy])
+                self._warmup_done = True
+                logger.debug("DINO_WARMUP_DONE elapsed_ms=%.2f", (time.perf_counter() - start) * 1000.0)
+            except Exception:
+                logger.exception("DINO_WARMUP_FAIL elapsed_ms=%.2f", (time.perf_counter() - start) * 1000.0)
+                raise
 
     def _required_model_files(self) -> Tuple[str, ...]:
         """List the model files that must exist in the configured local model directory."""
@@ -186,6 +226,14 @@ class DINOEmbedder:
             else:
                 self._using_fp16 = False
             self._model.eval()
+            if self.device == "cuda" and bool(getattr(settings, "DINO_COMPILE", False)):
+                # Batch sizes vary per request, so use the default Inductor
+                # mode rather than CUDA graphs; warmup() pays the compile cost.
+                try:
+                    self._model.forward = torch.compile(self._model.forward, mode="default")
+                    logger.info("DINO_MODEL_COMPILED")
+                except Exception:
+                    logger.warning("DINO_MODEL_COMPILE_FAILED_FALLBACK_EAGER", exc_info=True)
             with DINOEmbedder._shared_lock:
                 DINOEmbedder._shared_model = self._model
                 DINOEmbedder._shared_processor = self._processor
@@ -198,6 +246,76 @@ class DINOEmbedder:
                 self._using_fp16,
             )
 
+    def _onnx_providers(self) -> List[object]:
+        """Pick ONNX Runtime execution providers, preferring TensorRT FP16 on CUDA."""
+        import onnxruntime as ort  # type: ignore
+
+        available = set(ort.get_available_providers())
+        providers: List[object] = []
+        if self.device == "cuda":
+            if "TensorrtExecutionProvider" in available:
+                providers.append(
+                    (
+                        "TensorrtExecutionProvider",
+                        {
+                            "trt_fp16_enable": bool(self.use_fp16),
+                            "trt_engine_cache_enable": True,
+                            "trt_engine_cache_path": os.path.dirname(os.path.abspath(self.onnx_path)),
+                        },
+                    )
+                )
+            if "CUDAExecutionProvider" in available:
+                providers.append("CUDAExecutionProvider")
+        providers.append("CPUExecutionProvider")
+        return providers
+
+    def load_onnx_session(self) -> None:
+        """Load or reuse the ONNX Runtime session for DINO_BACKEND=onnx."""
+        if self._processor is not None and getattr(self, "_onnx_session", None) is not None:
+            return
+        cache_key = (os.path.abspath(str(self.onnx_path)), str(self.device), bool(self.use_fp16))
+        with DINOEmbedder._shared_lock:
+            if DINOEmbedder._shared_onnx_session is not None and DINOEmbedder._shared_onnx_key == cache_key:
+                self._onnx_session = DINOEmbedder._shared_onnx_session
+                self._processor = DINOEmbedder._shared_onnx_processor
+                return
+            try:
+                import onnxruntime as ort  # type: ignore
+                from transformers import AutoImageProcessor  # type: ignore
+            except ImportError as exc:
+                raise RuntimeError(
+                    "DINO_BACKEND=onnx requires onnxruntime-gpu (or onnxruntime) and transformers."
+                ) from exc
+            if not os.path.exists(self.onnx_path):
+                raise RuntimeError(
+                    f"DINO ONNX model not found at {self.onnx_path}. "
+                    "Export it with scripts/export_dino_onnx.py."
+                )
+            model_path = os.path.abspath(str(self.model_name))
+            processor = AutoImageProcessor.from_pretrained(model_path, local_files_only=True)
+            session = ort.InferenceSession(self.onnx_path, providers=self._onnx_providers())
+            logger.info(
+                "DINO_ONNX_SESSION_LOADED path=%s providers=%s",
+                self.onnx_path,
+                session.get_providers(),
+            )
+            DINOEmbedder._shared_onnx_session = session
+            DINOEmbedder._shared_onnx_processor = processor
+            DINOEmbedder._shared_onnx_key = cache_key
+            self._onnx_session = session
+            self._processor = processor
+
+    def _embed_768_batch_onnx(self, prepared_images: List[Image.Image]) -> np.ndarray:
+        """Create (B, 768) DINO embeddings for prepared images through the ONNX Runtime session."""
+        self.load_onnx_session()
+        pixel_values = self._processor(images=prepared_images, return_tensors="np")["pixel_values"]
+        with gpu_inference_guard("forward", "dino_onnx"):
+            (last_hidden_state,) = self._onnx_session.run(
+                ["last_hidden_state"],
+                {"pixel_values": pixel_values.astype(np.float32)},
+            )
+        return np.asarray(last_hidden_state[:, 0, :], dtype=np.float32)
+
     def _projection(self, in_dim: int) -> np.ndarray:
         """Return the deterministic projection matrix for reducing embedding dimensionality."""
         if self._proj is None or self._proj.shape[0] != in_dim:
@@ -229,24 +347,82 @@ class DINOEmbedder:
         bottom = min(new_h, top + target)
         return resized.crop((left, top, right, bottom))
 
+    @classmethod
+    def _cuda_stream(cls):
+        """Return the shared DINO CUDA stream, or None when streams are unavailable."""
+        if cls._shared_cuda_stream is None:
+            try:
+                import torch  # type: ignore
+
+                stream = torch.cuda.Stream()
+            except Exception:
+                return None
+            with cls._shared_lock:
+                if cls._shared_cuda_stream is None:
+                    cls._shared_cuda_stream = stream
+        return cls._shared_cuda_stream
+
     def embed_768(self, image: Image.Image) -> np.ndarray:
         """Create a normalized 768-dimensional DINO embedding for an image."""
+        return self.embed_768_batch([image])[0]
+
+    def embed_768_batch(self, images: List[Image.Image]) -> np.ndarray:
+        """Create (B, 768) DINO embeddings for several images in one forward pass.
+
+        Every image is resized/cropped to the same square input first, so the
+        batch stacks without padding. Prepared inputs already seen by this
+        embedder are served from the embedding cache; only the misses run
+        through the model.
+        """
+        prepared_images = [self._prepare_embedding_image(image) for image in images]
+        cache = getattr(self, "_embed_cache", None)
+        if cache is None:
+            return self._forward_768(prepared_images)
+
+        keys = [cache.digest(image) if isinstance(image, Image.Image) else None for image in prepared_images]
+        vecs: List[Optional[np.ndarray]] = [cache.get(key) if key is not None else None for key in keys]
+        missing = [idx for idx, vec in enumerate(vecs) if vec is None]
+        if missing:
+            computed = self._forward_768([prepared_images[idx] for idx in missing])
+            for idx, vec in zip(missing, computed):
+                vecs[idx] = vec
+                if keys[idx] is not None:
+                    cache.put(keys[idx], vec.copy())
+        return np.stack(vecs).astype(np.float32)
+
+    def _forward_768(self, prepared_images: List[Image.Image]) -> np.ndarray:
+        """Run the configured DINO backend on prepared images and return (B, 768) CLS vectors."""
+        if getattr(self, "backend", "torch") == "onnx":
+            return self._embed_768_batch_onnx(prepared_images)
         self.load_model()
         assert self._processor is not None and self._model is not None
 
         import torch  # type: ignore
 
-        prepared_image = self._prepare_embedding_image(image)
-        inputs = self._processor(images=prepared_image, return_tensors="pt")
-        if self.device:
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-        use_amp_cuda = bool(
-            self.device == "cuda"
-            and torch.cuda.is_available()
-            and bool(getattr(self, "enable_amp", True))
-        )
-        with torch.no_grad():
+        on_cuda = bool(self.device == "cuda" and torch.cuda.is_available())
+        normalize_on_device = on_cuda and self._can_normalize_on_device()
+        if normalize_on_device:
+            # Resize/crop stays on the CPU, but rescale + normalize run on the
+            # GPU after a single pinned copy instead of as extra float passes
+            # over every pixel on the host.
+            inputs = self._processor(
+                images=prepared_images,
+                return_tensors="pt",
+                do_rescale=False,
+                do_normalize=False,
+            )
+        else:
+            inputs = self._processor(images=prepared_images, return_tensors="pt")
+        use_amp_cuda = bool(on_cuda and bool(getattr(self, "enable_amp", True)))
+        stream = self._cuda_stream() if on_cuda else None
+        stream_ctx = torch.cuda.stream(stream) if stream is not None else nullcontext()
+        # The host copy below (.cpu()) waits on this stream, so results are
+        # ready without an explicit synchronize.
+        with stream_ctx, torch.inference_mode():
+            if normalize_on_device:
+                inputs = {"pixel_values": self._normalize_pixels_on_device(inputs["pixel_values"])}
+            elif self.device:
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
             with gpu_inference_guard("forward", "dino"):
                 with torch.autocast(
                     device_type="cuda",
@@ -256,8 +432,31 @@ class DINOEmbedder:
                     outputs = self._model(**inputs)
             # DINOv2 returns last_hidden_state: [B, N, D]
             # Use CLS token (index 0).
-            vec = outputs.last_hidden_state[:, 0, :].detach().cpu().numpy()[0]
-        return vec.astype(np.float32)
+            vecs = outputs.last_hidden_state[:, 0, :].detach().cpu().numpy()
+        return vecs.astype(np.float32)
+
+    def _can_normalize_on_device(self) -> bool:
+        """Return True when the processor exposes the rescale/normalize constants to replay on the GPU."""
+        processor = self._processor
+        return all(
+            isinstance(getattr(processor, name, None), (list, tuple, float, int))
+            for name in ("image_mean", "image_std", "rescale_factor")
+        )
+
+    def _normalize_pixels_on_device(self, pixel_values):
+        """
+        Copy un-normalized pixels to the GPU once, then rescale and normalize in place there.
+
+        Without do_rescale the processor returns uint8 pixels, so the copy also
+        casts them to float32 before the in-place arithmetic.
+        """
+        import torch  # type: ignore
+
+        processor = self._processor
+        mean = torch.as_tensor(processor.image_mean, dtype=torch.float32, device=self.device).view(1, -1, 1, 1)
+        std = torch.as_tensor(processor.image_std, dtype=torch.float32, device=self.device).view(1, -1, 1, 1)
+        pixels = pixel_values.pin_memory().to(self.device, dtype=torch.float32, non_blocking=True)
+        return pixels.mul_(float(processor.rescale_factor)).sub_(mean).div_(std)
 
     def project_128(self, vec_768: np.ndarray) -> np.ndarray:
         """Project a 768-dimensional embedding into the 128-dimensional FAISS space."""
@@ -271,6 +470,12 @@ class DINOEmbedder:
         vec_128 = self.project_128(vec_768)
         return vec_768, vec_128
 
+    def embed_both_batch(self, images: List[Image.Image]) -> Tuple[np.ndarray, np.ndarray]:
+        """Create (B, 768) and (B, 128) embeddings for several images in one forward pass."""
+        vecs_768 = self.embed_768_batch(images)
+        vecs_128 = (vecs_768 @ self._projection(vecs_768.shape[1])).astype(np.float32)
+        return vecs_768, vecs_128
+
     def embed_128(self, image: Image.Image) -> np.ndarray:
         """Create only the projected 128-dimensional embedding for an image."""
         v = self.embed_768(image)
@@ -729,6 +729,8 @@ class FlorenceService:
         self._processor = None
         self._model = None
         self._model_load_lock = threading.Lock()
+        self._warmup_lock = threading.Lock()
+        self._warmup_done = False
 
         self._lite_worker_ctx = mp.get_context("spawn")
         self._lite_worker_proc = None
@@ -946,6 +948,28 @@ class FlorenceService:
                 self._using_fp16,
             )
 
+    def warmup(self) -> None:
+        """
+        Run the caption and OCR heads once on a blank crop so model loading and
+        generate() setup happen before the first real request.
+        """
+        if self._warmup_done:
+            return
+        with self._warmup_lock:
+            if self._warmup_done:
+                return
+            start = time.perf_counter()
+            logger.debug("FLORENCE_WARMUP_START")
+            try:
+                dummy = Image.new("RGB", (64, 64), color=(0, 0, 0))
+                for task in ("<CAPTION>", "<OCR>"):
+                    self._run_task(dummy, task, profile="fast")
+                self._warmup_done = True
+                logger.debug("FLORENCE_WARMUP_DONE elapsed_ms=%.2f", (time.perf_counter() - start) * 1000.0)
+            except Exception:
+                logger.exception("FLORENCE_WARMUP_FAIL elapsed_ms=%.2f", (time.perf_counter() - start) * 1000.0)
+                raise
+
     def _run_task(
         self,
         image: Image.Image,
@@ -962,10 +986,42 @@ class FlorenceService:
         self.load_model()
         assert self._processor is not None and self._model is not None
 
-        import torch  # type: ignore
-
         prompt = task if text is None else f"{task} {text}"
         inputs = self._processor(text=prompt, images=image, return_tensors="pt")
+        generated_ids = self._generate(inputs, profile)
+        generated_text = self._processor.batch_decode(generated_ids, skip_special_tokens=False)[0]
+        return self._post_process_task(generated_text, task, image)
+
+    def _run_task_batch(
+        self,
+        images: List[Image.Image],
+        task: str,
+        text: Optional[str] = None,
+        profile: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run one Florence task over several images in a single generate call."""
+        if not images:
+            return []
+        self.load_model()
+        assert self._processor is not None and self._model is not None
+
+        prompt = task if text is None else f"{task} {text}"
+        inputs = self._processor(
+            text=[prompt] * len(images),
+            images=list(images),
+            return_tensors="pt",
+            padding=True,
+        )
+        generated_ids = self._generate(inputs, profile)
+        generated_texts = self._processor.batch_decode(generated_ids, skip_special_tokens=False)
+        return [
+            self._post_process_task(generated_text, task, image)
+            for generated_text, image in zip(generated_texts, images)
+        ]
+
+    def _generate(self, inputs: Dict[str, Any], profile: Optional[str]) -> Any:
+        """Run model.generate on processor inputs with the profile's decoding settings."""
+        import torch  # type: ignore
 
         if self.device:
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
@@ -992,7 +1048,7 @@ class FlorenceService:
                     dtype=torch.float16,
                     enabled=use_amp_cuda,
                 ):
-                    generated_ids = self._model.generate(
+                    return self._model.generate(
                         **inputs,
                         max_new_tokens=max_tokens,
                         num_beams=num_beams,
@@ -1000,8 +1056,8 @@ class FlorenceService:
                         do_sample=False,
                     )
 
-        generated_text = self._processor.batch_decode(generated_ids, skip_special_tokens=False)[0]
-
+    def _post_process_task(self, generated_text: str, task: str, image: Image.Image) -> Dict[str, Any]:
+        """Apply Florence's post-processing to generated text, falling back to the raw text."""
         # Try Florence's post-process helper. If it fails, return raw text.
         try:
             out = self._processor.post_process_generation(
@@ -1112,6 +1168,18 @@ class FlorenceService:
 
         return enriched
 
+    @staticmethod
+    def _caption_from_output(task: str, out: Dict[str, Any]) -> str:
+        """Pull caption text out of a post-processed caption task result."""
+        # Check standard keys
+        for k in (task, "caption", "CAPTION", "DETAILED_CAPTION", "MORE_DETAILED_CAPTION"):
+            if k in out and isinstance(out[k], str) and out[k].strip():
+                return out[k].strip()
+
+        # Fallback: raw text
+        raw = out.get("_raw_text", "")
+        return _safe_str(raw).strip()
+
     def caption(self, image: Image.Image, detailed: bool = True, profile: Optional[str] = None) -> str:
         # Try multiple levels of detail if requested
         """Generate a caption for an image using the configured vision model profile."""
@@ -1120,14 +1188,7 @@ class FlorenceService:
         for task in tasks:
             try:
                 out = self._run_task(image, task, profile=profile)
-                # Check standard keys
-                for k in (task, "caption", "CAPTION", "DETAILED_CAPTION", "MORE_DETAILED_CAPTION"):
-                    if k in out and isinstance(out[k], str) and out[k].strip():
-                        return out[k].strip()
-                
-                # Fallback: raw text
-                raw = out.get("_raw_text", "")
-                s = _safe_str(raw).strip()
+                s = self._caption_from_output(task, out)
                 if s:
                     return s
             except Exception:
@@ -1136,6 +1197,41 @@ class FlorenceService:
                 
         return ""
 
+    def caption_batch(
+        self,
+        images: List[Image.Image],
+        detailed: bool = True,
+        profile: Optional[str] = None,
+    ) -> List[Optional[str]]:
+        """
+        Caption several images with one generate call per caption level.
+
+        Follows the same detail fallback as caption(): images left without a
+        caption at one level are retried together at the next. Entries that
+        end with no caption (every level failed or came back empty) are None,
+        so analyze_crop() captions those crops itself.
+        """
+        tasks = ["<MORE_DETAILED_CAPTION>", "<DETAILED_CAPTION>", "<CAPTION>"] if detailed else ["<CAPTION>"]
+        captions: List[Optional[str]] = [None] * len(images)
+        pending = list(range(len(images)))
+        for task in tasks:
+            if not pending:
+                break
+            try:
+                outs = self._run_task_batch([images[i] for i in pending], task, profile=profile)
+            except Exception:
+                logger.debug("Batched caption failed for %s", task, exc_info=True)
+                continue
+            still_pending: List[int] = []
+            for idx, out in zip(pending, outs):
+                text = self._caption_from_output(task, out)
+                if text:
+                    captions[idx] = text
+                else:
+                    still_pending.append(idx)
+            pending = still_pending
+        return captions
+
     def vqa(self, image: Image.Image, question: str, profile: Optional[str] = None) -> str:
         """
         VQA task. Returns a plain short answer string.
@@ -2054,10 +2150,14 @@ class FlorenceService:
         canonical_label: Optional[str] = None,
         profile: Optional[str] = None,
         mode: str = "full",
+        caption_hint: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Evidence extraction on a crop.
 
+        caption_hint is a detailed caption already produced for this crop
+        (e.g. by caption_batch); when non-empty, the caption call is skipped.
+
         1. Caption (Detailed) AND Guided VQA (Object-only).
            - Select best sanitized caption.
         2. OCR
@@ -2284,7 +2384,10 @@ class FlorenceService:
         # Always run both detailed caption and guided VQA to get best object description
         
         # A) Detailed Caption
-        raw_caption = self.caption(crop, detailed=(profile_key != "fast"), profile=profile_key)
+        if caption_hint:
+            raw_caption = caption_hint
+        else:
+            raw_caption = self.caption(crop, detailed=(profile_key != "fast"), profile=profile_key)
         sanitized_caption, _ = _sanitize_caption(raw_caption)
         
         # B) Guided VQA (Object-only) — always run for richer detail
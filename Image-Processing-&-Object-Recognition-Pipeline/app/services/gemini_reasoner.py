@@ -16,10 +16,16 @@ This module stores the "ready-to-paste" prompt templates requested.
 
 from __future__ import annotations
 
+from concurrent.futures import Future
 from typing import Any, Dict, List, Optional
+import base64
+import io
 import json
 import logging
+import os
 import re
+import tempfile
+import threading
 import time
 
 from app.config.settings import settings
@@ -56,6 +62,13 @@ GeminiTransientError = ReasonerTransientError
 GeminiQuotaError = ReasonerQuotaError
 GeminiFatalError = ReasonerFatalError
 
+_BATCH_TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
 
 # ----------------------------
 # PROMPTS
@@ -964,20 +977,25 @@ class GeminiReasoner(ReasonerProtocol):
         """Build Gemini generation configuration for PP1 prompts."""
         from google.genai import types  # type: ignore
 
-        thinking_level = str(getattr(settings, "PP1_GEMINI_THINKING_LEVEL", "low") or "low").strip().lower()
-        thinking_config = (
-            types.ThinkingConfig(thinkingLevel=thinking_level)
-            if self._is_gemini3_model(self.model_name)
-            else types.ThinkingConfig(thinkingBudget=max(0, int(getattr(settings, "PP2_REASONER_THINKING_BUDGET", 256))))
-        )
         return types.GenerateContentConfig(
             temperature=float(getattr(settings, "PP1_GEMINI_TEMPERATURE", 0.1)),
             maxOutputTokens=int(getattr(settings, "PP1_GEMINI_MAX_OUTPUT_TOKENS", 320)),
             response_mime_type="application/json",
             response_json_schema=PHASE1_PP1_RESPONSE_SCHEMA,
-            thinkingConfig=thinking_config,
+            thinkingConfig=types.ThinkingConfig(**self._pp1_thinking_fields()),
         )
 
+    def _pp1_thinking_fields(self) -> Dict[str, Any]:
+        """
+        Return the PP1 ThinkingConfig fields: a level for Gemini 3 models, a
+        token budget otherwise. Shared by interactive and batch requests.
+        """
+        if self._is_gemini3_model(self.model_name):
+            return {
+                "thinkingLevel": str(getattr(settings, "PP1_GEMINI_THINKING_LEVEL", "low") or "low").strip().lower()
+            }
+        return {"thinkingBudget": max(0, int(getattr(settings, "PP2_REASONER_THINKING_BUDGET", 256)))}
+
     def _build_pp1_fallback_generate_config(self) -> Any:
         """Build Gemini fallback generation configuration for PP1 prompts."""
         from google.genai import types  # type: ignore
@@ -1011,6 +1029,20 @@ class GeminiReasoner(ReasonerProtocol):
         """
         Strict extractor function for Phase 1.
         """
+        prompt, label, color = self._build_phase1_prompt(evidence_json)
+        images = [crop_image] if crop_image else None
+        text = self._generate_text(
+            prompt,
+            images=images,
+            config=self._build_pp1_generate_config(),
+            model_name=self.model_name,
+            fallback_model_name=self.pp1_fallback_model,
+            fallback_config=self._build_pp1_fallback_generate_config(),
+        )
+        return self._parse_phase1_text(text, label, color)
+
+    def _build_phase1_prompt(self, evidence_json: Dict[str, Any]) -> tuple:
+        """Build the Phase 1 prompt and return it with the resolved label and color."""
         # Extract context
         detection = evidence_json.get("detection", {})
         crop_analysis = evidence_json.get("crop_analysis", {})
@@ -1074,16 +1106,23 @@ class GeminiReasoner(ReasonerProtocol):
                 "- DO NOT change category.\n"
                 "- You MUST keep the category as CANONICAL_LABEL and only extract details.\n"
             )
+        return prompt, label, color
 
-        images = [crop_image] if crop_image else None
-        text = self._generate_text(
-            prompt,
-            images=images,
-            config=self._build_pp1_generate_config(),
-            model_name=self.model_name,
-            fallback_model_name=self.pp1_fallback_model,
-            fallback_config=self._build_pp1_fallback_generate_config(),
-        )
+    def _parse_phase1_text(
+        self,
+        text: str,
+        label: str,
+        color: str,
+        reasoning_meta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Normalize raw Phase 1 model text into the PP1 reasoning result.
+
+        Batch results pass their own reasoning_meta; otherwise the metadata of
+        the last interactive request is consumed.
+        """
+        if reasoning_meta is None:
+            reasoning_meta = self.consume_last_request_meta()
         cleaned_json_str = _extract_json_content(text)
 
         try:
@@ -1110,7 +1149,7 @@ class GeminiReasoner(ReasonerProtocol):
                 "label_change_reason": data.get("label_change_reason"),
                 "evidence_used": data.get("evidence_used", {"caption": [], "ocr": [], "grounding": [], "color": [], "key_count": []}),
                 "unsupported_claims": data.get("unsupported_claims", []),
-                "reasoning_meta": self.consume_last_request_meta(),
+                "reasoning_meta": reasoning_meta,
             }
             
         except json.JSONDecodeError:
@@ -1121,7 +1160,7 @@ class GeminiReasoner(ReasonerProtocol):
                 "label": label,
                 "evidence_used": {"caption": [], "ocr": [], "grounding": [], "color": [], "key_count": []},
                 "unsupported_claims": [],
-                "reasoning_meta": self.consume_last_request_meta(),
+                "reasoning_meta": reasoning_meta,
             }
 
     def run_phase1(self, florence_evidence_json: Dict[str, Any], crop_image: Optional[Any] = None) -> Dict[str, Any]:
@@ -1131,6 +1170,135 @@ class GeminiReasoner(ReasonerProtocol):
         """
         return self.extract_category_details(florence_evidence_json, crop_image=crop_image)
 
+    def _build_pp1_batch_generation_config(self) -> Dict[str, Any]:
+        """Build the REST-form PP1 generation config used inside batch JSONL requests."""
+        return {
+            "temperature": float(getattr(settings, "PP1_GEMINI_TEMPERATURE", 0.1)),
+            "max_output_tokens": int(getattr(settings, "PP1_GEMINI_MAX_OUTPUT_TOKENS", 320)),
+            "response_mime_type": "application/json",
+            "response_json_schema": PHASE1_PP1_RESPONSE_SCHEMA,
+            "thinking_config": self._pp1_thinking_fields(),
+        }
+
+    @staticmethod
+    def _image_to_inline_part(image: Any) -> Dict[str, Any]:
+        """Encode a PIL image as an inline JPEG part for a batch request."""
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=90)
+        return {
+            "inline_data": {
+                "mime_type": "image/jpeg",
+                "data": base64.b64encode(buffer.getvalue()).decode("ascii"),
+            }
+        }
+
+    def run_phase1_batch_job(self, requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run many Phase 1 requests as one Gemini batch job.
+
+        Each request is {"key", "evidence", "crop_image"}. Batch jobs are billed
+        at a discount but may take hours, so this is only used for backfill.
+        Returns results keyed by request key; keys the job did not answer are
+        missing from the result.
+        """
+        self._load_client()
+        assert self._client is not None
+        from google.genai import types  # type: ignore
+
+        resolved: Dict[str, tuple] = {}
+        generation_config = self._build_pp1_batch_generation_config()
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as handle:
+            for request in requests:
+                key = str(request["key"])
+                prompt, label, color = self._build_phase1_prompt(request["evidence"])
+                resolved[key] = (label, color)
+                parts: List[Dict[str, Any]] = [{"text": prompt}]
+                if request.get("crop_image") is not None:
+                    parts.append(self._image_to_inline_part(request["crop_image"]))
+                line = {
+                    "key": key,
+                    "request": {
+                        "contents": [{"role": "user", "parts": parts}],
+                        "generation_config": generation_config,
+                    },
+                }
+                handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+            jsonl_path = handle.name
+
+        try:
+            uploaded = self._client.files.upload(
+                file=jsonl_path,
+                config=types.UploadFileConfig(display_name="pp1-phase1-batch", mime_type="jsonl"),
+            )
+            batch_job = self._client.batches.create(
+                model=self.model_name,
+                src=uploaded.name,
+                config={"display_name": "pp1-phase1-batch"},
+            )
+        except GeminiServiceError:
+            raise
+        except Exception as exc:
+            raise self._classify_gemini_exception(exc) from exc
+        finally:
+            try:
+                os.remove(jsonl_path)
+            except OSError:
+                pass
+
+        logger.info("PP1_GEMINI_BATCH_SUBMITTED name=%s requests=%d", batch_job.name, len(requests))
+        poll_s = max(1.0, float(getattr(settings, "PP1_GEMINI_BATCH_POLL_S", 30)))
+        deadline = time.time() + float(getattr(settings, "PP1_GEMINI_BATCH_TIMEOUT_S", 86400))
+        state = getattr(batch_job.state, "name", str(batch_job.state))
+        while state not in _BATCH_TERMINAL_STATES:
+            if time.time() >= deadline:
+                raise GeminiTransientError(
+                    f"Gemini batch job {batch_job.name} did not finish before timeout.",
+                    provider_status="DEADLINE_EXCEEDED",
+                )
+            time.sleep(poll_s)
+            batch_job = self._client.batches.get(name=batch_job.name)
+            state = getattr(batch_job.state, "name", str(batch_job.state))
+
+        if state != "JOB_STATE_SUCCEEDED":
+            raise GeminiTransientError(
+                f"Gemini batch job {batch_job.name} ended in state {state}.",
+                provider_status=state,
+            )
+
+        content = self._client.files.download(file=batch_job.dest.file_name)
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for raw_line in str(content).splitlines():
+            if not raw_line.strip():
+                continue
+            try:
+                row = json.loads(raw_line)
+                key = str(row.get("key"))
+                candidate = row["response"]["candidates"][0]
+                text = "".join(str(part.get("text", "")) for part in candidate["content"]["parts"])
+            except (KeyError, IndexError, TypeError, json.JSONDecodeError):
+                logger.warning("PP1_GEMINI_BATCH_BAD_LINE: %s", raw_line[:200])
+                continue
+            if key not in resolved:
+                continue
+            label, color = resolved[key]
+            # Per-item metadata: the flusher thread must not touch the shared
+            # _last_request_meta that interactive requests consume.
+            reasoning_meta = {
+                "model_attempts": [{"model": self.model_name, "attempt": 1, "fallback": False, "status": "success"}],
+                "selected_model": self.model_name,
+                "failover_reason": None,
+                "batch_job": batch_job.name,
+            }
+            results[key] = self._parse_phase1_text(text, label, color, reasoning_meta=reasoning_meta)
+        logger.info(
+            "PP1_GEMINI_BATCH_DONE name=%s answered=%d/%d",
+            batch_job.name, len(results), len(requests),
+        )
+        return results
+
     def analyze_pp2_view(self, evidence_json: Dict[str, Any], crop_image: Optional[Any] = None) -> Dict[str, Any]:
         """
         Reuse the Phase 1 schema-backed extractor for a single PP2 view and return
@@ -1220,3 +1388,88 @@ class GeminiReasoner(ReasonerProtocol):
         result = self.normalize_phase2_response(data)
         result["reasoning_meta"] = self.consume_last_request_meta()
         return result
+
+
+class Phase1BatchReasoner:
+    """
+    Drop-in PP1 reasoner that accumulates run_phase1 calls into batch jobs.
+
+    Callers block in run_phase1 as usual. Requests are flushed as one Gemini
+    batch job once the queue reaches max_items or no new request arrived for
+    idle_s seconds. Only run_phase1 is supported; this is for backfill jobs,
+    never the interactive path.
+    """
+
+    def __init__(self, reasoner: GeminiReasoner, *, max_items: int, idle_s: float) -> None:
+        """Start the background flusher for the wrapped reasoner."""
+        self._reasoner = reasoner
+        self._max_items = max(1, int(max_items))
+        self._idle_s = max(0.1, float(idle_s))
+        self._cond = threading.Condition()
+        self._pending: List[tuple] = []
+        self._last_submit = 0.0
+        self._closed = False
+        self._next_key = 0
+        self._flusher = threading.Thread(target=self._flush_loop, name="pp1_gemini_batch", daemon=True)
+        self._flusher.start()
+
+    def run_phase1(self, florence_evidence_json: Dict[str, Any], crop_image: Optional[Any] = None) -> Dict[str, Any]:
+        """Queue one Phase 1 request and wait for its batch result."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise GeminiFatalError("Phase 1 batch reasoner is closed.")
+            key = f"pp1-{self._next_key}"
+            self._next_key += 1
+            self._pending.append(
+                ({"key": key, "evidence": florence_evidence_json, "crop_image": crop_image}, future)
+            )
+            self._last_submit = time.time()
+            self._cond.notify_all()
+        return future.result()
+
+    def close(self) -> None:
+        """Flush anything still queued and stop the background flusher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+
+    def _take_ready_batch(self) -> Optional[List[tuple]]:
+        """Block until a batch should be flushed; return None once closed and drained."""
+        with self._cond:
+            while True:
+                if self._pending:
+                    idle_for = time.time() - self._last_submit
+                    if self._closed or len(self._pending) >= self._max_items or idle_for >= self._idle_s:
+                        batch = self._pending[: self._max_items]
+                        del self._pending[: self._max_items]
+                        return batch
+                    self._cond.wait(timeout=self._idle_s - idle_for)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _flush_loop(self) -> None:
+        """Submit queued requests as batch jobs and resolve their waiters."""
+        while True:
+            batch = self._take_ready_batch()
+            if batch is None:
+                return
+            try:
+                results = self._reasoner.run_phase1_batch_job([request for request, _ in batch])
+            except Exception as exc:
+                # Every waiter gets the same exception object, so the pipeline
+                # counts a failed job once toward its circuit breaker.
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for request, future in batch:
+                result = results.get(request["key"])
+                if result is None:
+                    future.set_exception(
+                        GeminiTransientError(f"Gemini batch job returned no answer for {request['key']}.")
+                    )
+                else:
+                    future.set_result(result)
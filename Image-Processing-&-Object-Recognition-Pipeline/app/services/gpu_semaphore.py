@@ -8,13 +8,17 @@ import threading
 import time
 from typing import Iterator
 
+from app.config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 # Global, process-wide GPU gate shared by all service threads.
 # The pipeline can run OCR, captioning, and embedding work in parallel threads,
 # but most local GPU deployments behave better when heavyweight inference calls
-# are serialized at this boundary.
-GPU_SEMAPHORE = threading.Semaphore(1)
+# are serialized at this boundary. Larger GPUs can raise
+# GPU_MAX_CONCURRENT_INFERENCE so DINO (on its own CUDA stream) overlaps
+# Florence generation.
+GPU_SEMAPHORE = threading.Semaphore(max(1, int(getattr(settings, "GPU_MAX_CONCURRENT_INFERENCE", 1))))
 
 
 @contextmanager
@@ -0,0 +1,33 @@
+"""Lightweight stage timer used by the PP1 pipeline."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class PerfRecorder:
+    """Collect per-stage durations in milliseconds and round them once on export."""
+
+    __slots__ = ("_ms",)
+
+    def __init__(self, **initial_ms: float) -> None:
+        self._ms: Dict[str, float] = {name: float(value) for name, value in initial_ms.items()}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and add it to ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._ms[name] = self._ms.get(name, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    def since(self, name: str, start: float) -> None:
+        """Set ``name`` to the time elapsed since a ``time.perf_counter()`` mark."""
+        self._ms[name] = (time.perf_counter() - start) * 1000.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the recorded durations rounded to two decimals."""
+        return {name: round(value, 2) for name, value in self._ms.items()}
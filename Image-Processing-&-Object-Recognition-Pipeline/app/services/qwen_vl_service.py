@@ -5,6 +5,7 @@ Public API (kept compatible with FlorenceService usage in UnifiedPipeline):
 - caption(image, detailed=True) -> str
 - vqa(image, question) -> str
 - ocr(image) -> str
+- analyze_crops_batch(crops, labels) -> list[dict] (one analyze_crop dict per crop)
 - analyze_crop(crop, canonical_label=None) -> dict:
     {
       "caption": str,
@@ -31,18 +32,32 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
+import importlib.util
+import math
 import os
 import re
 import json
 
 from PIL import Image
 
-from app.domain.category_specs import canonicalize_label, CATEGORY_SPECS
+# Imported once here rather than inside _generate_batch, which runs for every
+# sub-prompt; the service stays importable (e.g. for tests) without torch.
+try:
+    import torch  # type: ignore
+except ImportError:  # pragma: no cover - torch is a hard runtime dependency
+    torch = None  # type: ignore
+
+from app.domain.category_specs import canonicalize_label, spec_flag, CATEGORY_SPECS
 from app.config.model_paths import BASE_MODELS_DIR
 
 # QwenVLService mirrors the FlorenceService-facing API so the orchestrators can
 # swap vision-language providers without changing PP1/PP2 pipeline logic.
 
+# Qwen2.5-VL emits one vision token per 28x28 patch group; these bounds match
+# the mm_processor_kwargs used by the official examples (1..256 tokens).
+QWEN_MIN_PIXELS = 28 * 28
+QWEN_MAX_PIXELS = 256 * 28 * 28
+
 
 # ----------------------------
 # Small helpers (caption safety)
@@ -164,6 +179,209 @@ def _normalize_candidates(items: List[str]) -> List[str]:
     return _dedup_phrases(out)
 
 
+_SPEC_LIST_FIELDS = ("features", "defects", "attachments")
+
+# CATEGORY_SPECS is static, so normalize its candidate lists once at import
+# instead of re-splitting the same strings for every crop.
+_NORMALIZED_SPECS: Dict[str, Dict[str, List[str]]] = {
+    label: {field: _normalize_candidates(spec.get(field, []) or []) for field in _SPEC_LIST_FIELDS}
+    for label, spec in CATEGORY_SPECS.items()
+}
+
+
+# ----------------------------
+# Prompts and answer parsers (shared by the single and batched paths)
+# ----------------------------
+
+_CAPTION_PROMPT = (
+    "Describe ONLY the main object (ignore person/hand/background) in 2–4 sentences. "
+    "Include: object type, material (if visible), color/shade, shape, logos/text (if visible), "
+    "attachments that are separate physical add-ons (if visible), and any visible wear/defects "
+    "(scratches, dents, cracks, stains, rust, bends). "
+    "If something is not visible, say 'not visible'. Do NOT guess."
+)
+
+_SHORT_CAPTION_PROMPT = "Describe ONLY the main object (ignore person/hand/background) in 1 sentence. Do NOT guess."
+
+_GUIDED_CAPTION_PROMPT = (
+    "Describe ONLY the main object (ignore person/hand/background) in 2–4 sentences. "
+    "Include: object type, material (if visible), color/shade, shape, logos/text (if visible), "
+    "and any visible wear/defects. If something is not visible, say 'not visible'. Do NOT guess."
+)
+
+_OCR_PROMPT = (
+    "Read all text visible ON the main object. "
+    "Return ONLY the text, preserving spelling/case as best as possible. "
+    "If no text is visible, return 'None'."
+)
+
+_COLOR_PROMPT = (
+    "What is the primary color of the OBJECT (not background)? "
+    "Answer with a short phrase including shade/tone if visible (e.g., 'dark gray', 'navy blue', 'matte black'). "
+    "If unsure, answer 'unknown'."
+)
+
+_KEY_COUNT_PROMPT = "How many separate keys are visible in this image? Answer with a single integer."
+
+
+def _parse_ocr_answer(text: str) -> str:
+    """Normalize an OCR answer; model 'none' replies become an empty string."""
+    text = text.strip()
+    if text.lower() in {"none", "no", "n/a", "null"}:
+        return ""
+    # Keep it single-line-ish
+    return "\n".join([line.strip() for line in text.splitlines() if line.strip()]).strip()
+
+
+def _parse_color_answer(text: str) -> Optional[str]:
+    """Normalize a color answer, mapping empty/'unknown' to None."""
+    ans = text.strip()
+    if not ans or ans.lower() == "unknown":
+        return None
+    # normalize whitespace
+    return " ".join(ans.split())
+
+
+def _parse_key_count_answer(text: str) -> int:
+    """Parse the first integer in a key-count answer (defaults to 1)."""
+    m = re.search(r"\b(\d+)\b", text)
+    if m:
+        try:
+            return int(m.group(1))
+        except Exception:
+            return 1
+    return 1
+
+
+def _selector_prompt(
+    label: str,
+    feature_list: List[str],
+    defect_list: List[str],
+    attachment_list: List[str],
+    ocr_text: str,
+    color: Optional[str],
+) -> str:
+    """Build the evidence-locked candidate selector prompt."""
+    return f"""
+You are a strict visual inspector.
+
+Analyze ONLY the main object in the image crop (ignore background, people, hands).
+Choose which items from the candidate lists are PRESENT and CLEARLY VISIBLE on the object.
+
+CRITICAL RULES:
+- You MUST use ONLY exact phrases from the candidate lists.
+- If you are not 100% sure an item is visible, DO NOT include it.
+- "attachments" means separate physical add-ons attached to the main object.
+  Built-in parts (holes/slots/loops/handles that are part of the object) are NOT attachments.
+- If OCR_TEXT is provided, treat it as visible text.
+
+Return VALID JSON ONLY (no markdown), with exactly:
+{{
+  "features": [string],
+  "defects": [string],
+  "attachments": [string]
+}}
+
+CONTEXT:
+LABEL: {label}
+PRIMARY_COLOR: {color or "Unknown"}
+OCR_TEXT: {ocr_text or "None"}
+
+FEATURE_CANDIDATES (use exact phrases only):
+{json.dumps(feature_list, ensure_ascii=False, indent=2)}
+
+DEFECT_CANDIDATES (use exact phrases only):
+{json.dumps(defect_list, ensure_ascii=False, indent=2)}
+
+ATTACHMENT_CANDIDATES (separate add-ons only; exact phrases only):
+{json.dumps(attachment_list, ensure_ascii=False, indent=2)}
+""".strip()
+
+
+def _selector_token_budget(
+    feature_list: List[str],
+    defect_list: List[str],
+    attachment_list: List[str],
+) -> int:
+    """
+    Decode cap for the selector: a valid answer can never be longer than the
+    JSON with every candidate selected, so anything past that is invented
+    phrases that the membership filter would drop anyway. Assumes at most
+    one token per two characters, which is generous for BPE on English text.
+    """
+    longest = json.dumps(
+        {"features": feature_list, "defects": defect_list, "attachments": attachment_list},
+        ensure_ascii=False,
+    )
+    return len(longest) // 2 + 32
+
+
+def _parse_selector_answer(
+    raw: str,
+    feature_list: List[str],
+    defect_list: List[str],
+    attachment_list: List[str],
+) -> Dict[str, List[str]]:
+    """Parse selector JSON and keep only exact candidate phrases."""
+    cleaned = _extract_json_content(raw)
+
+    try:
+        data = json.loads(cleaned) if cleaned else {}
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    feats = data.get("features") if isinstance(data.get("features"), list) else []
+    defs = data.get("defects") if isinstance(data.get("defects"), list) else []
+    atts = data.get("attachments") if isinstance(data.get("attachments"), list) else []
+
+    # Enforce exact membership + dedup
+    feature_set = frozenset(feature_list)
+    defect_set = frozenset(defect_list)
+    attachment_set = frozenset(attachment_list)
+    feats = _dedup_phrases([x for x in feats if isinstance(x, str) and x in feature_set])
+    defs = _dedup_phrases([x for x in defs if isinstance(x, str) and x in defect_set])
+    atts = _dedup_phrases([x for x in atts if isinstance(x, str) and x in attachment_set])
+
+    return {"features": feats, "defects": defs, "attachments": atts}
+
+
+def _estimate_vision_tokens(image: Any) -> int:
+    """Approximate Qwen2.5-VL vision tokens for an image (one per 28x28 merged patch)."""
+    if not isinstance(image, Image.Image):
+        return 0
+    w, h = image.size
+    return math.ceil(w / 28) * math.ceil(h / 28)
+
+
+def _bucket_by_vision_tokens(images: List[Any], max_ratio: float = 1.25) -> List[List[int]]:
+    """
+    Group image indices so that, within a bucket, the largest vision-token
+    count is at most max_ratio times the smallest. Buckets come out in
+    ascending size order; callers reassemble results by index.
+    """
+    order = sorted(range(len(images)), key=lambda i: _estimate_vision_tokens(images[i]))
+    buckets: List[List[int]] = []
+    bucket_min = 0
+    for i in order:
+        tokens = _estimate_vision_tokens(images[i])
+        if buckets and tokens <= max(bucket_min, 1) * max_ratio:
+            buckets[-1].append(i)
+        else:
+            buckets.append([i])
+            bucket_min = tokens
+    return buckets
+
+
+def _attachment_verify_prompt(attachment_phrase: str) -> str:
+    """Build the yes/no attachment verification question."""
+    return (
+        f"Visually verify the image: Is there a separate physical '{attachment_phrase}' "
+        f"attached to the main object? Answer only 'yes' or 'no'."
+    )
+
+
 # ----------------------------
 # Qwen2.5-VL core service
 # ----------------------------
@@ -177,6 +395,7 @@ class QwenVLService:
         max_new_tokens: int = 512,
         temperature: float = 0.0,
         attachment_verify: bool = True,
+        max_side: Optional[int] = None,
     ) -> None:
         """
         model_path:
@@ -185,6 +404,10 @@ class QwenVLService:
 
         attachment_verify:
           - If True, runs an extra yes/no verification per selected attachment (reduces hallucinations).
+
+        max_side:
+          - Longest crop side fed to the model (env QWEN_VL_MAX_SIDE, default 448).
+            Vision-token count grows with pixel area, so larger crops only add prefill cost.
         """
         self.model_path = (
             model_path
@@ -196,10 +419,13 @@ class QwenVLService:
         self.max_new_tokens = max_new_tokens
         self.temperature = temperature
         self.attachment_verify = attachment_verify
+        self.max_side = int(max_side or os.getenv("QWEN_VL_MAX_SIDE", "448"))
 
         self._processor = None
         self._model = None
         self._process_vision_info = None  # optional helper from qwen_vl_utils
+        # id(image) -> (image, prepared image); only populated during analyze_crops_batch
+        self._vision_cache: Optional[Dict[int, Tuple[Image.Image, Any]]] = None
 
     def load_model(self) -> None:
         """Load the configured vision-language model and processor."""
@@ -214,7 +440,8 @@ class QwenVLService:
                 f"Set QWEN_VL_MODEL_PATH or update the path."
             )
 
-        import torch  # type: ignore
+        if torch is None:
+            raise RuntimeError("PyTorch is required to run QwenVLService.")
 
         # Optional helper library used by official Qwen-VL examples
         try:
@@ -238,12 +465,18 @@ class QwenVLService:
             print("Warning: CUDA requested but not available. Falling back to CPU.")
             self.device = "cpu"
 
-        # Processor
+        # Processor (pixel bounds keep the vision-token count of every crop capped)
         self._processor = AutoProcessor.from_pretrained(
             self.model_path,
             trust_remote_code=True,
             local_files_only=True,
+            min_pixels=QWEN_MIN_PIXELS,
+            max_pixels=QWEN_MAX_PIXELS,
         )
+        # Batched generate() needs left padding so every row continues from its last prompt token.
+        tokenizer = getattr(self._processor, "tokenizer", None)
+        if tokenizer is not None:
+            tokenizer.padding_side = "left"
 
         # Model loading
         model_kwargs: Dict[str, Any] = {
@@ -258,28 +491,43 @@ class QwenVLService:
         if self.device == "cuda":
             model_kwargs["device_map"] = "auto"
 
-        self._model = ModelCls.from_pretrained(self.model_path, **model_kwargs)
+        # Vision tokens make prefill sequences long; avoid eager attention's full QK^T.
+        # flash_attention_2 needs fp16/bf16 weights, so default to bf16 when it is used.
+        if self.device == "cuda" and importlib.util.find_spec("flash_attn") is not None:
+            model_kwargs["attn_implementation"] = "flash_attention_2"
+            if "torch_dtype" not in model_kwargs:
+                model_kwargs["torch_dtype"] = torch.bfloat16
+        elif hasattr(torch.nn.functional, "scaled_dot_product_attention"):
+            model_kwargs["attn_implementation"] = "sdpa"
+
+        try:
+            self._model = ModelCls.from_pretrained(self.model_path, **model_kwargs)
+        except (ImportError, ValueError) as e:
+            # Older transformers / missing kernels: retry with the library default attention.
+            if "attn_implementation" not in model_kwargs:
+                raise
+            print(f"Warning: {model_kwargs['attn_implementation']} attention unavailable, using default: {e}")
+            model_kwargs.pop("attn_implementation", None)
+            self._model = ModelCls.from_pretrained(self.model_path, **model_kwargs)
 
         if self.device == "cpu":
             self._model.to("cpu")
 
         self._model.eval()
 
-    def _generate(self, messages: List[Dict[str, Any]]) -> str:
-        """
-        messages format (Qwen chat template style):
-        [
-          {"role": "user", "content": [{"type":"image","image": <PIL>}, {"type":"text","text":"..."}]}
-        ]
-        """
-        self.load_model()
-        assert self._model is not None and self._processor is not None
-
-        import torch  # type: ignore
+        # Opt-in: compiling costs a slow first call, so keep it off for dev reloads.
+        # Compile forward (not the wrapper module) so generate() hits the compiled graph.
+        if self.device == "cuda" and os.getenv("QWEN_COMPILE", "0") == "1":
+            try:
+                self._model.forward = torch.compile(self._model.forward, mode="reduce-overhead", fullgraph=False)
+            except Exception as e:
+                print(f"Warning: torch.compile failed for Qwen2.5-VL, using eager model: {e}")
 
-        # Build text prompt using chat template
+    def _build_prompt_text(self, messages: List[Dict[str, Any]]) -> str:
+        """Render one conversation into the model prompt string."""
+        assert self._processor is not None
         try:
-            prompt_text = self._processor.apply_chat_template(
+            return self._processor.apply_chat_template(
                 messages,
                 tokenize=False,
                 add_generation_prompt=True,
@@ -292,29 +540,102 @@ class QwenVLService:
                 for part in m.get("content", []):
                     if part.get("type") == "text":
                         user_texts.append(part.get("text", ""))
-            prompt_text = "\n".join(user_texts).strip()
+            return "\n".join(user_texts).strip()
+
+    def _prepare_image(self, image: Image.Image) -> Any:
+        """
+        Run qwen_vl_utils' fetch/smart-resize for one image, reusing the result
+        for every sub-prompt of an in-progress analysis (see analyze_crops_batch).
+        """
+        cache = self._vision_cache
+        if cache is not None:
+            hit = cache.get(id(image))
+            # The cache also holds the source image, so its id cannot be recycled meanwhile.
+            if hit is not None and hit[0] is image:
+                return hit[1]
+
+        prepared: Any = image
+        if self._process_vision_info is not None:
+            try:
+                image_inputs, _ = self._process_vision_info(
+                    [{"role": "user", "content": [{"type": "image", "image": image}]}]
+                )
+                if image_inputs:
+                    prepared = image_inputs[0]
+            except Exception:
+                prepared = image
+
+        if cache is not None:
+            cache[id(image)] = (image, prepared)
+        return prepared
+
+    def _extract_vision_inputs(self, messages_list: List[List[Dict[str, Any]]]) -> Tuple[Any, Any]:
+        """Collect image/video inputs for all conversations, in prompt order."""
+        parts = [
+            part
+            for messages in messages_list
+            for m in messages
+            for part in m.get("content", [])
+            if part.get("type") in ("image", "video")
+        ]
+        if not parts:
+            return None, None
+
+        # Common case (all in-memory PIL images): prepare each image once per analysis.
+        if all(part.get("type") == "image" and isinstance(part.get("image"), Image.Image) for part in parts):
+            return [self._prepare_image(part["image"]) for part in parts], None
 
-        # Extract vision inputs
         images = None
         videos = None
         if self._process_vision_info is not None:
             try:
-                image_inputs, video_inputs = self._process_vision_info(messages)
-                images, videos = image_inputs, video_inputs
+                flat = [m for messages in messages_list for m in messages]
+                images, videos = self._process_vision_info(flat)
             except Exception:
                 images, videos = None, None
 
         # If helper isn’t available, attempt a best-effort direct extraction of PIL images
         if images is None:
-            imgs: List[Image.Image] = []
-            for m in messages:
-                for part in m.get("content", []):
-                    if part.get("type") == "image" and isinstance(part.get("image"), Image.Image):
-                        imgs.append(part["image"])
+            imgs: List[Image.Image] = [
+                part["image"]
+                for part in parts
+                if part.get("type") == "image" and isinstance(part.get("image"), Image.Image)
+            ]
             images = imgs if imgs else None
+        return images, videos
+
+    def _generate(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        messages format (Qwen chat template style):
+        [
+          {"role": "user", "content": [{"type":"image","image": <PIL>}, {"type":"text","text":"..."}]}
+        ]
+        """
+        return self._generate_batch([messages])[0]
+
+    def _generate_batch(
+        self,
+        messages_list: List[List[Dict[str, Any]]],
+        max_new_tokens: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Run several conversations through one processor call and one generate().
+
+        Decoding is memory-bound, so N prompts in one batch cost little more than one.
+        max_new_tokens optionally lowers the service-wide decode cap for this call.
+        Returns one answer per conversation, in input order.
+        """
+        if not messages_list:
+            return []
+
+        self.load_model()
+        assert self._model is not None and self._processor is not None
+
+        prompt_texts = [self._build_prompt_text(messages) for messages in messages_list]
+        images, videos = self._extract_vision_inputs(messages_list)
 
         inputs = self._processor(
-            text=[prompt_text],
+            text=prompt_texts,
             images=images,
             videos=videos,
             padding=True,
@@ -325,10 +646,10 @@ class QwenVLService:
         model_device = getattr(self._model, "device", None)
         if model_device is None:
             model_device = torch.device("cpu")
-        inputs = {k: v.to(model_device) for k, v in inputs.items() if hasattr(v, "to")}
+        inputs = self._to_device(inputs, model_device)
 
         gen_kwargs: Dict[str, Any] = {
-            "max_new_tokens": self.max_new_tokens,
+            "max_new_tokens": min(self.max_new_tokens, max_new_tokens or self.max_new_tokens),
             "do_sample": self.temperature > 0,
             "temperature": self.temperature if self.temperature > 0 else None,
         }
@@ -338,21 +659,56 @@ class QwenVLService:
         with torch.no_grad():
             out_ids = self._model.generate(**inputs, **gen_kwargs)
 
+        # Keep only the generated continuation of each (left-padded) prompt row.
+        prompt_len = inputs["input_ids"].shape[1] if "input_ids" in inputs else 0
+        out_ids = out_ids[:, prompt_len:]
+
         # Decode
         try:
-            text = self._processor.batch_decode(out_ids, skip_special_tokens=True)[0]
+            texts = self._processor.batch_decode(out_ids, skip_special_tokens=True)
         except Exception:
-            text = _safe_str(out_ids)
+            texts = [_safe_str(row) for row in out_ids]
+
+        return [str(text).strip() for text in texts]
+
+    @staticmethod
+    def _to_device(inputs: Any, model_device: Any) -> Dict[str, Any]:
+        """
+        Move processor tensors to the model device.
 
-        return str(text).strip()
+        On CUDA the host tensors are pinned and copied with non_blocking=True,
+        so the H2D transfer is queued on the current stream instead of stalling
+        the host; generate() runs on the same stream, so ordering is preserved.
+        """
+        use_pinned = getattr(model_device, "type", str(model_device)) == "cuda"
+        moved: Dict[str, Any] = {}
+        for k, v in inputs.items():
+            if not hasattr(v, "to"):
+                continue
+            if use_pinned and hasattr(v, "pin_memory"):
+                moved[k] = v.pin_memory().to(model_device, non_blocking=True)
+            else:
+                moved[k] = v.to(model_device)
+        return moved
+
+    def _resize_for_vl(self, image: Image.Image) -> Image.Image:
+        """Downscale an image so its longest side fits the vision-token budget."""
+        if not isinstance(image, Image.Image):
+            return image
+        if max(image.size) <= self.max_side:
+            return image
+        resized = image.copy()
+        resized.thumbnail((self.max_side, self.max_side), Image.BICUBIC)
+        return resized
 
     # ----------------------------
     # Public API: caption / vqa / ocr
     # ----------------------------
 
-    def vqa(self, image: Image.Image, question: str) -> str:
-        """Answer a visual question about an image."""
-        messages = [
+    @staticmethod
+    def _vqa_messages(image: Image.Image, question: str) -> List[Dict[str, Any]]:
+        """Build a single-turn image+question conversation."""
+        return [
             {
                 "role": "user",
                 "content": [
@@ -361,34 +717,41 @@ class QwenVLService:
                 ],
             }
         ]
-        return self._generate(messages)
+
+    def vqa(self, image: Image.Image, question: str, max_new_tokens: Optional[int] = None) -> str:
+        """Answer a visual question about an image."""
+        return self._generate_batch([self._vqa_messages(image, question)], max_new_tokens=max_new_tokens)[0]
+
+    def vqa_batch(
+        self,
+        images: List[Image.Image],
+        questions: List[str],
+        max_new_tokens: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Answer one visual question per image with batched generate() calls.
+
+        Images are grouped into similar vision-token buckets first so short
+        sequences are not padded up to the largest crop in the batch.
+        """
+        answers: List[str] = [""] * len(images)
+        for bucket in _bucket_by_vision_tokens(images):
+            bucket_answers = self._generate_batch(
+                [self._vqa_messages(images[i], questions[i]) for i in bucket],
+                max_new_tokens=max_new_tokens,
+            )
+            for i, ans in zip(bucket, bucket_answers):
+                answers[i] = ans
+        return answers
 
     def caption(self, image: Image.Image, detailed: bool = True) -> str:
         """Generate a caption for an image using the configured vision model profile."""
-        prompt = (
-            "Describe ONLY the main object (ignore person/hand/background) in 2–4 sentences. "
-            "Include: object type, material (if visible), color/shade, shape, logos/text (if visible), "
-            "attachments that are separate physical add-ons (if visible), and any visible wear/defects "
-            "(scratches, dents, cracks, stains, rust, bends). "
-            "If something is not visible, say 'not visible'. Do NOT guess."
-        )
-        if not detailed:
-            prompt = "Describe ONLY the main object (ignore person/hand/background) in 1 sentence. Do NOT guess."
+        prompt = _CAPTION_PROMPT if detailed else _SHORT_CAPTION_PROMPT
         return self.vqa(image, prompt)
 
     def ocr(self, image: Image.Image) -> str:
         """Extract OCR text from an image."""
-        prompt = (
-            "Read all text visible ON the main object. "
-            "Return ONLY the text, preserving spelling/case as best as possible. "
-            "If no text is visible, return 'None'."
-        )
-        text = self.vqa(image, prompt)
-        text = text.strip()
-        if text.lower() in {"none", "no", "n/a", "null"}:
-            return ""
-        # Keep it single-line-ish
-        return "\n".join([line.strip() for line in text.splitlines() if line.strip()]).strip()
+        return _parse_ocr_answer(self.vqa(image, _OCR_PROMPT))
 
     # ----------------------------
     # Evidence extraction helpers
@@ -396,28 +759,11 @@ class QwenVLService:
 
     def _color_vqa(self, image: Image.Image) -> Optional[str]:
         """Ask the model for the dominant object color."""
-        q = (
-            "What is the primary color of the OBJECT (not background)? "
-            "Answer with a short phrase including shade/tone if visible (e.g., 'dark gray', 'navy blue', 'matte black'). "
-            "If unsure, answer 'unknown'."
-        )
-        ans = self.vqa(image, q).strip()
-        if not ans or ans.lower() == "unknown":
-            return None
-        # normalize whitespace
-        return " ".join(ans.split())
+        return _parse_color_answer(self.vqa(image, _COLOR_PROMPT))
 
     def _key_count_vqa(self, image: Image.Image) -> int:
         """Ask the model to count visible keys in the image."""
-        q = "How many separate keys are visible in this image? Answer with a single integer."
-        ans = self.vqa(image, q)
-        m = re.search(r"\b(\d+)\b", ans)
-        if m:
-            try:
-                return int(m.group(1))
-            except Exception:
-                return 1
-        return 1
+        return _parse_key_count_answer(self.vqa(image, _KEY_COUNT_PROMPT))
 
     def _select_from_candidates(
         self,
@@ -428,6 +774,7 @@ class QwenVLService:
         attachment_list: List[str],
         ocr_text: str,
         color: Optional[str],
+        normalized: bool = False,
     ) -> Dict[str, List[str]]:
         """
         Single-call strict selector:
@@ -435,78 +782,28 @@ class QwenVLService:
         - Must be clearly visible
         - Attachments must be separate physical add-ons only
         Returns {"features":[...], "defects":[...], "attachments":[...]} (lists may be empty).
-        """
-        feature_list = _normalize_candidates(feature_list)
-        defect_list = _normalize_candidates(defect_list)
-        attachment_list = _normalize_candidates(attachment_list)
-
-        prompt = f"""
-You are a strict visual inspector.
-
-Analyze ONLY the main object in the image crop (ignore background, people, hands).
-Choose which items from the candidate lists are PRESENT and CLEARLY VISIBLE on the object.
-
-CRITICAL RULES:
-- You MUST use ONLY exact phrases from the candidate lists.
-- If you are not 100% sure an item is visible, DO NOT include it.
-- "attachments" means separate physical add-ons attached to the main object.
-  Built-in parts (holes/slots/loops/handles that are part of the object) are NOT attachments.
-- If OCR_TEXT is provided, treat it as visible text.
 
-Return VALID JSON ONLY (no markdown), with exactly:
-{{
-  "features": [string],
-  "defects": [string],
-  "attachments": [string]
-}}
-
-CONTEXT:
-LABEL: {label}
-PRIMARY_COLOR: {color or "Unknown"}
-OCR_TEXT: {ocr_text or "None"}
-
-FEATURE_CANDIDATES (use exact phrases only):
-{json.dumps(feature_list, ensure_ascii=False, indent=2)}
-
-DEFECT_CANDIDATES (use exact phrases only):
-{json.dumps(defect_list, ensure_ascii=False, indent=2)}
-
-ATTACHMENT_CANDIDATES (separate add-ons only; exact phrases only):
-{json.dumps(attachment_list, ensure_ascii=False, indent=2)}
-""".strip()
-
-        messages = [
-            {"role": "user", "content": [{"type": "image", "image": image}, {"type": "text", "text": prompt}]}
-        ]
-        raw = self._generate(messages)
-        cleaned = _extract_json_content(raw)
-
-        try:
-            data = json.loads(cleaned) if cleaned else {}
-        except Exception:
-            data = {}
-
-        feats = data.get("features") if isinstance(data.get("features"), list) else []
-        defs = data.get("defects") if isinstance(data.get("defects"), list) else []
-        atts = data.get("attachments") if isinstance(data.get("attachments"), list) else []
-
-        # Enforce exact membership + dedup
-        feats = _dedup_phrases([x for x in feats if x in feature_list])
-        defs = _dedup_phrases([x for x in defs if x in defect_list])
-        atts = _dedup_phrases([x for x in atts if x in attachment_list])
-
-        return {"features": feats, "defects": defs, "attachments": atts}
+        normalized=True skips candidate cleanup for lists taken from _NORMALIZED_SPECS.
+        """
+        if not normalized:
+            feature_list = _normalize_candidates(feature_list)
+            defect_list = _normalize_candidates(defect_list)
+            attachment_list = _normalize_candidates(attachment_list)
+
+        prompt = _selector_prompt(label, feature_list, defect_list, attachment_list, ocr_text, color)
+        raw = self.vqa(
+            image,
+            prompt,
+            max_new_tokens=_selector_token_budget(feature_list, defect_list, attachment_list),
+        )
+        return _parse_selector_answer(raw, feature_list, defect_list, attachment_list)
 
     def _verify_attachment_yesno(self, image: Image.Image, attachment_phrase: str) -> bool:
         """
         Second-pass verification to reduce hallucinations.
         """
-        q = (
-            f"Visually verify the image: Is there a separate physical '{attachment_phrase}' "
-            f"attached to the main object? Answer only 'yes' or 'no'."
-        )
-        ans = self.vqa(image, q).strip().lower()
-        return ans.startswith("y")
+        ans = self.vqa(image, _attachment_verify_prompt(attachment_phrase))
+        return ans.strip().lower().startswith("y")
 
     # ----------------------------
     # Main: analyze_crop (compat)
@@ -522,98 +819,184 @@ ATTACHMENT_CANDIDATES (separate add-ons only; exact phrases only):
         5) Evidence-locked selection of features/defects/attachments from CATEGORY_SPECS candidates
         6) Optional attachment verify pass (yes/no per attachment)
         """
-        # label normalization
-        spec_key = canonicalize_label(canonical_label) if canonical_label else None
+        return self.analyze_crops_batch([crop], [canonical_label])[0]
 
-        # 1) Caption (with sanitize)
-        caption_primary = self.caption(crop, detailed=True)
-        caption_final, removed = _sanitize_caption(caption_primary)
+    def analyze_crops_batch(
+        self,
+        crops: List[Image.Image],
+        labels: List[Optional[str]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched analyze_crop for several crops (e.g. all views of one item).
 
-        # if sanitize empties it, try a stricter prompt
-        caption_guided = None
-        if (not caption_final or len(caption_final.split()) < 5) or _caption_mentions_person(caption_primary):
-            guided_prompt = (
-                "Describe ONLY the main object (ignore person/hand/background) in 2–4 sentences. "
-                "Include: object type, material (if visible), color/shade, shape, logos/text (if visible), "
-                "and any visible wear/defects. If something is not visible, say 'not visible'. Do NOT guess."
-            )
-            guided = self.vqa(crop, guided_prompt)
-            caption_guided = guided
-            caption_final2, removed2 = _sanitize_caption(guided)
-            if caption_final2:
-                caption_final = caption_final2
-                removed.extend(removed2)
+        Each analyze_crop step runs as one batched generate() across every crop
+        that needs it, so N views cost one selector call instead of N.
+        Returns one analyze_crop-shaped dict per crop, in input order.
+        """
+        n = len(crops)
+        if len(labels) != n:
+            raise ValueError("analyze_crops_batch requires one label per crop")
+        if n == 0:
+            return []
+
+        crops = [self._resize_for_vl(crop) for crop in crops]
 
-        # 2) OCR
-        ocr_text = self.ocr(crop)
+        # Every stage below re-submits the same crops; prepare each image only once.
+        self._vision_cache = {}
+        try:
+            return self._analyze_crops_batch(crops, labels)
+        finally:
+            self._vision_cache = None
+
+    def _analyze_crops_batch(
+        self,
+        crops: List[Image.Image],
+        labels: List[Optional[str]],
+    ) -> List[Dict[str, Any]]:
+        """Run the batched analyze stages on already-resized crops."""
+        n = len(crops)
 
-        # 3) Color
-        color_vqa = self._color_vqa(crop)
+        # label normalization
+        spec_keys = [canonicalize_label(label) if label else None for label in labels]
+
+        # 1) Caption (with sanitize)
+        caption_primary = self.vqa_batch(crops, [_CAPTION_PROMPT] * n)
+        caption_final: List[str] = []
+        removed: List[List[str]] = []
+        for text in caption_primary:
+            final, dropped = _sanitize_caption(text)
+            caption_final.append(final)
+            removed.append(dropped)
 
-        # 4) Key count
-        key_count: Optional[int] = None
-        if spec_key == "Key":
-            key_count = self._key_count_vqa(crop)
+        # if sanitize empties it, try a stricter prompt
+        caption_guided: List[Optional[str]] = [None] * n
+        retry_idx = [
+            i for i in range(n)
+            if (not caption_final[i] or len(caption_final[i].split()) < 5)
+            or _caption_mentions_person(caption_primary[i])
+        ]
+        if retry_idx:
+            guided = self.vqa_batch([crops[i] for i in retry_idx], [_GUIDED_CAPTION_PROMPT] * len(retry_idx))
+            for i, text in zip(retry_idx, guided):
+                caption_guided[i] = text
+                final2, removed2 = _sanitize_caption(text)
+                if final2:
+                    caption_final[i] = final2
+                    removed[i].extend(removed2)
+
+        # 2) OCR, 3) Color, 4) Key count: independent single-image questions, one batch.
+        # Categories can opt out of OCR/color via CATEGORY_SPECS gates.
+        jobs: List[Tuple[str, int]] = [("ocr", i) for i in range(n) if spec_flag(spec_keys[i], "run_ocr")]
+        jobs += [("color", i) for i in range(n) if spec_flag(spec_keys[i], "run_color")]
+        jobs += [("key_count", i) for i in range(n) if spec_keys[i] == "Key"]
+        question_for = {"ocr": _OCR_PROMPT, "color": _COLOR_PROMPT, "key_count": _KEY_COUNT_PROMPT}
+        answers = self.vqa_batch([crops[i] for _, i in jobs], [question_for[kind] for kind, _ in jobs]) if jobs else []
+
+        ocr_text: List[str] = [""] * n
+        color_vqa: List[Optional[str]] = [None] * n
+        key_count: List[Optional[int]] = [None] * n
+        for (kind, i), ans in zip(jobs, answers):
+            if kind == "ocr":
+                ocr_text[i] = _parse_ocr_answer(ans)
+            elif kind == "color":
+                color_vqa[i] = _parse_color_answer(ans)
+            else:
+                key_count[i] = _parse_key_count_answer(ans)
 
         # 5) Candidate selection (features/defects/attachments)
-        grounded_features: List[str] = []
-        grounded_defects: List[str] = []
-        grounded_attachments: List[str] = []
-
-        selector_raw: Dict[str, Any] = {}
-
-        if spec_key and spec_key in CATEGORY_SPECS:
-            specs = CATEGORY_SPECS.get(spec_key, {})
-            f_list = specs.get("features", []) or []
-            d_list = specs.get("defects", []) or []
-            a_list = specs.get("attachments", []) or []
-
-            selected = self._select_from_candidates(
-                crop,
-                label=spec_key,
-                feature_list=f_list,
-                defect_list=d_list,
-                attachment_list=a_list,
-                ocr_text=ocr_text,
-                color=color_vqa,
+        selected: List[Optional[Dict[str, List[str]]]] = [None] * n
+        select_idx = [i for i in range(n) if spec_keys[i] and spec_keys[i] in _NORMALIZED_SPECS]
+        if select_idx:
+            prompts = []
+            for i in select_idx:
+                specs = _NORMALIZED_SPECS[spec_keys[i]]
+                prompts.append(
+                    _selector_prompt(
+                        spec_keys[i],
+                        specs["features"],
+                        specs["defects"],
+                        specs["attachments"],
+                        ocr_text[i],
+                        color_vqa[i],
+                    )
+                )
+            budget = max(
+                _selector_token_budget(
+                    _NORMALIZED_SPECS[spec_keys[i]]["features"],
+                    _NORMALIZED_SPECS[spec_keys[i]]["defects"],
+                    _NORMALIZED_SPECS[spec_keys[i]]["attachments"],
+                )
+                for i in select_idx
             )
+            raws = self.vqa_batch([crops[i] for i in select_idx], prompts, max_new_tokens=budget)
+            for i, raw_answer in zip(select_idx, raws):
+                specs = _NORMALIZED_SPECS[spec_keys[i]]
+                selected[i] = _parse_selector_answer(
+                    raw_answer, specs["features"], specs["defects"], specs["attachments"]
+                )
+
+        # 6) Optional per-attachment verification, all (crop, attachment) pairs in one batch
+        verified: Dict[int, List[str]] = {}
+        if self.attachment_verify:
+            pairs = [
+                (i, att)
+                for i in select_idx
+                for att in (selected[i] or {}).get("attachments", [])
+            ]
+            if pairs:
+                try:
+                    verdicts = self.vqa_batch(
+                        [crops[i] for i, _ in pairs],
+                        [_attachment_verify_prompt(att) for _, att in pairs],
+                    )
+                except Exception:
+                    # If verification fails, be conservative and drop them
+                    verdicts = [""] * len(pairs)
+                for i in {i for i, _ in pairs}:
+                    verified[i] = []
+                for (i, att), ans in zip(pairs, verdicts):
+                    if ans.strip().lower().startswith("y"):
+                        verified[i].append(att)
+
+        results: List[Dict[str, Any]] = []
+        for i in range(n):
+            grounded_features: List[str] = []
+            grounded_defects: List[str] = []
+            grounded_attachments: List[str] = []
+            selector_raw: Dict[str, Any] = {}
+
+            sel = selected[i]
+            if sel is not None:
+                grounded_features = sel["features"]
+                grounded_defects = sel["defects"]
+                grounded_attachments = sel["attachments"]
+                selector_raw = {"selected_json": sel}
+                if i in verified:
+                    grounded_attachments = verified[i]
+                    selector_raw["attachment_verify"] = {"before": sel["attachments"], "after": verified[i]}
+
+            raw: Dict[str, Any] = {
+                "caption_primary": caption_primary[i],
+                "caption_guided": caption_guided[i],
+                "caption_final": caption_final[i],
+                "caption_removed_sentences": removed[i],
+                "ocr_text": ocr_text[i],
+                "color_vqa": color_vqa[i],
+                "selector_raw": selector_raw,
+                "model_path": self.model_path,
+            }
 
-            grounded_features = selected["features"]
-            grounded_defects = selected["defects"]
-            grounded_attachments = selected["attachments"]
-            selector_raw = {"selected_json": selected}
-
-            # 6) Optional per-attachment verification
-            if self.attachment_verify and grounded_attachments:
-                verified: List[str] = []
-                for att in grounded_attachments:
-                    try:
-                        if self._verify_attachment_yesno(crop, att):
-                            verified.append(att)
-                    except Exception:
-                        # If verification fails, be conservative and drop it
-                        continue
-                grounded_attachments = verified
-                selector_raw["attachment_verify"] = {"before": selected["attachments"], "after": verified}
-
-        raw: Dict[str, Any] = {
-            "caption_primary": caption_primary,
-            "caption_guided": caption_guided,
-            "caption_final": caption_final,
-            "caption_removed_sentences": removed,
-            "ocr_text": ocr_text,
-            "color_vqa": color_vqa,
-            "selector_raw": selector_raw,
-            "model_path": self.model_path,
-        }
+            results.append(
+                {
+                    "caption": caption_final[i],
+                    "ocr_text": ocr_text[i],
+                    "color_vqa": color_vqa[i],
+                    "grounded_features": grounded_features,
+                    "grounded_defects": grounded_defects,
+                    "grounded_attachments": grounded_attachments,
+                    "key_count": key_count[i],
+                    "raw": raw,
+                }
+            )
 
-        return {
-            "caption": caption_final,
-            "ocr_text": ocr_text,
-            "color_vqa": color_vqa,
-            "grounded_features": grounded_features,
-            "grounded_defects": grounded_defects,
-            "grounded_attachments": grounded_attachments,
-            "key_count": key_count,
-            "raw": raw,
-        }
+        return results
@@ -0,0 +1,40 @@
+"""Process-wide shared model services.
+
+Each factory builds its service once per process, so every pipeline that
+falls back to a default service reuses the same loaded model and client
+instead of paying the construction cost again.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from app.services.dino_embedder import DINOEmbedder
+from app.services.florence_service import FlorenceService
+from app.services.reasoner_factory import create_reasoner_from_settings
+from app.services.reasoner_types import ReasonerProtocol
+from app.services.yolo_service import YoloService
+
+
+@lru_cache(maxsize=1)
+def get_yolo_service() -> YoloService:
+    """Return the shared YOLO detection service."""
+    return YoloService()
+
+
+@lru_cache(maxsize=1)
+def get_florence_service() -> FlorenceService:
+    """Return the shared Florence captioning/OCR service."""
+    return FlorenceService()
+
+
+@lru_cache(maxsize=1)
+def get_dino_embedder() -> DINOEmbedder:
+    """Return the shared DINOv2 embedder."""
+    return DINOEmbedder()
+
+
+@lru_cache(maxsize=1)
+def get_reasoner() -> ReasonerProtocol:
+    """Return the shared reasoner so its HTTP client and connection pool are reused."""
+    return create_reasoner_from_settings()
@@ -20,6 +20,28 @@ logger = logging.getLogger(__name__)
 # Keep persistence concerns here: model services should return evidence, while
 # this layer owns database records, Redis cache writes, and transaction shape.
 
+# Debug-only payloads that model services attach to their outputs. They are
+# useful in API responses but only bloat the stored attributes JSON.
+_DB_PROFILE_DROP_KEYS = frozenset({"raw", "_raw_text", "caption_removed_sentences"})
+
+
+def _profile_for_db(value):
+    """Return a copy of a profile with debug-only keys removed at every depth."""
+    if isinstance(value, dict):
+        return {k: _profile_for_db(v) for k, v in value.items() if k not in _DB_PROFILE_DROP_KEYS}
+    if isinstance(value, list):
+        return [_profile_for_db(v) for v in value]
+    return value
+
+
+def _vector_to_db_bytes(vector) -> bytes:
+    """Serialize an embedding as float16 bytes (half the size of float32).
+
+    FAISS remains the search path; the stored copy only needs enough precision
+    to rebuild the index, and EmbeddingRecord.dim records the vector length.
+    """
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
 class StorageService:
     """Stores PP1/PP2 results using the request-scoped database session."""
 
@@ -49,7 +71,7 @@ class StorageService:
                 id=item_id_uuid,
                 category=fused_profile.get("category", "Unknown"),
                 best_view_index=fused_profile.get("best_view_index", 0),
-                attributes_json=fused_profile,  # Storing full profile/attributes
+                attributes_json=_profile_for_db(fused_profile),
                 defects_json=fused_profile.get("defects", {})
             )
             self.db.add(item_record)
@@ -75,7 +97,7 @@ class StorageService:
             
             vec_bytes = None
             if fused_vector is not None:
-                vec_bytes = np.asarray(fused_vector, dtype=np.float32).tobytes()
+                vec_bytes = _vector_to_db_bytes(fused_vector)
 
             embedding_record = EmbeddingRecord(
                 item_id=item_id_uuid,
@@ -170,7 +192,7 @@ class StorageService:
 
             vec_bytes = None
             if vec_128:
-                vec_bytes = np.asarray(vec_128, dtype=np.float32).tobytes()
+                vec_bytes = _vector_to_db_bytes(vec_128)
 
             embedding_record = EmbeddingRecord(
                 item_id=item_id_uuid,
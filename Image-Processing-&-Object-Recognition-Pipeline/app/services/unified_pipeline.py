@@ -9,22 +9,36 @@ Module overview:
 - DINO creates vectors so the item remains searchable by image.
 """
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
 from PIL import Image
 import numpy as np
+import base64
+import copy
+import json
 import os
 import re
 import time
 import uuid
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from app.services.crop_cache import CropResultCache
+from app.services.perf_recorder import PerfRecorder
 from app.services.yolo_service import YoloService
 from app.services.florence_service import FlorenceService
 from app.services.dino_embedder import DINOEmbedder
 from app.services.detection_arbiter import should_run_florence_od, arbitrate
 from app.services.pp2_fusion_service import MultiViewFusionService
-from app.services.reasoner_factory import create_reasoner_from_settings
+from app.services.gemini_reasoner import GeminiReasoner, Phase1BatchReasoner
+from app.services.service_registry import (
+    get_dino_embedder,
+    get_florence_service,
+    get_reasoner,
+    get_yolo_service,
+)
 from app.services.reasoner_types import (
     REASONING_FAILED_MESSAGE,
     RETRYABLE_UNAVAILABLE_MESSAGE,
@@ -32,6 +46,8 @@ from app.services.reasoner_types import (
     ReasonerProtocol,
     ReasonerTransientError,
 )
+from app.domain.bbox_utils import clip_bboxes, usable_bbox_mask
+from app.domain.image_decode import open_rgb_image
 from app.domain.color_utils import normalize_color
 from app.domain.label_keywords import (
     CATEGORY_KEYWORDS,
@@ -44,6 +60,58 @@ from app.domain.category_specs import canonicalize_label
 # from app.domain.category_specs import ALLOWED_LABELS # Removed restriction
 
 logger = logging.getLogger(__name__)
+_TIMINGS_SIDECAR_LOCK = threading.Lock()
+# Detections call the reasoner concurrently, so circuit-breaker updates
+# (read-modify-write on the failure count) are serialized.
+_REASONER_CB_LOCK = threading.Lock()
+
+
+def _new_response_ids() -> Tuple[str, str]:
+    """Return (item_id, image_id) as UUID4 strings drawn from one urandom read."""
+    raw = os.urandom(32)
+    return (
+        str(uuid.UUID(bytes=raw[:16], version=4)),
+        str(uuid.UUID(bytes=raw[16:], version=4)),
+    )
+
+
+def _quantize_u8(vec: np.ndarray) -> Dict[str, Any]:
+    """Affine-quantize a vector to uint8; decode with q * scale + zero."""
+    arr = np.asarray(vec, dtype=np.float32)
+    zero = float(arr.min()) if arr.size else 0.0
+    span = float(arr.max()) - zero if arr.size else 0.0
+    scale = span / 255.0 if span > 0 else 1.0
+    codes = np.round((arr - zero) / scale).clip(0, 255).astype(np.uint8)
+    return {
+        "q": base64.b64encode(codes.tobytes()).decode("ascii"),
+        "scale": scale,
+        "zero": zero,
+        "dim": int(arr.size),
+    }
+
+
+def _encode_f16(vec: np.ndarray) -> str:
+    """Base64-encode a vector as little-endian float16; decode with np.frombuffer(..., "<f2")."""
+    return base64.b64encode(np.asarray(vec, dtype="<f2").tobytes()).decode("ascii")
+
+
+@lru_cache(maxsize=2048)
+def _keyword_pattern(keyword: str) -> Optional[Pattern[str]]:
+    """Compile the whole-token/phrase pattern for one rerank keyword (None if blank)."""
+    phrase = str(keyword or "").strip().lower()
+    if not phrase:
+        return None
+    return re.compile(r"\b" + re.escape(phrase).replace(r"\ ", r"\s+") + r"\b")
+
+
+@lru_cache(maxsize=256)
+def _any_keyword_pattern(keywords: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """Compile one alternation over keywords; a miss proves no single keyword matches."""
+    phrases = [str(kw or "").strip().lower() for kw in keywords]
+    alternatives = [re.escape(phrase).replace(r"\ ", r"\s+") for phrase in phrases if phrase]
+    if not alternatives:
+        return None
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
 
 # PP1 is the single-image path. It prioritizes a reliable primary detection,
 # evidence-locked description generation, and searchable embeddings over broad
@@ -57,6 +125,20 @@ class UnifiedPipeline:
     LABEL_RERANK_SOURCE_WEIGHTS: Dict[str, int] = KEYWORD_SOURCE_WEIGHTS
     LABEL_RERANK_MIN_WINNER_SCORE = int(settings.LABEL_RERANK_MIN_WINNER_SCORE)
     LABEL_RERANK_MIN_MARGIN = int(settings.LABEL_RERANK_MIN_MARGIN)
+    # Derived once at class creation so the per-label scoring loops do not
+    # rebuild them for every detection.
+    _RERANK_SOURCES = ("caption", "ocr", "grounding")
+    _LABEL_SET = frozenset(LABEL_RERANK_KEYWORDS)
+    _LABEL_KEYWORD_TUPLES: Dict[str, Tuple[str, ...]] = {
+        label: tuple(keywords) for label, keywords in LABEL_RERANK_KEYWORDS.items()
+    }
+    _SOURCE_WEIGHT_TUPLE = (
+        int(LABEL_RERANK_SOURCE_WEIGHTS.get("caption", 0)),
+        int(LABEL_RERANK_SOURCE_WEIGHTS.get("ocr", 0)),
+        int(LABEL_RERANK_SOURCE_WEIGHTS.get("grounding", 0)),
+    )
+    # Detections smaller than this fraction of the image are treated as noise.
+    MIN_DETECTION_AREA_RATIO = 0.005
 
     def __init__(
         self,
@@ -68,14 +150,15 @@ class UnifiedPipeline:
         """Initialize PP1 pipeline dependencies, reasoner state, and runtime settings."""
         # Initialize services. The service objects hide model-loading details
         # so this orchestrator can focus on the PP1 decision flow.
-        # Models are loaded lazily or on first use in their respective services.
-        self.yolo = yolo or YoloService()
-        self.florence = florence or FlorenceService()
+        # Models are loaded lazily or on first use in their respective services,
+        # and default services are process-wide singletons shared across instances.
+        self.yolo = yolo or get_yolo_service()
+        self.florence = florence or get_florence_service()
         self.pp1_reasoner_enabled = bool(getattr(settings, "PP1_ENABLE_REASONER", True))
         self.gemini = gemini if gemini is not None else (
-            create_reasoner_from_settings() if self.pp1_reasoner_enabled else None
+            get_reasoner() if self.pp1_reasoner_enabled else None
         )
-        self.dino = dino or DINOEmbedder()
+        self.dino = dino or get_dino_embedder()
         self.perf_profile = str(settings.PERF_PROFILE).lower()
         self.max_detections = max(1, int(settings.PP1_MAX_DETECTIONS))
         self.include_gemini_image = bool(settings.PP1_GEMINI_INCLUDE_IMAGE)
@@ -90,7 +173,95 @@ class UnifiedPipeline:
         # Reasoner circuit breaker state
         self._gemini_fail_count: int = 0
         self._gemini_open_until: float = 0.0
+        self._last_reasoner_error: Optional[BaseException] = None
         self._pp1_thread_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pp1_dino")
+        # Separate pool for whole detections: they submit DINO work to
+        # _pp1_thread_pool themselves, so sharing it could deadlock.
+        self._pp1_detection_pool = self._make_detection_pool()
+        self._crop_cache = self._make_crop_cache()
+
+    @staticmethod
+    def _make_detection_pool() -> Optional[ThreadPoolExecutor]:
+        """Create the per-detection worker pool, or None when concurrency is disabled."""
+        workers = int(getattr(settings, "PP1_MAX_CONCURRENCY", 1))
+        if workers <= 1:
+            return None
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pp1_detection")
+
+    def _record_reasoner_failure(self, exc: Optional[BaseException] = None) -> None:
+        """
+        Count one reasoner failure and open the circuit breaker at the threshold.
+
+        A failed Gemini batch job raises the same exception in every request it
+        carried, so a repeat of the last recorded exception is not counted again.
+        """
+        with _REASONER_CB_LOCK:
+            if exc is not None and exc is self._last_reasoner_error:
+                return
+            self._last_reasoner_error = exc
+            self._gemini_fail_count += 1
+            if self._gemini_fail_count < int(settings.GEMINI_CB_FAILURE_THRESHOLD):
+                return
+            self._gemini_open_until = time.time() + float(settings.GEMINI_CB_RECOVERY_TIMEOUT_S)
+            fail_count = self._gemini_fail_count
+        logger.warning("PP1_REASONER_CIRCUIT_BREAKER_TRIPPED after %d failures", fail_count)
+
+    @staticmethod
+    def _make_crop_cache() -> Optional[CropResultCache]:
+        """Create the crop-content cache, or None when PP1_CROP_CACHE_SIZE is 0."""
+        size = int(getattr(settings, "PP1_CROP_CACHE_SIZE", 0))
+        return CropResultCache(size) if size > 0 else None
+
+    def _analyze_crop_cached(
+        self,
+        crop: Image.Image,
+        canonical_label: str,
+        profile: str,
+        caption_hint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run Florence analyze_crop, reusing the result for byte-identical crops."""
+        kwargs: Dict[str, Any] = {"canonical_label": canonical_label, "profile": profile}
+        if caption_hint is not None:
+            kwargs["caption_hint"] = caption_hint
+        cache = getattr(self, "_crop_cache", None)
+        if cache is None:
+            return self.florence.analyze_crop(crop, **kwargs)
+        key = ("florence", cache.digest(crop), canonical_label, profile)
+        cached = cache.get(key)
+        if cached is not None:
+            # Callers annotate the analysis dict, so hand out a private copy.
+            return copy.deepcopy(cached)
+        analysis = self.florence.analyze_crop(crop, **kwargs)
+        cache.put(key, copy.deepcopy(analysis))
+        return analysis
+
+    @staticmethod
+    def _embeddings_payload(vec_768: Optional[np.ndarray], vec_128: Optional[np.ndarray]) -> Dict[str, Any]:
+        """
+        Build the response embeddings block in the configured PP1_EMBED_FMT.
+
+        "float" (default) returns both vectors as float lists. "q8" replaces
+        the 768d list with a base64 uint8 code plus scale/zero; vector_128d
+        stays float because FAISS indexing and storage consume it directly.
+        "f16" returns both vectors as base64 float16 buffers for clients that
+        decode them with numpy, skipping per-element float objects entirely.
+        """
+        fmt = str(getattr(settings, "PP1_EMBED_FMT", "float") or "float").strip().lower()
+        if fmt == "f16":
+            return {
+                "vector_128d_b64": _encode_f16(vec_128) if vec_128 is not None else None,
+                "vector_dinov2_b64": _encode_f16(vec_768) if vec_768 is not None else None,
+            }
+        vec_128_list = vec_128.tolist() if vec_128 is not None else []
+        if fmt == "q8":
+            return {
+                "vector_128d": vec_128_list,
+                "vector_dinov2_q8": _quantize_u8(vec_768) if vec_768 is not None else None,
+            }
+        return {
+            "vector_128d": vec_128_list,
+            "vector_dinov2": vec_768.tolist() if vec_768 is not None else [],
+        }
 
     @staticmethod
     def _validate_embedding(vec, label: str = "embedding") -> bool:
@@ -106,11 +277,13 @@ class UnifiedPipeline:
 
     def _empty_response(self, status: str, message: str) -> Dict[str, Any]:
         """Helper to return a standardized empty/rejected response."""
+        # A fresh literal is cheaper than deep-copying a shared template.
+        item_id, image_id = _new_response_ids()
         return {
             "status": status,
             "message": message,
-            "item_id": str(uuid.uuid4()),
-            "image": { "image_id": str(uuid.uuid4()), "filename": None },
+            "item_id": item_id,
+            "image": { "image_id": image_id, "filename": None },
             "label": None,
             "confidence": None,
             "bbox": None,
@@ -172,6 +345,7 @@ class UnifiedPipeline:
         detect_ms: float,
         detections: int,
         profile: str,
+        skipped: int = 0,
     ) -> None:
         """Log the PP1 timing breakdown for detection, extraction, reasoning, and storage."""
         raw_payload = primary_result.get("raw", {}) if isinstance(primary_result, dict) else {}
@@ -182,7 +356,7 @@ class UnifiedPipeline:
         logger.info(
             "PP1_TIMING total_ms=%.2f detect_ms=%.2f florence_ms=%.2f florence_od_ms=%.2f "
             "label_rerank_ms=%.2f reasoner_label=%s reasoner_ms=%.2f embeddings_ms=%.2f "
-            "detections=%d profile=%s",
+            "detections=%d skipped=%d profile=%s",
             request_total_ms,
             self._as_float(timings.get("detect_ms", detect_ms)),
             self._as_float(timings.get("florence_ms")),
@@ -196,8 +370,43 @@ class UnifiedPipeline:
             self._as_float(timings.get("gemini_ms")),
             self._as_float(timings.get("embeddings_ms")),
             detections,
+            skipped,
             profile,
         )
+        sidecar_path = getattr(settings, "PP1_TIMINGS_LOG_PATH", None)
+        if sidecar_path:
+            self._append_timings_sidecar(
+                str(sidecar_path),
+                {
+                    "ts": time.time(),
+                    "profile": profile,
+                    "detections": detections,
+                    "skipped": skipped,
+                    "request_total_ms": round(request_total_ms, 2),
+                    "timings": timings,
+                },
+            )
+
+    @staticmethod
+    def _append_timings_sidecar(path: str, record: Dict[str, Any]) -> None:
+        """Append one PP1 timing record to a local JSONL profiling file."""
+        line = json.dumps(record, default=str)
+        try:
+            with _TIMINGS_SIDECAR_LOCK, open(path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        except OSError as exc:
+            logger.warning("PP1_TIMINGS_SIDECAR_FAILED path=%s error=%s", path, exc)
+
+    @staticmethod
+    def _strip_response_timings(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop per-stage timings from response payloads unless explicitly requested."""
+        if bool(getattr(settings, "PP1_INCLUDE_TIMINGS_IN_RESPONSE", False)):
+            return results
+        for result in results:
+            raw_payload = result.get("raw")
+            if isinstance(raw_payload, dict):
+                raw_payload.pop("timings", None)
+        return results
 
     @staticmethod
     def _clean_ocr_snippet(ocr_text: Any) -> str:
@@ -498,39 +707,39 @@ class UnifiedPipeline:
         """Return whether normalized text contains the given keyword as a whole token or phrase."""
         if not text:
             return False
-        phrase = str(keyword or "").strip().lower()
-        if not phrase:
-            return False
-        pattern = r"\b" + re.escape(phrase).replace(r"\ ", r"\s+") + r"\b"
-        return re.search(pattern, text) is not None
+        pattern = _keyword_pattern(keyword)
+        return pattern is not None and pattern.search(text) is not None
 
     def _caption_confirms_yolo_label(self, label: str, analysis: Dict[str, Any]) -> bool:
         """Return True if caption or OCR text contains at least one keyword for *label*."""
-        keywords = CATEGORY_KEYWORDS.get(str(label), [])
-        if not keywords:
+        keywords = self._LABEL_KEYWORD_TUPLES.get(str(label), ())
+        any_keyword = _any_keyword_pattern(keywords)
+        if any_keyword is None:
             return True  # no keywords defined → assume confirmed
         raw = analysis.get("raw_output", analysis)
         caption = str(raw.get("caption_primary", "") if isinstance(raw, dict) else analysis.get("caption", "")).lower()
         ocr = str(analysis.get("ocr_text", "")).lower()
-        for kw in keywords:
-            if self._text_has_keyword(caption, kw) or self._text_has_keyword(ocr, kw):
-                return True
-        return False
+        # The combined alternation matches exactly when some single keyword
+        # does, so one scan per text replaces the per-keyword loop.
+        return any_keyword.search(caption) is not None or any_keyword.search(ocr) is not None
 
     def _score_label_keywords(self, label: str, texts: Dict[str, str], caption_is_generic: bool = False) -> Dict[str, Any]:
         """Score keyword evidence for a candidate label."""
-        keywords = self.LABEL_RERANK_KEYWORDS.get(str(label), [])
-        matched_keywords: Dict[str, List[str]] = {"caption": [], "ocr": [], "grounding": []}
+        keywords = self._LABEL_KEYWORD_TUPLES.get(str(label), ())
+        matched_keywords: Dict[str, List[str]] = {source: [] for source in self._RERANK_SOURCES}
         total = 0
+        any_keyword = _any_keyword_pattern(keywords)
 
-        for source in ("caption", "ocr", "grounding"):
+        for source, weight in zip(self._RERANK_SOURCES, self._SOURCE_WEIGHT_TUPLE):
             source_text = texts.get(source, "")
+            # One combined scan rules out every keyword before the per-keyword
+            # checks, which only run when something can actually match.
+            may_match = bool(source_text) and any_keyword is not None and any_keyword.search(source_text) is not None
             for kw in keywords:
-                if self._text_has_keyword(source_text, kw):
+                if may_match and self._text_has_keyword(source_text, kw):
                     matched_keywords[source].append(kw)
                 elif source == "ocr" and len(kw) >= 3 and kw.lower() in source_text:
                     matched_keywords[source].append(kw)
-            weight = int(self.LABEL_RERANK_SOURCE_WEIGHTS.get(source, 0))
             # Halve caption weight when the caption is too generic to be reliable
             if source == "caption" and caption_is_generic:
                 weight = 0
@@ -539,41 +748,79 @@ class UnifiedPipeline:
         # Negative-keyword penalty (caption only)
         neg_kws = NEGATIVE_KEYWORDS.get(str(label), [])
         caption_text = texts.get("caption", "")
-        neg_hits = sum(1 for nk in neg_kws if self._text_has_keyword(caption_text, nk))
+        any_negative = _any_keyword_pattern(tuple(neg_kws))
+        neg_hits = 0
+        if caption_text and any_negative is not None and any_negative.search(caption_text):
+            neg_hits = sum(1 for nk in neg_kws if self._text_has_keyword(caption_text, nk))
         if neg_hits:
             total = max(0, total - neg_hits * NEGATIVE_KEYWORD_WEIGHT)
 
         return {"score": total, "matched_keywords": matched_keywords}
 
-    def _rerank_label(self, top1_label: str, candidates: List[Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _score_all_labels(self, analysis: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Score every known label once against the analysis text evidence.
+
+        The result is shared by _rerank_label and _derive_florence_strong_label
+        so one detection's evidence is only scanned once.
+        """
+        texts = self._collect_rerank_texts(analysis)
+        if not any(texts.values()):
+            # No caption, OCR or grounding text: every label would score zero,
+            # which callers already treat the same as an unscored label.
+            return {}
+        caption_is_generic = bool((analysis.get("raw") or {}).get("caption_is_generic", False))
+        return {
+            label: self._score_label_keywords(label, texts, caption_is_generic=caption_is_generic)
+            for label in self.LABEL_RERANK_KEYWORDS
+        }
+
+    @staticmethod
+    def _best_detection_for_label(candidates: List[Any], label: str) -> Optional[Any]:
+        """Return the highest-confidence candidate carrying ``label``, if any."""
+        best = None
+        for det in candidates:
+            if det.label == label and (best is None or det.confidence > best.confidence):
+                best = det
+        return best
+
+    def _rerank_label(
+        self,
+        top1_label: str,
+        candidates: List[Any],
+        analysis: Dict[str, Any],
+        label_scores: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         """Rerank the top detected label using extracted text evidence."""
-        candidate_labels: List[str] = []
+        # Ordered dict keys: first-seen order with O(1) membership.
+        candidate_labels: Dict[str, None] = {}
         best_conf_by_label: Dict[str, float] = {}
         for det in candidates:
-            label = str(getattr(det, "label", "") or "")
+            label = det.label
             if not label:
                 continue
-            if label not in candidate_labels:
-                candidate_labels.append(label)
-            conf = float(getattr(det, "confidence", 0.0))
+            candidate_labels.setdefault(label)
+            conf = float(det.confidence)
             prev = best_conf_by_label.get(label)
             if prev is None or conf > prev:
                 best_conf_by_label[label] = conf
 
-        texts = self._collect_rerank_texts(analysis)
-        caption_is_generic = bool((analysis.get("raw") or {}).get("caption_is_generic", False))
+        if label_scores is None:
+            label_scores = self._score_all_labels(analysis)
         scores_by_label = {}
         # Score YOLO candidate labels
         for label in candidate_labels:
-            scores_by_label[label] = self._score_label_keywords(label, texts, caption_is_generic=caption_is_generic)
+            details = label_scores.get(label)
+            if details is None:
+                # Labels without rerank keywords always score zero.
+                details = {"score": 0, "matched_keywords": {"caption": [], "ocr": [], "grounding": []}}
+            scores_by_label[label] = details
         # Also score all known labels not already in candidates
-        for label in self.LABEL_RERANK_KEYWORDS:
+        for label, details in label_scores.items():
             if label not in scores_by_label:
-                details = self._score_label_keywords(label, texts, caption_is_generic=caption_is_generic)
                 if int(details.get("score", 0)) >= self.LABEL_RERANK_MIN_WINNER_SCORE:
                     scores_by_label[label] = details
                     if label not in candidate_labels:
-                        candidate_labels.append(label)
+                        candidate_labels[label] = None
                         best_conf_by_label[label] = 0.0
         top1_score = int(scores_by_label.get(top1_label, {}).get("score", 0))
 
@@ -599,8 +846,8 @@ class UnifiedPipeline:
         winner_score = int(scores_by_label[winner_label]["score"])
         margin = winner_score - top1_score
         contradiction_pair = (
-            top1_label in self.LABEL_RERANK_KEYWORDS
-            and winner_label in self.LABEL_RERANK_KEYWORDS
+            top1_label in self._LABEL_SET
+            and winner_label in self._LABEL_SET
         )
         # Relax margin requirement when OCR evidence strongly supports winner
         winner_ocr_hits = len(scores_by_label.get(winner_label, {}).get("matched_keywords", {}).get("ocr", []))
@@ -636,13 +883,18 @@ class UnifiedPipeline:
             "scores_by_label": scores_by_label,
         }
 
-    def _derive_florence_strong_label(self, analysis: Dict[str, Any]) -> Optional[str]:
+    def _derive_florence_strong_label(
+        self,
+        analysis: Dict[str, Any],
+        label_scores: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Optional[str]:
         """Derive a strong label from Florence evidence when available."""
-        texts = self._collect_rerank_texts(analysis)
-        caption_is_generic = bool((analysis.get("raw") or {}).get("caption_is_generic", False))
+        if label_scores is None:
+            label_scores = self._score_all_labels(analysis)
+        if not label_scores:
+            return None
         scored: List[Dict[str, Any]] = []
-        for label in self.LABEL_RERANK_KEYWORDS:
-            details = self._score_label_keywords(label, texts, caption_is_generic=caption_is_generic)
+        for label, details in label_scores.items():
             matched = details.get("matched_keywords", {})
             caption_hits = len(matched.get("caption", []))
             ocr_hits = len(matched.get("ocr", []))
@@ -675,22 +927,14 @@ class UnifiedPipeline:
         florence = str(florence_label or "")
         return (
             yolo != florence
-            and yolo in self.LABEL_RERANK_KEYWORDS
-            and florence in self.LABEL_RERANK_KEYWORDS
+            and yolo in self._LABEL_SET
+            and florence in self._LABEL_SET
         )
 
     @staticmethod
-    def _unique_labels(labels: List[str]) -> List[str]:
+    def _unique_labels(labels: Iterable[Optional[str]]) -> List[str]:
         """Return labels in first-seen order without duplicates."""
-        seen = set()
-        out: List[str] = []
-        for label in labels:
-            text = str(label or "").strip()
-            if not text or text in seen:
-                continue
-            seen.add(text)
-            out.append(text)
-        return out
+        return list(dict.fromkeys(filter(None, (str(label or "").strip() for label in labels))))
 
     def _build_florence_primary_response(
         self,
@@ -747,9 +991,17 @@ class UnifiedPipeline:
             py2 = min(h, y2 + pad_h)
             crop = image.crop((px1, py1, px2, py2))
 
+        # The crop is final here, so start DINO now and let it overlap the
+        # Florence extraction and description work below.
+        dino_future = None
+        try:
+            dino_future = self._pp1_thread_pool.submit(self.dino.embed_both, crop)
+        except Exception as exc:
+            logger.warning("PP1_DINO_SUBMIT_FAILED: %s", exc)
+
         # Full Florence extraction on the crop
         florence_start = time.perf_counter()
-        analysis = self.florence.analyze_crop(
+        analysis = self._analyze_crop_cached(
             crop,
             canonical_label=florence_label,
             profile=profile,
@@ -784,13 +1036,15 @@ class UnifiedPipeline:
 
         # DINOv2 embeddings
         embeddings_start = time.perf_counter()
-        vec_768_list: List[float] = []
-        vec_128_list: List[float] = []
+        embeddings_payload = self._embeddings_payload(None, None)
         try:
-            vec_768, vec_128 = self.dino.embed_both(crop)
+            if dino_future is not None:
+                embed_timeout = float(getattr(settings, "PP1_DINO_TIMEOUT_S", 10))
+                vec_768, vec_128 = dino_future.result(timeout=embed_timeout)
+            else:
+                vec_768, vec_128 = self.dino.embed_both(crop)
             if self._validate_embedding(vec_768, "florence_primary_768") and self._validate_embedding(vec_128, "florence_primary_128"):
-                vec_768_list = vec_768.tolist()
-                vec_128_list = vec_128.tolist()
+                embeddings_payload = self._embeddings_payload(vec_768, vec_128)
         except Exception as e:
             logger.warning("Florence-primary embedding failed: %s", e)
         embeddings_ms = (time.perf_counter() - embeddings_start) * 1000.0
@@ -804,12 +1058,13 @@ class UnifiedPipeline:
             "total_ms": round(total_ms, 2),
         }
 
+        item_id, image_id = _new_response_ids()
         response = {
             "status": "accepted",
             "message": "Florence-primary detection (YOLO did not detect this category)",
-            "item_id": str(uuid.uuid4()),
+            "item_id": item_id,
             "image": {
-                "image_id": str(uuid.uuid4()),
+                "image_id": image_id,
                 "filename": filename,
             },
             "label": florence_label,
@@ -834,10 +1089,7 @@ class UnifiedPipeline:
             },
             "key_count": key_count,
             "tags": tags,
-            "embeddings": {
-                "vector_128d": vec_128_list,
-                "vector_dinov2": vec_768_list,
-            },
+            "embeddings": embeddings_payload,
             "processing_time": round(total_ms, 2),
             "raw": {
                 "detection_source": "florence_primary",
@@ -864,6 +1116,706 @@ class UnifiedPipeline:
         }
         return [response]
 
+    def _process_detection(
+        self,
+        detection_idx: int,
+        detection: Any,
+        *,
+        image: Image.Image,
+        filename: str,
+        profile: str,
+        include_gemini_image: bool,
+        all_detections: List[Any],
+        rerank_candidates: List[Any],
+        detect_ms: float,
+        prefetched: Optional[Tuple[Image.Image, np.ndarray, np.ndarray]] = None,
+        caption_hint: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run crop analysis, reasoning, and embedding for one detection.
+
+        Returns the PP1 response row, or None when the detection is skipped
+        (tiny box). Only detection_idx == 0 drives label reranking.
+        prefetched carries (crop, vec_768, vec_128) from the batched DINO pass
+        and caption_hint the crop's caption from the batched Florence pass.
+        """
+        det_start = time.perf_counter()
+        perf = PerfRecorder(
+            detect_ms=detect_ms,
+            florence_ms=0.0,
+            florence_od_ms=0.0,
+            label_rerank_ms=0.0,
+            gemini_ms=0.0,
+            embeddings_ms=0.0,
+        )
+
+        # 2. Crop. process_pp1 has already clamped the box to the image and
+        # dropped degenerate ones.
+        x1, y1, x2, y2 = detection.bbox
+        w, h = image.size
+
+        # Minimum size gate: skip tiny detections (noise / partial bboxes)
+        # before any Florence, reasoner, or DINO work is spent on them.
+        skip_reason = self._tiny_box_reason(x2 - x1, y2 - y1, w * h)
+        if skip_reason:
+            logger.info(
+                "PP1_SKIP_TINY detection=%s reason=%s box=%dx%d",
+                detection.label, skip_reason, x2 - x1, y2 - y1,
+            )
+            return None
+
+        crop = prefetched[0] if prefetched is not None else image.crop((x1, y1, x2, y2))
+
+        # 3. Analyze Crop (Caption, OCR, VQA, Grounding). This is the
+        # evidence layer that explains why a category/description was
+        # selected when explaining or debugging the pipeline.
+        with perf.span("florence_ms"):
+            analysis = self._analyze_crop_cached(
+                crop,
+                canonical_label=detection.label,
+                profile=profile,
+                caption_hint=caption_hint,
+            )
+
+        final_detection = detection
+        final_label = detection.label
+        label_lock = False
+        # Score the crop's text evidence once; reranking and the strong-label
+        # check below both read from it.
+        label_scores = self._score_all_labels(analysis)
+        florence_strong_label = self._derive_florence_strong_label(analysis, label_scores)
+        gemini_warnings: List[str] = []
+        label_rerank_payload: Dict[str, Any] = {
+            "enabled": False,
+            "applied": False,
+            "initial_label": detection.label,
+            "final_label": detection.label,
+            "topk_candidates": [],
+            "scores_by_label": {},
+            "winner_label": detection.label,
+            "winner_score": 0,
+            "top1_score": 0,
+            "selected_bbox_source": "top1",
+            "reason": "not_applied_non_primary_detection",
+        }
+        if detection_idx == 0:
+            # Reranking is limited to the primary detection to avoid making
+            # every secondary/background object influence the public result.
+            rerank_start = time.perf_counter()
+            rerank_decision = self._rerank_label(
+                top1_label=detection.label,
+                candidates=rerank_candidates,
+                analysis=analysis,
+                label_scores=label_scores,
+            )
+            final_label = str(rerank_decision["final_label"])
+            selected_bbox_source = "top1"
+            if bool(rerank_decision.get("applied")):
+                best = self._best_detection_for_label(rerank_candidates, final_label)
+                if best is not None:
+                    final_detection = best
+                    selected_bbox_source = "label_best_conf"
+            perf.since("label_rerank_ms", rerank_start)
+            label_rerank_payload = {
+                "enabled": True,
+                "applied": bool(rerank_decision.get("applied", False)),
+                "initial_label": detection.label,
+                "final_label": final_label,
+                "topk_candidates": [
+                    {
+                        "label": str(det.label),
+                        "confidence": float(det.confidence),
+                        "bbox": tuple(det.bbox),
+                    }
+                    for det in rerank_candidates
+                ],
+                "scores_by_label": rerank_decision.get("scores_by_label", {}),
+                "winner_label": rerank_decision.get("winner_label"),
+                "winner_score": int(rerank_decision.get("winner_score", 0)),
+                "top1_score": int(rerank_decision.get("top1_score", 0)),
+                "selected_bbox_source": selected_bbox_source,
+                "reason": str(rerank_decision.get("reason", "")),
+            }
+
+            # Flag low-confidence labels: no keyword evidence AND weak YOLO detection
+            winner_score = int(rerank_decision.get("winner_score", 0))
+            yolo_conf = float(detection.confidence)
+            if winner_score == 0 and yolo_conf < 0.85:
+                label_rerank_payload["low_confidence_label"] = True
+
+            if (
+                florence_strong_label
+                and self._labels_incompatible(detection.label, florence_strong_label)
+            ):
+                label_lock = True
+                final_label = florence_strong_label
+                best = self._best_detection_for_label(rerank_candidates, final_label)
+                if best is not None:
+                    final_detection = best
+                    label_rerank_payload["selected_bbox_source"] = "label_best_conf"
+                else:
+                    label_rerank_payload["selected_bbox_source"] = "top1"
+                label_rerank_payload["final_label"] = final_label
+                label_rerank_payload["reason"] = "canonical_lock_florence_strong"
+                label_rerank_payload["canonical_lock_applied"] = True
+            else:
+                label_rerank_payload["canonical_lock_applied"] = False
+        else:
+            label_rerank_payload["canonical_lock_applied"] = False
+
+        label_candidates = self._unique_labels(
+            chain((det.label for det in rerank_candidates), (florence_strong_label,))
+        )
+
+        # ── Florence OD Fallback ─────────────────────────────────────
+        florence_od_payload: Dict[str, Any] = {"triggered": False, "reason": "not_checked"}
+        if detection_idx == 0:
+            # Skip Florence OD when YOLO is very confident + bbox is substantial
+            # AND caption/OCR evidence confirms the YOLO label
+            top1_conf = float(detection.confidence)
+            bbox_area_ratio = (x2 - x1) * (y2 - y1) / max(1, w * h)
+            caption_confirms = self._caption_confirms_yolo_label(final_label, analysis)
+            if top1_conf >= 0.88 and bbox_area_ratio >= 0.05 and caption_confirms:
+                florence_od_payload = {
+                    "triggered": False,
+                    "reason": "skipped_high_confidence",
+                    "yolo_confidence": top1_conf,
+                    "bbox_area_ratio": round(bbox_area_ratio, 4),
+                }
+            elif top1_conf >= 0.88 and bbox_area_ratio >= 0.05 and not caption_confirms:
+                # High-confidence YOLO but caption does not confirm — force OD
+                trigger_reason = "caption_did_not_confirm"
+                florence_od_start = time.perf_counter()
+                try:
+                    florence_enriched = self.florence.detect_and_describe(image)
+                    arbiter_result = arbitrate(all_detections, florence_enriched, analysis)
+                    perf.since("florence_od_ms", florence_od_start)
+
+                    if arbiter_result.winner_source == "florence":
+                        final_label = arbiter_result.final_label
+                        final_detection = type(detection)(
+                            label=arbiter_result.final_label,
+                            confidence=arbiter_result.final_confidence,
+                            bbox=arbiter_result.final_bbox,
+                        )
+                        label_rerank_payload["final_label"] = final_label
+                        label_rerank_payload["selected_bbox_source"] = "florence_od_arbiter"
+                        # Re-run Florence analyze_crop on possibly new crop
+                        nx1, ny1, nx2, ny2 = arbiter_result.final_bbox
+                        nx1, ny1 = max(0, nx1), max(0, ny1)
+                        nx2, ny2 = min(w, nx2), min(h, ny2)
+                        if nx2 > nx1 and ny2 > ny1:
+                            crop = image.crop((nx1, ny1, nx2, ny2))
+                            analysis = self._analyze_crop_cached(
+                                crop,
+                                canonical_label=final_label,
+                                profile=profile,
+                            )
+
+                    florence_od_payload = {
+                        "triggered": True,
+                        "reason": trigger_reason,
+                        "winner_source": arbiter_result.winner_source,
+                        "florence_detections": arbiter_result.florence_detections,
+                        "arbiter_metadata": arbiter_result.metadata,
+                    }
+                except Exception as exc:
+                    perf.since("florence_od_ms", florence_od_start)
+                    logger.warning("PP1_FLORENCE_OD_FALLBACK_ERROR: %s", exc)
+                    florence_od_payload = {
+                        "triggered": True,
+                        "reason": trigger_reason,
+                        "error": str(exc),
+                    }
+            else:
+                should_run, trigger_reason = should_run_florence_od()
+                if should_run:
+                    florence_od_start = time.perf_counter()
+                    try:
+                        florence_enriched = self.florence.detect_and_describe(image)
+                        arbiter_result = arbitrate(all_detections, florence_enriched, analysis)
+                        perf.since("florence_od_ms", florence_od_start)
+
+                        if arbiter_result.winner_source == "florence":
+                            final_label = arbiter_result.final_label
+                            final_detection = type(detection)(
+                                label=arbiter_result.final_label,
+                                confidence=arbiter_result.final_confidence,
+                                bbox=arbiter_result.final_bbox,
+                            )
+                            label_rerank_payload["final_label"] = final_label
+                            label_rerank_payload["selected_bbox_source"] = "florence_od_arbiter"
+                            nx1, ny1, nx2, ny2 = arbiter_result.final_bbox
+                            nx1, ny1 = max(0, nx1), max(0, ny1)
+                            nx2, ny2 = min(w, nx2), min(h, ny2)
+                            if nx2 > nx1 and ny2 > ny1:
+                                crop = image.crop((nx1, ny1, nx2, ny2))
+                                analysis = self._analyze_crop_cached(
+                                    crop,
+                                    canonical_label=final_label,
+                                    profile=profile,
+                                )
+
+                        florence_od_payload = {
+                            "triggered": True,
+                            "reason": trigger_reason,
+                            "winner_source": arbiter_result.winner_source,
+                            "florence_detections": arbiter_result.florence_detections,
+                            "arbiter_metadata": arbiter_result.metadata,
+                        }
+                    except Exception as exc:
+                        perf.since("florence_od_ms", florence_od_start)
+                        logger.warning("PP1_FLORENCE_OD_FALLBACK_ERROR: %s", exc)
+                        florence_od_payload = {
+                            "triggered": True,
+                            "reason": trigger_reason,
+                            "error": str(exc),
+                        }
+                else:
+                    florence_od_payload = {"triggered": False, "reason": trigger_reason}
+
+        # Update label candidates if Florence OD changed the label
+        if florence_od_payload.get("triggered") and florence_od_payload.get("winner_source") == "florence":
+            label_candidates = self._unique_labels(chain(label_candidates, (final_label,)))
+            florence_strong_label = final_label
+
+        # 4. Construct Evidence JSON for Gemini
+        # The reasoner receives evidence, not the raw application request.
+        # That keeps the generated description anchored to detector output,
+        # OCR, colors, and category details.
+        evidence = {
+            "detection": {
+                "label": final_label,
+                "confidence": final_detection.confidence,
+                "bbox": final_detection.bbox
+            },
+            "canonical_label": final_label,
+            "label_candidates": label_candidates,
+            "label_lock": label_lock,
+            "crop_analysis": analysis
+        }
+
+        # Submit DINO embedding concurrently with upcoming Gemini API call
+        # (skipped when the batched pass already embedded this exact crop).
+        use_prefetched = prefetched is not None and crop is prefetched[0]
+        _dino_future = None
+        if not use_prefetched:
+            try:
+                _dino_future = self._pp1_thread_pool.submit(self.dino.embed_both, crop)
+            except Exception as _exc:
+                logger.warning("PP1_DINO_SUBMIT_FAILED: %s", _exc)
+
+        # 5. Reason with the configured provider. The system can degrade to
+        # Florence-only output when the provider fails, which is why a model
+        # outage does not stop founders from reporting items.
+        gemini_start = time.perf_counter()
+        gemini_error_meta = None
+
+        if not self.pp1_reasoner_enabled:
+            fallback_color = analysis.get("color_vqa") or None
+            if fallback_color:
+                fallback_color = normalize_color(fallback_color) or fallback_color
+            gemini_result = {
+                "status": "accepted_degraded",
+                "message": "Reasoning disabled — accepted with Florence-only data.",
+                "label": final_label,
+                "color": fallback_color,
+                "category_details": {"features": [], "defects": [], "attachments": []},
+                "key_count": None,
+                "final_description": None,
+                "tags": [],
+                "degradation_reason": "reasoner_disabled",
+            }
+            gemini_warnings.append(
+                "Reasoning disabled — accepted with Florence-only data."
+            )
+
+        # Circuit breaker: skip reasoning if too many consecutive failures
+        _cb_open = time.time() < self._gemini_open_until
+        if self.pp1_reasoner_enabled and _cb_open:
+            logger.warning(
+                "PP1_REASONER_CIRCUIT_BREAKER_OPEN: skipping reasoning for %d more seconds",
+                int(self._gemini_open_until - time.time()),
+            )
+            fallback_color = analysis.get("color_vqa") or None
+            if fallback_color:
+                fallback_color = normalize_color(fallback_color) or fallback_color
+            gemini_result = {
+                "status": "accepted_degraded",
+                "message": "Reasoning circuit breaker open — accepted with Florence-only data.",
+                "label": final_label,
+                "color": fallback_color,
+                "category_details": {"features": [], "defects": [], "attachments": []},
+                "key_count": None,
+                "final_description": None,
+                "tags": [],
+                "degradation_reason": "circuit_breaker_open",
+            }
+            gemini_warnings.append(
+                "Reasoning circuit breaker open — accepted with Florence-only data."
+            )
+
+        if self.pp1_reasoner_enabled and not _cb_open:
+          try:
+            assert self.gemini is not None
+            gemini_result = self.gemini.run_phase1(
+                evidence,
+                crop_image=crop if include_gemini_image else None,
+            )
+            # Success — reset circuit breaker
+            with _REASONER_CB_LOCK:
+                self._gemini_fail_count = 0
+          except ReasonerTransientError as exc:
+            logger.warning(
+                "PP1_REASONER_TRANSIENT_FALLBACK status_code=%s provider_status=%s — using Florence data",
+                exc.status_code,
+                exc.provider_status,
+            )
+            gemini_error_meta = exc.to_dict()
+            self._record_reasoner_failure(exc)
+            # Build a usable fallback from Florence so the item stays searchable
+            fallback_color = analysis.get("color_vqa") or None
+            if fallback_color:
+                fallback_color = normalize_color(fallback_color) or fallback_color
+            gemini_result = {
+                "status": "accepted_degraded",
+                "message": RETRYABLE_UNAVAILABLE_MESSAGE,
+                "label": final_label,
+                "color": fallback_color,
+                "category_details": {"features": [], "defects": [], "attachments": []},
+                "key_count": None,
+                "final_description": None,
+                "tags": [],
+                "degradation_reason": "gemini_transient",
+            }
+            gemini_warnings.append(
+                "Reasoning provider unavailable — accepted with Florence-only data. "
+                "Description and color derived from grounded Florence evidence."
+            )
+          except ReasonerFatalError as exc:
+            logger.warning(
+                "PP1_REASONER_FATAL_FALLBACK status_code=%s provider_status=%s",
+                exc.status_code,
+                exc.provider_status,
+            )
+            gemini_error_meta = exc.to_dict()
+            self._record_reasoner_failure(exc)
+            # Build Florence-only fallback so the item stays searchable
+            fallback_color = analysis.get("color_vqa") or None
+            if fallback_color:
+                fallback_color = normalize_color(fallback_color) or fallback_color
+            gemini_result = {
+                "status": "accepted_degraded",
+                "message": "Reasoning provider authentication/authorization failed — accepted with Florence-only data.",
+                "label": final_label,
+                "color": fallback_color,
+                "category_details": {"features": [], "defects": [], "attachments": []},
+                "key_count": None,
+                "final_description": None,
+                "tags": [],
+            }
+            gemini_warnings.append(
+                "Reasoning provider fatal error — accepted with Florence-only data. "
+                "Description and color derived from grounded Florence evidence."
+            )
+          except Exception as exc:
+            logger.exception("PP1_REASONER_UNKNOWN_ERROR")
+            self._record_reasoner_failure(exc)
+            gemini_error_meta = {
+                "type": "reasoner_unknown_error",
+                "status_code": None,
+                "retryable": False,
+                "provider_status": None,
+                "message": str(exc),
+            }
+            gemini_result = {
+                "status": "rejected",
+                "message": REASONING_FAILED_MESSAGE,
+                "label": final_label,
+                "color": None,
+                "category_details": {"features": [], "defects": [], "attachments": []},
+                "key_count": None,
+                "final_description": None,
+                "tags": [],
+            }
+        perf.since("gemini_ms", gemini_start)
+
+        gemini_label_raw = gemini_result.get("label")
+        gemini_label = str(gemini_label_raw).strip() if gemini_label_raw is not None else ""
+
+        # Reject silent label changes from the reasoning provider. This is
+        # a critical guard: generative reasoning may enrich evidence,
+        # but it cannot override the category without explicit support.
+        if (
+            gemini_label
+            and gemini_label != final_label
+            and not label_lock
+            and not gemini_result.get("label_change_reason")
+        ):
+            logger.info(
+                "PP1_REASONER_LABEL_GUARD: provider silently changed %s -> %s — reverting",
+                final_label, gemini_label,
+            )
+            gemini_result["label"] = final_label
+            gemini_warnings.append(
+                f"Reasoning label change reverted ({gemini_label} -> {final_label}): "
+                "no label_change_reason provided."
+            )
+            gemini_label = final_label
+
+        if (
+            florence_strong_label
+            and gemini_label
+            and self._labels_incompatible(gemini_label, florence_strong_label)
+        ):
+            gemini_result["label"] = florence_strong_label
+            gemini_warnings.append(
+                "Reasoning label overridden from "
+                f"{gemini_label} to {florence_strong_label} due to strong Florence evidence (caption/ocr)."
+            )
+            best = self._best_detection_for_label(rerank_candidates, florence_strong_label)
+            if best is not None:
+                final_detection = best
+            final_label = florence_strong_label
+
+        # 6. Embeddings (DINOv2) - collect from the background thread
+        # submitted before the reasoning call. This overlaps slow work and
+        # stores vectors needed for later image-based search.
+        embeddings_start = time.perf_counter()
+        embeddings_payload = self._embeddings_payload(None, None)
+        try:
+            if _dino_future is not None:
+                embed_timeout = float(getattr(settings, "PP1_DINO_TIMEOUT_S", 10))
+                vec_768, vec_128 = _dino_future.result(timeout=embed_timeout)
+            elif use_prefetched:
+                vec_768, vec_128 = prefetched[1], prefetched[2]
+            else:
+                vec_768, vec_128 = self.dino.embed_both(crop)
+            if self._validate_embedding(vec_768, "yolo_768") and self._validate_embedding(vec_128, "yolo_128"):
+                embeddings_payload = self._embeddings_payload(vec_768, vec_128)
+        except Exception as e:
+            logger.warning("Embedding failed: %s", e)
+        perf.since("embeddings_ms", embeddings_start)
+        perf.since("total_ms", det_start)
+        timings = perf.as_dict()
+
+        # 7. Construct Final Response. The raw payload preserves evidence
+        # and timing metadata so each field can be traced back to its source.
+        status = gemini_result.get("status", "rejected")
+
+        raw_payload = {
+            "detection_source": "florence_override" if florence_od_payload.get("winner_source") == "florence" else "yolo",
+            "yolo": {
+                "label": detection.label,
+                "confidence": detection.confidence,
+                "bbox": detection.bbox
+            },
+            "florence": analysis,
+            "florence_od_fallback": florence_od_payload,
+            "label_rerank": label_rerank_payload,
+            "gemini": gemini_result,
+            "gemini_warnings": gemini_warnings,
+            "timings": timings,
+        }
+        if gemini_error_meta is not None:
+            raw_payload["gemini_error"] = gemini_error_meta
+        if isinstance(raw_payload.get("gemini"), dict):
+            raw_payload["gemini"]["evidence_used"] = gemini_result.get("evidence_used", {})
+            raw_payload["gemini"]["validation"] = {
+                "unsupported_claims": gemini_result.get("unsupported_claims", []),
+            }
+            reasoning_meta = gemini_result.get("reasoning_meta", {})
+            if isinstance(reasoning_meta, dict):
+                raw_payload["gemini"]["provider"] = reasoning_meta.get("provider")
+                raw_payload["gemini"]["model_attempts"] = reasoning_meta.get("model_attempts", [])
+                raw_payload["gemini"]["selected_model"] = reasoning_meta.get("selected_model")
+                raw_payload["gemini"]["failover_reason"] = reasoning_meta.get("failover_reason")
+
+        response_label = gemini_result.get("label") or final_label
+        response_color = gemini_result.get("color")
+        response_category_details = gemini_result.get("category_details", {
+            "features": [], "defects": [], "attachments": []
+        })
+        response_key_count = gemini_result.get("key_count")
+        description_bundle = None
+        if response_label:
+            description_bundle = self._compose_pp1_description_bundle(
+                label=response_label,
+                color=response_color or analysis.get("color_vqa"),
+                analysis=analysis,
+                category_details=response_category_details,
+                key_count=response_key_count if response_key_count is not None else analysis.get("key_count"),
+                preferred_description=gemini_result.get("detailed_description") or gemini_result.get("final_description"),
+                preferred_description_source=(
+                    "gemini_evidence_locked"
+                    if gemini_result.get("detailed_description") or gemini_result.get("final_description")
+                    else None
+                ),
+            )
+            raw_payload["description_debug"] = description_bundle
+            gemini_result["final_description"] = description_bundle.get("final_description")
+            raw_payload["description_quality"] = description_bundle.get("description_quality", {})
+
+        item_id, image_id = _new_response_ids()
+        response = {
+            "status": status,
+            "message": gemini_result.get("message", "Success" if status == "accepted" else "Rejected by reasoner"),
+            "item_id": item_id,
+            "image": {
+                "image_id": image_id,
+                "filename": filename
+            },
+            "label": response_label,
+            "confidence": final_detection.confidence,
+            "bbox": final_detection.bbox,
+            "color": response_color,
+            "ocr_text": analysis.get("ocr_text", ""),
+            "ocr_text_display": analysis.get("ocr_text_display", ""),
+            "ocr_lines": analysis.get("ocr_lines", []),
+            "ocr_layout_source": analysis.get("ocr_layout_source"),
+            "final_description": description_bundle.get("final_description") if description_bundle else None,
+            "detailed_description": description_bundle.get("detailed_description") if description_bundle else None,
+            "description_source": description_bundle.get("description_source") if description_bundle else None,
+            "detailed_description_source": description_bundle.get("detailed_description_source") if description_bundle else None,
+            "description_evidence_used": description_bundle.get("description_evidence_used") if description_bundle else {"summary": [], "detailed": []},
+            "description_filters_applied": description_bundle.get("description_filters_applied") if description_bundle else [],
+            "description_word_count": description_bundle.get("description_word_count") if description_bundle else {"final_description": 0, "detailed_description": 0},
+            "description_quality": description_bundle.get("description_quality") if description_bundle else {},
+            "category_details": response_category_details,
+            "key_count": response_key_count,
+            "tags": gemini_result.get("tags", []),
+            "embeddings": embeddings_payload,
+            "processing_time": timings["total_ms"],
+            "raw": raw_payload
+        }
+        return response
+
+    def _tiny_box_reason(self, box_w: int, box_h: int, image_area: int) -> Optional[str]:
+        """Return why a clamped box is too small to analyze, or None when it is usable."""
+        if min(box_w, box_h) < int(settings.PP1_MIN_CROP_SIDE):
+            return "min_side"
+        bbox_area = box_w * box_h
+        if bbox_area < int(settings.PP1_MIN_CROP_AREA):
+            return "min_area"
+        if image_area > 0 and (bbox_area / image_area) < self.MIN_DETECTION_AREA_RATIO:
+            return "area_ratio"
+        return None
+
+    def _prefetch_detection_captions(
+        self,
+        detection_crops: List[Optional[Image.Image]],
+        profile: str,
+    ) -> List[Optional[str]]:
+        """
+        Caption every usable detection crop in one batched Florence pass.
+
+        Returns a caption per detection. Entries stay None for skipped boxes,
+        for crops the batch left uncaptioned, and for every crop when the
+        batch call fails, so analyze_crop captions those crops itself.
+        """
+        hints: List[Optional[str]] = [None] * len(detection_crops)
+        caption_batch = getattr(self.florence, "caption_batch", None)
+        if caption_batch is None:
+            return hints
+        indices = [idx for idx, crop in enumerate(detection_crops) if crop is not None]
+        if len(indices) < 2:
+            return hints
+        try:
+            captions = caption_batch(
+                [detection_crops[idx] for idx in indices],
+                detailed=(profile != "fast"),
+                profile=profile,
+            )
+            if not isinstance(captions, list) or len(captions) != len(indices):
+                raise ValueError(f"expected {len(indices)} captions")
+        except Exception as exc:
+            logger.warning("PP1_FLORENCE_CAPTION_BATCH_FAILED: %s — captioning per detection", exc)
+            return hints
+        for idx, caption in zip(indices, captions):
+            if caption:
+                hints[idx] = str(caption)
+        return hints
+
+    def _detection_crops(self, image: Image.Image, boxes: np.ndarray) -> List[Optional[Image.Image]]:
+        """Crop every usable clamped box once; None marks boxes the tiny-box gate would skip."""
+        w, h = image.size
+        usable = usable_bbox_mask(
+            boxes,
+            min_side=int(settings.PP1_MIN_CROP_SIDE),
+            min_area=int(settings.PP1_MIN_CROP_AREA),
+            image_area=w * h,
+            min_area_ratio=self.MIN_DETECTION_AREA_RATIO,
+        )
+        return [
+            image.crop(tuple(box)) if keep else None
+            for box, keep in zip(boxes.tolist(), usable.tolist())
+        ]
+
+    def _prefetch_detection_embeddings(
+        self,
+        detection_crops: List[Optional[Image.Image]],
+    ) -> List[Optional[Tuple[Image.Image, np.ndarray, np.ndarray]]]:
+        """
+        Embed every usable detection crop in one batched DINO pass.
+
+        Returns (crop, vec_768, vec_128) per detection, or None for skipped
+        boxes. Any batch failure leaves all entries None so each detection
+        falls back to its own embedding call.
+        """
+        prefetched: List[Optional[Tuple[Image.Image, np.ndarray, np.ndarray]]] = [None] * len(detection_crops)
+        embed_batch = getattr(self.dino, "embed_both_batch", None)
+        if embed_batch is None:
+            return prefetched
+        indices = [idx for idx, crop in enumerate(detection_crops) if crop is not None]
+        crops = [detection_crops[idx] for idx in indices]
+        if len(crops) < 2:
+            return prefetched
+        try:
+            vecs_768, vecs_128 = embed_batch(crops)
+            if len(vecs_768) != len(crops) or len(vecs_128) != len(crops):
+                raise ValueError(f"expected {len(crops)} vectors, got {len(vecs_768)}/{len(vecs_128)}")
+        except Exception as exc:
+            logger.warning("PP1_DINO_BATCH_FAILED: %s — embedding per detection", exc)
+            return prefetched
+        for idx, crop, vec_768, vec_128 in zip(indices, crops, vecs_768, vecs_128):
+            prefetched[idx] = (crop, vec_768, vec_128)
+        return prefetched
+
+    def process_pp1_batch(self, image_paths: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Run PP1 over many images for backfill, reasoning through Gemini batch mode.
+
+        Local stages (YOLO, Florence, DINO) run as usual; reasoning calls are
+        accumulated into discounted Gemini batch jobs when PP1_USE_BATCH is on.
+        Returns one process_pp1 result list per input path, in input order.
+        """
+        if not image_paths:
+            return []
+        if not bool(getattr(settings, "PP1_USE_BATCH", False)) or not isinstance(self.gemini, GeminiReasoner):
+            return [self.process_pp1(path) for path in image_paths]
+
+        max_items = max(1, int(getattr(settings, "PP1_GEMINI_BATCH_MAX_ITEMS", 64)))
+        batch_reasoner = Phase1BatchReasoner(
+            self.gemini,
+            max_items=max_items,
+            idle_s=float(getattr(settings, "PP1_GEMINI_BATCH_IDLE_S", 5.0)),
+        )
+        # A shallow copy shares the loaded models but keeps the batch reasoner
+        # and its circuit-breaker state away from interactive requests.
+        runner = copy.copy(self)
+        runner.gemini = batch_reasoner
+        runner._gemini_fail_count = 0
+        runner._gemini_open_until = 0.0
+        runner._last_reasoner_error = None
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(len(image_paths), max_items),
+                thread_name_prefix="pp1_batch",
+            ) as pool:
+                return list(pool.map(runner.process_pp1, image_paths))
+        finally:
+            batch_reasoner.close()
+
     def process_pp1(self, image_path: str) -> List[Dict[str, Any]]:
         """
         Phase 1 Pipeline: Single Image Analysis
@@ -882,12 +1834,13 @@ class UnifiedPipeline:
         """
         request_start = time.perf_counter()
 
-        if not os.path.exists(image_path):
-            return [self._empty_response("rejected", f"Image file not found: {image_path}")]
-
         try:
-            image = Image.open(image_path).convert("RGB")
-            logger.info("PP1_IMAGE_OPEN: OK path=%s format=%s size=%s", image_path, image.format, image.size)
+            # Decode once into RGB (TurboJPEG for JPEGs when installed).
+            image, image_format = open_rgb_image(image_path)
+            logger.info("PP1_IMAGE_OPEN: OK path=%s format=%s size=%s", image_path, image_format, image.size)
+        except FileNotFoundError:
+            # Letting open() report ENOENT saves a separate exists() stat.
+            return [self._empty_response("rejected", f"Image file not found: {image_path}")]
         except Exception as e:
             # Dump magic bytes to identify the actual file format in logs
             try:
@@ -910,10 +1863,16 @@ class UnifiedPipeline:
             self._gemini_fail_count = 0
         if not hasattr(self, "_gemini_open_until"):
             self._gemini_open_until = 0.0
+        if not hasattr(self, "_last_reasoner_error"):
+            self._last_reasoner_error = None
         if not hasattr(self, "pp1_reasoner_enabled"):
             self.pp1_reasoner_enabled = bool(getattr(settings, "PP1_ENABLE_REASONER", True))
         if not hasattr(self, "_pp1_thread_pool"):
             self._pp1_thread_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pp1_dino")
+        if not hasattr(self, "_pp1_detection_pool"):
+            self._pp1_detection_pool = self._make_detection_pool()
+        if not hasattr(self, "_crop_cache"):
+            self._crop_cache = self._make_crop_cache()
 
         # 1. Detect. YOLO runs before captioning because a crop removes
         # background noise and gives Florence/embedding models the object area.
@@ -933,7 +1892,7 @@ class UnifiedPipeline:
             if florence_result:
                 logger.info("PP1_FLORENCE_PRIMARY: YOLO empty, Florence detected '%s'",
                             florence_result[0].get("label", "unknown"))
-                return florence_result
+                return self._strip_response_timings(florence_result)
             resp = self._empty_response("rejected", "No object detected by YOLO or Florence.")
             resp["image"]["filename"] = filename
             return [resp]
@@ -942,594 +1901,54 @@ class UnifiedPipeline:
         # candidates are still kept for label reranking so a strong alternate
         # category can correct a weak top-1 label.
         all_detections.sort(key=lambda x: x.confidence, reverse=True)
-        detections = all_detections[: self.max_detections]
+        min_det_conf = float(settings.PP1_MIN_DET_CONF)
+        detections = [
+            det for det in all_detections[: self.max_detections]
+            if det.confidence >= min_det_conf
+        ]
+        if detections:
+            # Clamp every selected box in one vectorized pass and write it
+            # back, so crops and the response "bbox" use the same box.
+            boxes, valid = clip_bboxes([det.bbox for det in detections], *image.size)
+            for det, box in zip(detections, boxes.tolist()):
+                det.bbox = tuple(box)
+            detections = [det for det, keep in zip(detections, valid.tolist()) if keep]
+            boxes = boxes[valid]
         rerank_candidates = all_detections[: self.LABEL_RERANK_TOPK]
         
-        results: List[Dict[str, Any]] = []
-        
-        for detection_idx, detection in enumerate(detections):
-            det_start = time.perf_counter()
-
-            # 2. Crop
-            # Ensure bbox is within image bounds
-            x1, y1, x2, y2 = detection.bbox
-            w, h = image.size
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(w, x2)
-            y2 = min(h, y2)
-            
-            if x2 <= x1 or y2 <= y1:
-                 continue
-
-            # Minimum area gate: skip tiny detections (noise / partial bboxes)
-            bbox_area = (x2 - x1) * (y2 - y1)
-            image_area = w * h
-            if image_area > 0 and (bbox_area / image_area) < 0.005:
-                logger.info(
-                    "PP1_SKIP_TINY detection=%s area_ratio=%.4f",
-                    detection.label, bbox_area / image_area,
-                )
-                continue
-
-            crop = image.crop((x1, y1, x2, y2))
-
-            # 3. Analyze Crop (Caption, OCR, VQA, Grounding). This is the
-            # evidence layer that explains why a category/description was
-            # selected when explaining or debugging the pipeline.
-            florence_start = time.perf_counter()
-            analysis = self.florence.analyze_crop(
-                crop,
-                canonical_label=detection.label,
+        # Embed all usable crops in one DINO forward pass instead of one
+        # pass per detection.
+        prefetched: List[Optional[Tuple[Image.Image, np.ndarray, np.ndarray]]] = [None] * len(detections)
+        caption_hints: List[Optional[str]] = [None] * len(detections)
+        if len(detections) > 1:
+            detection_crops = self._detection_crops(image, boxes)
+            prefetched = self._prefetch_detection_embeddings(detection_crops)
+            caption_hints = self._prefetch_detection_captions(detection_crops, profile)
+
+        # Detections are independent: each one waits mostly on the reasoner
+        # HTTP call, and GPU work is serialized by gpu_inference_guard, so
+        # secondary detections run concurrently instead of back to back.
+        def _run(indexed: Any) -> Optional[Dict[str, Any]]:
+            detection_idx, detection = indexed
+            return self._process_detection(
+                detection_idx,
+                detection,
+                image=image,
+                filename=filename,
                 profile=profile,
+                include_gemini_image=include_gemini_image,
+                all_detections=all_detections,
+                rerank_candidates=rerank_candidates,
+                detect_ms=detect_ms,
+                prefetched=prefetched[detection_idx],
+                caption_hint=caption_hints[detection_idx],
             )
-            florence_ms = (time.perf_counter() - florence_start) * 1000.0
-
-            final_detection = detection
-            final_label = detection.label
-            label_rerank_ms = 0.0
-            label_lock = False
-            florence_strong_label: Optional[str] = None
-            gemini_warnings: List[str] = []
-            label_rerank_payload: Dict[str, Any] = {
-                "enabled": False,
-                "applied": False,
-                "initial_label": detection.label,
-                "final_label": detection.label,
-                "topk_candidates": [],
-                "scores_by_label": {},
-                "winner_label": detection.label,
-                "winner_score": 0,
-                "top1_score": 0,
-                "selected_bbox_source": "top1",
-                "reason": "not_applied_non_primary_detection",
-            }
-            if detection_idx == 0:
-                # Reranking is limited to the primary detection to avoid making
-                # every secondary/background object influence the public result.
-                rerank_start = time.perf_counter()
-                rerank_decision = self._rerank_label(
-                    top1_label=detection.label,
-                    candidates=rerank_candidates,
-                    analysis=analysis,
-                )
-                final_label = str(rerank_decision["final_label"])
-                selected_bbox_source = "top1"
-                if bool(rerank_decision.get("applied")):
-                    matching = [det for det in rerank_candidates if str(getattr(det, "label", "")) == final_label]
-                    if matching:
-                        final_detection = max(matching, key=lambda det: float(getattr(det, "confidence", 0.0)))
-                        selected_bbox_source = "label_best_conf"
-                label_rerank_ms = (time.perf_counter() - rerank_start) * 1000.0
-                label_rerank_payload = {
-                    "enabled": True,
-                    "applied": bool(rerank_decision.get("applied", False)),
-                    "initial_label": detection.label,
-                    "final_label": final_label,
-                    "topk_candidates": [
-                        {
-                            "label": str(getattr(det, "label", "")),
-                            "confidence": float(getattr(det, "confidence", 0.0)),
-                            "bbox": tuple(getattr(det, "bbox", ())),
-                        }
-                        for det in rerank_candidates
-                    ],
-                    "scores_by_label": rerank_decision.get("scores_by_label", {}),
-                    "winner_label": rerank_decision.get("winner_label"),
-                    "winner_score": int(rerank_decision.get("winner_score", 0)),
-                    "top1_score": int(rerank_decision.get("top1_score", 0)),
-                    "selected_bbox_source": selected_bbox_source,
-                    "reason": str(rerank_decision.get("reason", "")),
-                }
 
-                # Flag low-confidence labels: no keyword evidence AND weak YOLO detection
-                winner_score = int(rerank_decision.get("winner_score", 0))
-                yolo_conf = float(detection.confidence)
-                if winner_score == 0 and yolo_conf < 0.85:
-                    label_rerank_payload["low_confidence_label"] = True
-
-                florence_strong_label = self._derive_florence_strong_label(analysis)
-                if (
-                    florence_strong_label
-                    and self._labels_incompatible(detection.label, florence_strong_label)
-                ):
-                    label_lock = True
-                    final_label = florence_strong_label
-                    matching = [
-                        det for det in rerank_candidates
-                        if str(getattr(det, "label", "")) == final_label
-                    ]
-                    if matching:
-                        final_detection = max(
-                            matching,
-                            key=lambda det: float(getattr(det, "confidence", 0.0)),
-                        )
-                        label_rerank_payload["selected_bbox_source"] = "label_best_conf"
-                    else:
-                        label_rerank_payload["selected_bbox_source"] = "top1"
-                    label_rerank_payload["final_label"] = final_label
-                    label_rerank_payload["reason"] = "canonical_lock_florence_strong"
-                    label_rerank_payload["canonical_lock_applied"] = True
-                else:
-                    label_rerank_payload["canonical_lock_applied"] = False
-            else:
-                label_rerank_payload["canonical_lock_applied"] = False
-
-            if florence_strong_label is None:
-                florence_strong_label = self._derive_florence_strong_label(analysis)
-
-            label_candidates = self._unique_labels(
-                [str(getattr(det, "label", "")) for det in rerank_candidates]
-                + ([florence_strong_label] if florence_strong_label else [])
-            )
-
-            # ── Florence OD Fallback ─────────────────────────────────────
-            florence_od_payload: Dict[str, Any] = {"triggered": False, "reason": "not_checked"}
-            florence_od_ms = 0.0
-            if detection_idx == 0:
-                # Skip Florence OD when YOLO is very confident + bbox is substantial
-                # AND caption/OCR evidence confirms the YOLO label
-                top1_conf = float(detection.confidence)
-                bbox_area_ratio = (x2 - x1) * (y2 - y1) / max(1, w * h)
-                caption_confirms = self._caption_confirms_yolo_label(final_label, analysis)
-                if top1_conf >= 0.88 and bbox_area_ratio >= 0.05 and caption_confirms:
-                    florence_od_payload = {
-                        "triggered": False,
-                        "reason": "skipped_high_confidence",
-                        "yolo_confidence": top1_conf,
-                        "bbox_area_ratio": round(bbox_area_ratio, 4),
-                    }
-                elif top1_conf >= 0.88 and bbox_area_ratio >= 0.05 and not caption_confirms:
-                    # High-confidence YOLO but caption does not confirm — force OD
-                    trigger_reason = "caption_did_not_confirm"
-                    florence_od_start = time.perf_counter()
-                    try:
-                        florence_enriched = self.florence.detect_and_describe(image)
-                        arbiter_result = arbitrate(all_detections, florence_enriched, analysis)
-                        florence_od_ms = (time.perf_counter() - florence_od_start) * 1000.0
-
-                        if arbiter_result.winner_source == "florence":
-                            final_label = arbiter_result.final_label
-                            final_detection = type(detection)(
-                                label=arbiter_result.final_label,
-                                confidence=arbiter_result.final_confidence,
-                                bbox=arbiter_result.final_bbox,
-                            )
-                            label_rerank_payload["final_label"] = final_label
-                            label_rerank_payload["selected_bbox_source"] = "florence_od_arbiter"
-                            # Re-run Florence analyze_crop on possibly new crop
-                            nx1, ny1, nx2, ny2 = arbiter_result.final_bbox
-                            nx1, ny1 = max(0, nx1), max(0, ny1)
-                            nx2, ny2 = min(w, nx2), min(h, ny2)
-                            if nx2 > nx1 and ny2 > ny1:
-                                crop = image.crop((nx1, ny1, nx2, ny2))
-                                analysis = self.florence.analyze_crop(
-                                    crop,
-                                    canonical_label=final_label,
-                                    profile=profile,
-                                )
-
-                        florence_od_payload = {
-                            "triggered": True,
-                            "reason": trigger_reason,
-                            "winner_source": arbiter_result.winner_source,
-                            "florence_detections": arbiter_result.florence_detections,
-                            "arbiter_metadata": arbiter_result.metadata,
-                        }
-                    except Exception as exc:
-                        florence_od_ms = (time.perf_counter() - florence_od_start) * 1000.0
-                        logger.warning("PP1_FLORENCE_OD_FALLBACK_ERROR: %s", exc)
-                        florence_od_payload = {
-                            "triggered": True,
-                            "reason": trigger_reason,
-                            "error": str(exc),
-                        }
-                else:
-                    should_run, trigger_reason = should_run_florence_od()
-                    if should_run:
-                        florence_od_start = time.perf_counter()
-                        try:
-                            florence_enriched = self.florence.detect_and_describe(image)
-                            arbiter_result = arbitrate(all_detections, florence_enriched, analysis)
-                            florence_od_ms = (time.perf_counter() - florence_od_start) * 1000.0
-
-                            if arbiter_result.winner_source == "florence":
-                                final_label = arbiter_result.final_label
-                                final_detection = type(detection)(
-                                    label=arbiter_result.final_label,
-                                    confidence=arbiter_result.final_confidence,
-                                    bbox=arbiter_result.final_bbox,
-                                )
-                                label_rerank_payload["final_label"] = final_label
-                                label_rerank_payload["selected_bbox_source"] = "florence_od_arbiter"
-                                nx1, ny1, nx2, ny2 = arbiter_result.final_bbox
-                                nx1, ny1 = max(0, nx1), max(0, ny1)
-                                nx2, ny2 = min(w, nx2), min(h, ny2)
-                                if nx2 > nx1 and ny2 > ny1:
-                                    crop = image.crop((nx1, ny1, nx2, ny2))
-                                    analysis = self.florence.analyze_crop(
-                                        crop,
-                                        canonical_label=final_label,
-                                        profile=profile,
-                                    )
-
-                            florence_od_payload = {
-                                "triggered": True,
-                                "reason": trigger_reason,
-                                "winner_source": arbiter_result.winner_source,
-                                "florence_detections": arbiter_result.florence_detections,
-                                "arbiter_metadata": arbiter_result.metadata,
-                            }
-                        except Exception as exc:
-                            florence_od_ms = (time.perf_counter() - florence_od_start) * 1000.0
-                            logger.warning("PP1_FLORENCE_OD_FALLBACK_ERROR: %s", exc)
-                            florence_od_payload = {
-                                "triggered": True,
-                                "reason": trigger_reason,
-                                "error": str(exc),
-                            }
-                    else:
-                        florence_od_payload = {"triggered": False, "reason": trigger_reason}
-
-            # Update label candidates if Florence OD changed the label
-            if florence_od_payload.get("triggered") and florence_od_payload.get("winner_source") == "florence":
-                label_candidates = self._unique_labels(
-                    label_candidates + [final_label]
-                )
-                florence_strong_label = final_label
-
-            # 4. Construct Evidence JSON for Gemini
-            # The reasoner receives evidence, not the raw application request.
-            # That keeps the generated description anchored to detector output,
-            # OCR, colors, and category details.
-            evidence = {
-                "detection": {
-                    "label": final_label,
-                    "confidence": final_detection.confidence,
-                    "bbox": final_detection.bbox
-                },
-                "canonical_label": final_label,
-                "label_candidates": label_candidates,
-                "label_lock": label_lock,
-                "crop_analysis": analysis
-            }
-
-            # Submit DINO embedding concurrently with upcoming Gemini API call
-            _dino_future = None
-            try:
-                _dino_future = self._pp1_thread_pool.submit(self.dino.embed_both, crop)
-            except Exception as _exc:
-                logger.warning("PP1_DINO_SUBMIT_FAILED: %s", _exc)
-
-            # 5. Reason with the configured provider. The system can degrade to
-            # Florence-only output when the provider fails, which is why a model
-            # outage does not stop founders from reporting items.
-            gemini_start = time.perf_counter()
-            gemini_error_meta = None
-
-            if not self.pp1_reasoner_enabled:
-                fallback_color = analysis.get("color_vqa") or None
-                if fallback_color:
-                    fallback_color = normalize_color(fallback_color) or fallback_color
-                gemini_result = {
-                    "status": "accepted_degraded",
-                    "message": "Reasoning disabled — accepted with Florence-only data.",
-                    "label": final_label,
-                    "color": fallback_color,
-                    "category_details": {"features": [], "defects": [], "attachments": []},
-                    "key_count": None,
-                    "final_description": None,
-                    "tags": [],
-                    "degradation_reason": "reasoner_disabled",
-                }
-                gemini_warnings.append(
-                    "Reasoning disabled — accepted with Florence-only data."
-                )
-
-            # Circuit breaker: skip reasoning if too many consecutive failures
-            _cb_open = time.time() < self._gemini_open_until
-            if self.pp1_reasoner_enabled and _cb_open:
-                logger.warning(
-                    "PP1_REASONER_CIRCUIT_BREAKER_OPEN: skipping reasoning for %d more seconds",
-                    int(self._gemini_open_until - time.time()),
-                )
-                fallback_color = analysis.get("color_vqa") or None
-                if fallback_color:
-                    fallback_color = normalize_color(fallback_color) or fallback_color
-                gemini_result = {
-                    "status": "accepted_degraded",
-                    "message": "Reasoning circuit breaker open — accepted with Florence-only data.",
-                    "label": final_label,
-                    "color": fallback_color,
-                    "category_details": {"features": [], "defects": [], "attachments": []},
-                    "key_count": None,
-                    "final_description": None,
-                    "tags": [],
-                    "degradation_reason": "circuit_breaker_open",
-                }
-                gemini_warnings.append(
-                    "Reasoning circuit breaker open — accepted with Florence-only data."
-                )
-
-            if self.pp1_reasoner_enabled and not _cb_open:
-              try:
-                assert self.gemini is not None
-                gemini_result = self.gemini.run_phase1(
-                    evidence,
-                    crop_image=crop if include_gemini_image else None,
-                )
-                # Success — reset circuit breaker
-                self._gemini_fail_count = 0
-              except ReasonerTransientError as exc:
-                logger.warning(
-                    "PP1_REASONER_TRANSIENT_FALLBACK status_code=%s provider_status=%s — using Florence data",
-                    exc.status_code,
-                    exc.provider_status,
-                )
-                gemini_error_meta = exc.to_dict()
-                self._gemini_fail_count += 1
-                if self._gemini_fail_count >= int(settings.GEMINI_CB_FAILURE_THRESHOLD):
-                    self._gemini_open_until = time.time() + float(settings.GEMINI_CB_RECOVERY_TIMEOUT_S)
-                    logger.warning("PP1_REASONER_CIRCUIT_BREAKER_TRIPPED after %d failures", self._gemini_fail_count)
-                # Build a usable fallback from Florence so the item stays searchable
-                fallback_color = analysis.get("color_vqa") or None
-                if fallback_color:
-                    fallback_color = normalize_color(fallback_color) or fallback_color
-                gemini_result = {
-                    "status": "accepted_degraded",
-                    "message": RETRYABLE_UNAVAILABLE_MESSAGE,
-                    "label": final_label,
-                    "color": fallback_color,
-                    "category_details": {"features": [], "defects": [], "attachments": []},
-                    "key_count": None,
-                    "final_description": None,
-                    "tags": [],
-                    "degradation_reason": "gemini_transient",
-                }
-                gemini_warnings.append(
-                    "Reasoning provider unavailable — accepted with Florence-only data. "
-                    "Description and color derived from grounded Florence evidence."
-                )
-              except ReasonerFatalError as exc:
-                logger.warning(
-                    "PP1_REASONER_FATAL_FALLBACK status_code=%s provider_status=%s",
-                    exc.status_code,
-                    exc.provider_status,
-                )
-                gemini_error_meta = exc.to_dict()
-                self._gemini_fail_count += 1
-                if self._gemini_fail_count >= int(settings.GEMINI_CB_FAILURE_THRESHOLD):
-                    self._gemini_open_until = time.time() + float(settings.GEMINI_CB_RECOVERY_TIMEOUT_S)
-                    logger.warning("PP1_REASONER_CIRCUIT_BREAKER_TRIPPED after %d failures", self._gemini_fail_count)
-                # Build Florence-only fallback so the item stays searchable
-                fallback_color = analysis.get("color_vqa") or None
-                if fallback_color:
-                    fallback_color = normalize_color(fallback_color) or fallback_color
-                gemini_result = {
-                    "status": "accepted_degraded",
-                    "message": "Reasoning provider authentication/authorization failed — accepted with Florence-only data.",
-                    "label": final_label,
-                    "color": fallback_color,
-                    "category_details": {"features": [], "defects": [], "attachments": []},
-                    "key_count": None,
-                    "final_description": None,
-                    "tags": [],
-                }
-                gemini_warnings.append(
-                    "Reasoning provider fatal error — accepted with Florence-only data. "
-                    "Description and color derived from grounded Florence evidence."
-                )
-              except Exception as exc:
-                logger.exception("PP1_REASONER_UNKNOWN_ERROR")
-                self._gemini_fail_count += 1
-                if self._gemini_fail_count >= int(settings.GEMINI_CB_FAILURE_THRESHOLD):
-                    self._gemini_open_until = time.time() + float(settings.GEMINI_CB_RECOVERY_TIMEOUT_S)
-                    logger.warning("PP1_REASONER_CIRCUIT_BREAKER_TRIPPED after %d failures", self._gemini_fail_count)
-                gemini_error_meta = {
-                    "type": "reasoner_unknown_error",
-                    "status_code": None,
-                    "retryable": False,
-                    "provider_status": None,
-                    "message": str(exc),
-                }
-                gemini_result = {
-                    "status": "rejected",
-                    "message": REASONING_FAILED_MESSAGE,
-                    "label": final_label,
-                    "color": None,
-                    "category_details": {"features": [], "defects": [], "attachments": []},
-                    "key_count": None,
-                    "final_description": None,
-                    "tags": [],
-                }
-            gemini_ms = (time.perf_counter() - gemini_start) * 1000.0
-
-            gemini_label_raw = gemini_result.get("label")
-            gemini_label = str(gemini_label_raw).strip() if gemini_label_raw is not None else ""
-
-            # Reject silent label changes from the reasoning provider. This is
-            # a critical guard: generative reasoning may enrich evidence,
-            # but it cannot override the category without explicit support.
-            if (
-                gemini_label
-                and gemini_label != final_label
-                and not label_lock
-                and not gemini_result.get("label_change_reason")
-            ):
-                logger.info(
-                    "PP1_REASONER_LABEL_GUARD: provider silently changed %s -> %s — reverting",
-                    final_label, gemini_label,
-                )
-                gemini_result["label"] = final_label
-                gemini_warnings.append(
-                    f"Reasoning label change reverted ({gemini_label} -> {final_label}): "
-                    "no label_change_reason provided."
-                )
-                gemini_label = final_label
-
-            if (
-                florence_strong_label
-                and gemini_label
-                and self._labels_incompatible(gemini_label, florence_strong_label)
-            ):
-                gemini_result["label"] = florence_strong_label
-                gemini_warnings.append(
-                    "Reasoning label overridden from "
-                    f"{gemini_label} to {florence_strong_label} due to strong Florence evidence (caption/ocr)."
-                )
-                matching = [
-                    det for det in rerank_candidates
-                    if str(getattr(det, "label", "")) == florence_strong_label
-                ]
-                if matching:
-                    final_detection = max(
-                        matching,
-                        key=lambda det: float(getattr(det, "confidence", 0.0)),
-                    )
-                final_label = florence_strong_label
-            
-            # 6. Embeddings (DINOv2) - collect from the background thread
-            # submitted before the reasoning call. This overlaps slow work and
-            # stores vectors needed for later image-based search.
-            embeddings_start = time.perf_counter()
-            vec_768_list = []
-            vec_128_list = []
-            try:
-                if _dino_future is not None:
-                    embed_timeout = float(getattr(settings, "PP1_DINO_TIMEOUT_S", 10))
-                    vec_768, vec_128 = _dino_future.result(timeout=embed_timeout)
-                else:
-                    vec_768, vec_128 = self.dino.embed_both(crop)
-                if self._validate_embedding(vec_768, "yolo_768") and self._validate_embedding(vec_128, "yolo_128"):
-                    vec_768_list = vec_768.tolist()
-                    vec_128_list = vec_128.tolist()
-            except Exception as e:
-                logger.warning("Embedding failed: %s", e)
-            embeddings_ms = (time.perf_counter() - embeddings_start) * 1000.0
-
-            total_ms = (time.perf_counter() - det_start) * 1000.0
-            timings = {
-                "detect_ms": round(detect_ms, 2),
-                "florence_ms": round(florence_ms, 2),
-                "florence_od_ms": round(florence_od_ms, 2),
-                "label_rerank_ms": round(label_rerank_ms, 2),
-                "gemini_ms": round(gemini_ms, 2),
-                "embeddings_ms": round(embeddings_ms, 2),
-                "total_ms": round(total_ms, 2),
-            }
-
-            # 7. Construct Final Response. The raw payload preserves evidence
-            # and timing metadata so each field can be traced back to its source.
-            status = gemini_result.get("status", "rejected")
-            
-            raw_payload = {
-                "detection_source": "florence_override" if florence_od_payload.get("winner_source") == "florence" else "yolo",
-                "yolo": {
-                    "label": detection.label,
-                    "confidence": detection.confidence,
-                    "bbox": detection.bbox
-                },
-                "florence": analysis,
-                "florence_od_fallback": florence_od_payload,
-                "label_rerank": label_rerank_payload,
-                "gemini": gemini_result,
-                "gemini_warnings": gemini_warnings,
-                "timings": timings,
-            }
-            if gemini_error_meta is not None:
-                raw_payload["gemini_error"] = gemini_error_meta
-            if isinstance(raw_payload.get("gemini"), dict):
-                raw_payload["gemini"]["evidence_used"] = gemini_result.get("evidence_used", {})
-                raw_payload["gemini"]["validation"] = {
-                    "unsupported_claims": gemini_result.get("unsupported_claims", []),
-                }
-                reasoning_meta = gemini_result.get("reasoning_meta", {})
-                if isinstance(reasoning_meta, dict):
-                    raw_payload["gemini"]["provider"] = reasoning_meta.get("provider")
-                    raw_payload["gemini"]["model_attempts"] = reasoning_meta.get("model_attempts", [])
-                    raw_payload["gemini"]["selected_model"] = reasoning_meta.get("selected_model")
-                    raw_payload["gemini"]["failover_reason"] = reasoning_meta.get("failover_reason")
-
-            response_label = gemini_result.get("label") or final_label
-            response_color = gemini_result.get("color")
-            response_category_details = gemini_result.get("category_details", {
-                "features": [], "defects": [], "attachments": []
-            })
-            response_key_count = gemini_result.get("key_count")
-            description_bundle = None
-            if response_label:
-                description_bundle = self._compose_pp1_description_bundle(
-                    label=response_label,
-                    color=response_color or analysis.get("color_vqa"),
-                    analysis=analysis,
-                    category_details=response_category_details,
-                    key_count=response_key_count if response_key_count is not None else analysis.get("key_count"),
-                    preferred_description=gemini_result.get("detailed_description") or gemini_result.get("final_description"),
-                    preferred_description_source=(
-                        "gemini_evidence_locked"
-                        if gemini_result.get("detailed_description") or gemini_result.get("final_description")
-                        else None
-                    ),
-                )
-                raw_payload["description_debug"] = description_bundle
-                gemini_result["final_description"] = description_bundle.get("final_description")
-                raw_payload["description_quality"] = description_bundle.get("description_quality", {})
-
-            response = {
-                "status": status,
-                "message": gemini_result.get("message", "Success" if status == "accepted" else "Rejected by reasoner"),
-                "item_id": str(uuid.uuid4()),
-                "image": {
-                    "image_id": str(uuid.uuid4()),
-                    "filename": filename
-                },
-                "label": response_label,
-                "confidence": final_detection.confidence,
-                "bbox": final_detection.bbox,
-                "color": response_color,
-                "ocr_text": analysis.get("ocr_text", ""),
-                "ocr_text_display": analysis.get("ocr_text_display", ""),
-                "ocr_lines": analysis.get("ocr_lines", []),
-                "ocr_layout_source": analysis.get("ocr_layout_source"),
-                "final_description": description_bundle.get("final_description") if description_bundle else None,
-                "detailed_description": description_bundle.get("detailed_description") if description_bundle else None,
-                "description_source": description_bundle.get("description_source") if description_bundle else None,
-                "detailed_description_source": description_bundle.get("detailed_description_source") if description_bundle else None,
-                "description_evidence_used": description_bundle.get("description_evidence_used") if description_bundle else {"summary": [], "detailed": []},
-                "description_filters_applied": description_bundle.get("description_filters_applied") if description_bundle else [],
-                "description_word_count": description_bundle.get("description_word_count") if description_bundle else {"final_description": 0, "detailed_description": 0},
-                "description_quality": description_bundle.get("description_quality") if description_bundle else {},
-                "category_details": response_category_details,
-                "key_count": response_key_count,
-                "tags": gemini_result.get("tags", []),
-                "embeddings": {
-                    "vector_128d": vec_128_list,
-                    "vector_dinov2": vec_768_list
-                },
-                "processing_time": round(total_ms, 2),
-                "raw": raw_payload
-            }
-            results.append(response)
+        if len(detections) > 1 and self._pp1_detection_pool is not None:
+            rows = list(self._pp1_detection_pool.map(_run, enumerate(detections)))
+        else:
+            rows = [_run(indexed) for indexed in enumerate(detections)]
+        results: List[Dict[str, Any]] = [row for row in rows if row is not None]
         
         if not results:
              resp = self._empty_response("rejected", "No valid objects processed.")
@@ -1543,8 +1962,9 @@ class UnifiedPipeline:
             detect_ms=detect_ms,
             detections=len(results),
             profile=profile,
+            skipped=len(detections) - len(results),
         )
         if request_total_ms > 8000:
             logger.warning("PP1_SLOW_REQUEST total_ms=%.2f profile=%s", request_total_ms, profile)
-             
-        return results
+
+        return self._strip_response_timings(results)
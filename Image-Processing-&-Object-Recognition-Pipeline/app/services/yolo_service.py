@@ -5,15 +5,18 @@ bounding boxes so later Florence, Gemini, and DINO steps can work on the item
 crop instead of the whole background-heavy image.
 """
 
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import logging
 import threading
 import time
 
+import numpy as np
 from PIL import Image
 from ultralytics import YOLO
+from app.config.settings import settings
 from app.domain.category_specs import canonicalize_label
 from app.services.gpu_semaphore import gpu_inference_guard
 
@@ -27,6 +30,20 @@ logger = logging.getLogger(__name__)
 # Config constants
 MODEL_DIR = Path(__file__).resolve().parents[1] / "models"
 YOLO_WEIGHTS_PATH = MODEL_DIR / "final_master_model.pt"
+# TensorRT engine exported next to the weights when YOLO_BACKEND=tensorrt.
+YOLO_ENGINE_PATH = YOLO_WEIGHTS_PATH.with_suffix(".engine")
+
+
+def _cuda_capability() -> Optional[Tuple[int, int]]:
+    """Return the CUDA compute capability of device 0, or None without a usable GPU."""
+    try:
+        import torch
+
+        if not torch.cuda.is_available():
+            return None
+        return tuple(torch.cuda.get_device_capability(0))
+    except Exception:
+        return None
 
 @dataclass
 class YoloDetection:
@@ -36,15 +53,111 @@ class YoloDetection:
     confidence: float
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
 
+
+# Below this many boxes a plain sort is cheaper than building NumPy arrays.
+_TOPK_NUMPY_MIN = 32
+
+
+def top_k_detections(detections: List[YoloDetection], k: Optional[int] = None) -> List[YoloDetection]:
+    """
+    Return detections ordered by confidence (highest first), truncated to k.
+
+    Large lists with a small k use np.argpartition so only the kept boxes
+    are sorted. Equal confidences keep their original order either way.
+    """
+    limit = k if isinstance(k, int) and k > 0 else None
+    if limit is None or limit >= len(detections) or len(detections) < _TOPK_NUMPY_MIN:
+        ordered = sorted(detections, key=lambda x: x.confidence, reverse=True)
+        return ordered[:limit] if limit is not None else ordered
+    confs = np.fromiter((d.confidence for d in detections), dtype=np.float64, count=len(detections))
+    idx = np.sort(np.argpartition(-confs, limit - 1)[:limit])
+    idx = idx[np.argsort(-confs[idx], kind="stable")]
+    return [detections[i] for i in idx.tolist()]
+
+class YoloInferenceBatcher:
+    """
+    Coalesce concurrent YOLO predict calls into one batched model call.
+
+    Callers block in predict() as usual. A single worker thread collects
+    requests until max_batch are queued or max_wait_s has passed since the
+    first one, then runs one model call per confidence threshold and hands
+    each caller its own result.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Any], float], List[Any]],
+        *,
+        max_batch: int,
+        max_wait_s: float,
+    ) -> None:
+        """Start the background worker around a list-in, list-out predict function."""
+        self._predict_batch = predict_batch
+        self._max_batch = max(1, int(max_batch))
+        self._max_wait_s = max(0.0, float(max_wait_s))
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[Any, float, Future]] = []
+        self._worker = threading.Thread(target=self._run, name="yolo_batcher", daemon=True)
+        self._worker.start()
+
+    def predict(self, image: Any, conf: float) -> List[Any]:
+        """Queue one image and wait for its (single-element) result list."""
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((image, float(conf), future))
+            self._cond.notify_all()
+        return future.result()
+
+    def _take_batch(self) -> List[Tuple[Any, float, Future]]:
+        """Block until requests are queued, then wait briefly for more to join."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self._max_wait_s
+            while len(self._pending) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(timeout=remaining)
+            batch = self._pending[: self._max_batch]
+            del self._pending[: self._max_batch]
+            return batch
+
+    def _run(self) -> None:
+        """Run queued requests in batches and resolve their waiters."""
+        while True:
+            batch = self._take_batch()
+            by_conf: Dict[float, List[Tuple[Any, float, Future]]] = {}
+            for item in batch:
+                by_conf.setdefault(item[1], []).append(item)
+            for conf, items in by_conf.items():
+                try:
+                    results = list(self._predict_batch([image for image, _, _ in items], conf))
+                    if len(results) != len(items):
+                        raise RuntimeError(f"YOLO returned {len(results)} results for {len(items)} images")
+                except Exception as exc:
+                    for _, _, future in items:
+                        future.set_exception(exc)
+                    continue
+                for (_, _, future), result in zip(items, results):
+                    future.set_result([result])
+
+
 class YoloService:
     """Loads local YOLO weights and exposes thread-safe detection."""
 
     def __init__(self):
         """Initialize YOLO model state before lazy loading."""
         self.model = None
+        self.weights_path: Path = YOLO_WEIGHTS_PATH
+        # Extra keyword arguments for every predict call (e.g. half=True on
+        # tensor-core GPUs when running the .pt weights).
+        self._predict_kwargs: Dict[str, Any] = {}
         self._predict_lock = threading.Lock()
         self._warmup_lock = threading.Lock()
         self._warmup_done = False
+        self._batcher: Optional[YoloInferenceBatcher] = None
+        self._batcher_lock = threading.Lock()
         self._load_model()
 
     def warmup(self) -> None:
@@ -69,7 +182,7 @@ class YoloService:
                 dummy = Image.new("RGB", (32, 32), color=(0, 0, 0))
                 with self._predict_lock:
                     with gpu_inference_guard("predict", "yolo"):
-                        self.model(dummy, conf=0.01, verbose=False)
+                        self.model(dummy, conf=0.01, verbose=False, **self._predict_kwargs)
                 self._warmup_done = True
                 elapsed_ms = (time.perf_counter() - start) * 1000.0
                 logger.debug("YOLO_WARMUP_DONE elapsed_ms=%.2f", elapsed_ms)
@@ -88,16 +201,103 @@ class YoloService:
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
+        capability = _cuda_capability()
+        self.weights_path = self._resolve_weights_path(capability)
         try:
-            logger.info(f"Loading YOLO model from {YOLO_WEIGHTS_PATH}...")
+            logger.info(f"Loading YOLO model from {self.weights_path}...")
             # Load model using the string path as posix
-            self.model = YOLO(YOLO_WEIGHTS_PATH.as_posix())
+            self.model = YOLO(self.weights_path.as_posix())
             logger.info("YOLO model loaded successfully.")
         except Exception as e:
             error_msg = f"Failed to load YOLO model: {str(e)}"
             logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
+        # A TensorRT engine already carries its FP16 precision; the .pt
+        # weights run in half precision on Turing-or-newer GPUs.
+        if (
+            self.weights_path.suffix == ".pt"
+            and bool(settings.YOLO_HALF)
+            and capability is not None
+            and capability >= (7, 5)
+        ):
+            self._predict_kwargs = {"half": True}
+
+    def _resolve_weights_path(self, capability: Optional[Tuple[int, int]]) -> Path:
+        """
+        Pick the weights to load: the TensorRT engine when YOLO_BACKEND=tensorrt
+        and a GPU is present (exporting it once if missing), else the .pt file.
+        """
+        backend = str(getattr(settings, "YOLO_BACKEND", "torch") or "torch").strip().lower()
+        if backend != "tensorrt":
+            return YOLO_WEIGHTS_PATH
+        if capability is None:
+            logger.warning("YOLO_TENSORRT_UNAVAILABLE reason=no_cuda falling_back=pt")
+            return YOLO_WEIGHTS_PATH
+        if YOLO_ENGINE_PATH.exists():
+            return YOLO_ENGINE_PATH
+
+        start = time.perf_counter()
+        try:
+            exported = YOLO(YOLO_WEIGHTS_PATH.as_posix()).export(
+                format="engine",
+                half=True,
+                imgsz=int(settings.YOLO_IMGSZ),
+                device=0,
+                workspace=4,
+            )
+        except Exception:
+            logger.warning("YOLO_TENSORRT_EXPORT_FAIL falling_back=pt", exc_info=True)
+            return YOLO_WEIGHTS_PATH
+        engine_path = Path(exported) if exported else YOLO_ENGINE_PATH
+        logger.info(
+            "YOLO_TENSORRT_EXPORTED path=%s elapsed_ms=%.2f",
+            engine_path,
+            (time.perf_counter() - start) * 1000.0,
+        )
+        return engine_path if engine_path.exists() else YOLO_WEIGHTS_PATH
+
+    @staticmethod
+    def _preshrink(image: Any) -> Tuple[Any, int]:
+        """
+        Shrink large PIL inputs by an integer factor before prediction.
+
+        Ultralytics letterboxes every input to YOLO_IMGSZ anyway, but first
+        copies the full-resolution frame into a BGR array. Image.reduce()
+        keeps the longest side >= 2 * YOLO_IMGSZ, so the model still sees a
+        downsampled input. Returns the image and the factor that maps boxes
+        back to source coordinates.
+        """
+        if not isinstance(image, Image.Image) or not bool(getattr(settings, "YOLO_PRESHRINK", True)):
+            return image, 1
+        factor = max(image.size) // (2 * int(settings.YOLO_IMGSZ))
+        if factor < 2:
+            return image, 1
+        return image.reduce(factor), factor
+
+    def _get_batcher(self) -> Optional[YoloInferenceBatcher]:
+        """Return the shared micro-batcher when YOLO_MAX_BATCH > 1, creating it on first use."""
+        max_batch = int(getattr(settings, "YOLO_MAX_BATCH", 1))
+        if max_batch <= 1:
+            return None
+        batcher = getattr(self, "_batcher", None)
+        if batcher is not None:
+            return batcher
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = YoloInferenceBatcher(
+                    self._predict_batch,
+                    max_batch=max_batch,
+                    max_wait_s=float(getattr(settings, "YOLO_BATCH_WAIT_MS", 5)) / 1000.0,
+                )
+        return self._batcher
+
+    def _predict_batch(self, images: List[Any], conf: float) -> List[Any]:
+        """Run one model call over several images (ultralytics accepts a list)."""
+        with self._predict_lock:
+            with gpu_inference_guard("predict", "yolo"):
+                return self.model(images, conf=conf, verbose=False, **self._predict_kwargs)
+
     def detect_objects(
         self,
         image_path_or_array: Any,
@@ -125,12 +325,22 @@ class YoloService:
             except Exception:
                 logger.warning("YOLO_WARMUP_LAZY_FAIL continuing_without_warmup", exc_info=True)
 
+        image_path_or_array, box_scale = self._preshrink(image_path_or_array)
         start = time.perf_counter()
         logger.debug("YOLO_PREDICT_START conf=%.4f", float(conf_threshold))
         try:
-            with self._predict_lock:
-                with gpu_inference_guard("predict", "yolo"):
-                    results = self.model(image_path_or_array, conf=conf_threshold, verbose=False)
+            batcher = self._get_batcher()
+            if batcher is not None and not isinstance(image_path_or_array, (list, tuple)):
+                results = batcher.predict(image_path_or_array, float(conf_threshold))
+            else:
+                with self._predict_lock:
+                    with gpu_inference_guard("predict", "yolo"):
+                        results = self.model(
+                            image_path_or_array,
+                            conf=conf_threshold,
+                            verbose=False,
+                            **self._predict_kwargs,
+                        )
         except Exception as exc:
             elapsed_ms = (time.perf_counter() - start) * 1000.0
             logger.exception(
@@ -162,7 +372,7 @@ class YoloService:
                 final_label = canonical if canonical else raw_label
 
                 # Get bounding box coordinates (x1, y1, x2, y2)
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
+                x1, y1, x2, y2 = (int(v * box_scale) for v in box.xyxy[0])
                 
                 detections.append(YoloDetection(
                     label=final_label,
@@ -170,8 +380,4 @@ class YoloService:
                     bbox=(x1, y1, x2, y2)
                 ))
 
-        detections.sort(key=lambda x: x.confidence, reverse=True)
-        if isinstance(max_detections, int) and max_detections > 0:
-            detections = detections[:max_detections]
-
-        return detections
+        return top_k_detections(detections, max_detections)
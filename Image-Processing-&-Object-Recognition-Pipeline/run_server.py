@@ -20,7 +20,7 @@ if __name__ == "__main__":
     host = os.environ.get("HOST", "0.0.0.0")
     port = int(os.environ.get("PORT", 8002))
     reload = os.environ.get("RELOAD", "false").lower() in ("1", "true", "yes")
-    workers = int(os.environ.get("WORKERS", 1))
+    workers = int(os.environ.get("WORKERS", os.environ.get("WEB_CONCURRENCY", 1)))
     log_level = os.environ.get("LOG_LEVEL", "info").lower()
 
     uvicorn.run(
@@ -30,4 +30,8 @@ if __name__ == "__main__":
         reload=reload,
         workers=workers if not reload else 1,
         log_level=log_level,
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard])
+        # and falls back to asyncio/h11, e.g. on Windows.
+        loop="auto",
+        http="auto",
     )
@@ -0,0 +1,60 @@
+"""Export the local DINOv2 model to ONNX for DINO_BACKEND=onnx.
+
+The exported graph takes ``pixel_values`` (B, 3, H, W) and returns
+``last_hidden_state`` with a dynamic batch axis. ONNX Runtime builds and caches
+an FP16 TensorRT engine from it on first use when the TensorRT execution
+provider is available.
+
+Usage:
+    python scripts/export_dino_onnx.py [--output path/to/dinov2.onnx]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import model_paths
+from app.config.settings import settings
+
+logger = logging.getLogger("export_dino_onnx")
+
+
+def export(output_path: str, opset: int) -> None:
+    import torch
+    from transformers import AutoModel
+
+    model = AutoModel.from_pretrained(model_paths.DINOV2_REPO_PATH, local_files_only=True)
+    model.eval()
+    size = int(settings.DINO_INPUT_SIZE)
+    dummy = torch.zeros(1, 3, size, size, dtype=torch.float32)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy,),
+            output_path,
+            input_names=["pixel_values"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "last_hidden_state": {0: "batch"}},
+            opset_version=opset,
+        )
+    logger.info("Exported DINO ONNX model to %s", output_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=model_paths.DINOV2_ONNX_PATH)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    export(args.output, args.opset)
+
+
+if __name__ == "__main__":
+    main()
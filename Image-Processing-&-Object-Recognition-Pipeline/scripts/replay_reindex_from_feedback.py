@@ -280,25 +280,57 @@ def _build_pp1_metadata(existing_python_item_id: str, detection: dict[str, Any],
     return metadata
 
 
-def _replay_pp1_record(record: ReplayRecord, services: dict[str, Any]) -> dict[str, Any]:
-    temp_paths: list[str] = []
+def _index_pp1_result(
+    record: ReplayRecord,
+    result: list[dict[str, Any]],
+    image_path: str,
+    services: dict[str, Any],
+) -> dict[str, Any]:
+    detection = _select_accepted_pp1_detection(result)
+    if detection is None:
+        return {"status": "failed", "reason": "no_accepted_pp1_detection"}
+
+    vector_128 = (detection.get("embeddings") or {}).get("vector_128d") or []
+    if len(vector_128) != 128:
+        return {"status": "failed", "reason": "invalid_pp1_vector_128d"}
+
+    metadata = _build_pp1_metadata(record.python_item_id, detection, image_path)
+    faiss_id = services["faiss"].add(vector_128, metadata)
+    return {"status": "indexed", "faiss_id": int(faiss_id), "analysis_mode": "pp1"}
+
+
+def _replay_pp1_records(records: list[ReplayRecord], services: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    outcomes: dict[str, dict[str, Any]] = {}
+    temp_paths: dict[str, str] = {}
     try:
-        temp_path = _convert_heic_if_needed(_download_to_tempfile(record.image_urls[0]))
-        temp_paths.append(temp_path)
-        result = services["unified"].process_pp1(temp_path)
-        detection = _select_accepted_pp1_detection(result)
-        if detection is None:
-            return {"status": "failed", "reason": "no_accepted_pp1_detection"}
-
-        vector_128 = (detection.get("embeddings") or {}).get("vector_128d") or []
-        if len(vector_128) != 128:
-            return {"status": "failed", "reason": "invalid_pp1_vector_128d"}
-
-        metadata = _build_pp1_metadata(record.python_item_id, detection, temp_path)
-        faiss_id = services["faiss"].add(vector_128, metadata)
-        return {"status": "indexed", "faiss_id": int(faiss_id), "analysis_mode": "pp1"}
+        for record in records:
+            try:
+                temp_paths[record.found_item_id] = _convert_heic_if_needed(
+                    _download_to_tempfile(record.image_urls[0])
+                )
+            except Exception as exc:
+                logger.exception("Replay download failed for found_item_id=%s", record.found_item_id)
+                outcomes[record.found_item_id] = {"status": "failed", "reason": str(exc)}
+
+        ready = [record for record in records if record.found_item_id in temp_paths]
+        try:
+            results = services["unified"].process_pp1_batch([temp_paths[record.found_item_id] for record in ready])
+        except Exception as exc:
+            logger.exception("PP1 batch replay failed for %d records", len(ready))
+            for record in ready:
+                outcomes[record.found_item_id] = {"status": "failed", "reason": str(exc)}
+            return outcomes
+        for record, result in zip(ready, results):
+            try:
+                outcomes[record.found_item_id] = _index_pp1_result(
+                    record, result, temp_paths[record.found_item_id], services
+                )
+            except Exception as exc:
+                logger.exception("Replay failed for found_item_id=%s", record.found_item_id)
+                outcomes[record.found_item_id] = {"status": "failed", "reason": str(exc)}
     finally:
-        _cleanup_paths(temp_paths)
+        _cleanup_paths(list(temp_paths.values()))
+    return outcomes
 
 
 async def _replay_pp2_record_async(record: ReplayRecord, services: dict[str, Any]) -> dict[str, Any]:
@@ -397,6 +429,10 @@ def main() -> int:
         "records": [],
     }
 
+    # PP1 records run through one process_pp1_batch call so that, with
+    # PP1_USE_BATCH on, their reasoning shares discounted Gemini batch jobs.
+    pp1_outcomes = _replay_pp1_records([record for record in records if record.analysis_mode == "pp1"], services)
+
     for record in records:
         logger.info(
             "Replaying found_item_id=%s analysis_mode=%s python_item_id=%s image_count=%d",
@@ -407,7 +443,7 @@ def main() -> int:
         )
         try:
             if record.analysis_mode == "pp1":
-                result = _replay_pp1_record(record, services)
+                result = pp1_outcomes[record.found_item_id]
             else:
                 result = _replay_pp2_record(record, services)
         except Exception as exc:
@@ -1,25 +1,47 @@
+import logging
+
 import torch
 import torch.nn as nn
 import torchvision.models as models
 
+logger = logging.getLogger(__name__)
+
 class SiameseNetwork(nn.Module):
-    def __init__(self):
+    def __init__(self, pretrained=False, compile_backbone=False):
         super(SiameseNetwork, self).__init__()
-        # Load pretrained ResNet-18
-        # Using weights=models.ResNet18_Weights.DEFAULT for the best available weights
-        self.resnet = models.resnet18(weights=models.ResNet18_Weights.DEFAULT)
+        # ResNet-18 backbone. ImageNet weights (~45 MB download) are only
+        # fetched when pretrained=True, e.g. to start a new training run;
+        # loading a saved checkpoint does not need them.
+        weights = models.ResNet18_Weights.DEFAULT if pretrained else None
+        self.resnet = models.resnet18(weights=weights)
         
         # Modify the fully connected layer to output a 128-dimensional embedding vector
         # The original fc layer has 512 input features
         in_features = self.resnet.fc.in_features
         self.resnet.fc = nn.Linear(in_features, 128)
 
+        # Opt-in: compile forward (not the module) so state_dict keys stay
+        # unchanged and saved checkpoints still load.
+        if compile_backbone and torch.cuda.is_available():
+            try:
+                self.resnet.forward = torch.compile(self.resnet.forward, mode="reduce-overhead")
+            except Exception:
+                logger.warning("SIAMESE_COMPILE_FAILED_FALLBACK_EAGER", exc_info=True)
+
     def forward_one(self, x):
         """
         Get embeddings for a single image.
         """
         return self.resnet(x)
 
+    @torch.inference_mode()
+    def embed(self, x):
+        """
+        Inference-only embeddings: FP16 autocast on CUDA, FP32 output.
+        """
+        with torch.autocast(device_type="cuda", dtype=torch.float16, enabled=x.is_cuda):
+            return self.forward_one(x).float()
+
     def forward(self, x1, x2):
         """
         Get embeddings for two images (standard Siamese architecture).
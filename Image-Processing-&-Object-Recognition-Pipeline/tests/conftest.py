@@ -0,0 +1,52 @@
+import sys
+from contextlib import contextmanager
+from types import ModuleType
+from unittest.mock import Mock
+
+
+def _build_service_stubs() -> dict:
+    # Plain module objects: a MagicMock module would silently satisfy any typo'd
+    # import, and its magic-method machinery is wasted on import-only stubs.
+    yolo = ModuleType("app.services.yolo_service")
+    yolo.YoloService = Mock()
+    yolo.YoloDetection = Mock()
+
+    florence = ModuleType("app.services.florence_service")
+    florence.FlorenceService = Mock()
+
+    dino = ModuleType("app.services.dino_embedder")
+    dino.DINOEmbedder = Mock()
+
+    return {module.__name__: module for module in (yolo, florence, dino)}
+
+
+@contextmanager
+def stub_heavy_service_modules():
+    """
+    Swap the YOLO/Florence/DINO service modules for lightweight stubs while
+    app modules are imported, then restore the module table so unrelated
+    tests (test_yolo_service, test_dino_embedder_perf) get the real ones.
+    """
+    stubs = _build_service_stubs()
+    originals = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    try:
+        yield stubs
+    finally:
+        for name, module in originals.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+def load_app_module():
+    """
+    Import app.main (under the service stubs) on first use.
+
+    Test modules call this from setUpClass so collecting or -k selecting
+    their pure-unit classes does not import the whole FastAPI app.
+    """
+    with stub_heavy_service_modules():
+        import app.main as main_module
+    return main_module
@@ -120,6 +120,31 @@ class TestDinoEmbedderPerf(unittest.TestCase):
         self.assertEqual(vec_768.shape[0], 3)
         self.assertEqual(vec_128.shape[0], 2)
 
+    def test_embed_both_batch_runs_one_forward_pass_for_all_images(self):
+        embedder = DINOEmbedder.__new__(DINOEmbedder)
+        embedder.model_name = "mock"
+        embedder.device = "cpu"
+        embedder.input_size = 224
+        embedder.projection_dim = 2
+        embedder.projection_seed = 42
+        embedder._proj = None
+        embedder.load_model = lambda: None
+        embedder._processor = MagicMock(return_value={"pixel_values": _FakeInputTensor()})
+
+        fake_last_hidden_state = _FakeTensor(
+            np.array([[[1.0, 2.0, 3.0]], [[4.0, 5.0, 6.0]], [[7.0, 8.0, 9.0]]], dtype=np.float32)
+        )
+        embedder._model = MagicMock(return_value=SimpleNamespace(last_hidden_state=fake_last_hidden_state))
+        images = [Image.new("RGB", (320, 200), "white") for _ in range(3)]
+
+        vecs_768, vecs_128 = embedder.embed_both_batch(images)
+
+        self.assertEqual(embedder._model.call_count, 1)
+        self.assertEqual(len(embedder._processor.call_args.kwargs["images"]), 3)
+        self.assertEqual(vecs_768.shape, (3, 3))
+        self.assertEqual(vecs_128.shape, (3, 2))
+        np.testing.assert_allclose(vecs_128[1], embedder.project_128(vecs_768[1]), rtol=1e-6)
+
     def test_embed_768_enables_autocast_on_cuda(self):
         embedder = DINOEmbedder.__new__(DINOEmbedder)
         embedder.device = "cuda"
@@ -144,6 +169,67 @@ class TestDinoEmbedderPerf(unittest.TestCase):
         self.assertTrue(autocast_enabled_flags)
         self.assertTrue(autocast_enabled_flags[-1])
 
+    def test_embed_768_batch_serves_repeat_inputs_from_cache(self):
+        embedder = DINOEmbedder.__new__(DINOEmbedder)
+        embedder.input_size = 32
+        embedder._embed_cache = dino_embedder_module.CropResultCache(8)
+        forwarded = []
+
+        def _forward(prepared):
+            forwarded.append(len(prepared))
+            return np.arange(len(prepared) * 4, dtype=np.float32).reshape(len(prepared), 4) + len(forwarded)
+
+        embedder._forward_768 = _forward
+        red = Image.new("RGB", (64, 48), "red")
+        blue = Image.new("RGB", (64, 48), "blue")
+
+        first = embedder.embed_768_batch([red, blue])
+        second = embedder.embed_768_batch([blue, red, Image.new("RGB", (64, 48), "green")])
+
+        self.assertEqual(forwarded, [2, 1])
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[1], first[0])
+
+    def test_warmup_runs_one_uncached_forward_once(self):
+        embedder = DINOEmbedder.__new__(DINOEmbedder)
+        embedder.input_size = 32
+        embedder._embed_cache = dino_embedder_module.CropResultCache(8)
+        embedder._warmup_lock = dino_embedder_module.threading.Lock()
+        embedder._warmup_done = False
+        forwarded = []
+        embedder._forward_768 = lambda prepared: forwarded.append([img.size for img in prepared])
+
+        embedder.warmup()
+        embedder.warmup()
+
+        self.assertEqual(forwarded, [[(32, 32)]])
+        self.assertEqual(len(embedder._embed_cache), 0)
+
+    def test_normalize_pixels_on_device_casts_uint8_pixels_to_float(self):
+        import torch
+
+        embedder = DINOEmbedder.__new__(DINOEmbedder)
+        embedder.device = "cpu"
+        embedder._processor = SimpleNamespace(
+            image_mean=[0.485, 0.456, 0.406],
+            image_std=[0.229, 0.224, 0.225],
+            rescale_factor=1 / 255,
+        )
+        raw = np.arange(3 * 2 * 2, dtype=np.uint8).reshape(1, 3, 2, 2) * 20
+        pixel_values = torch.from_numpy(raw.copy())
+
+        self.assertTrue(embedder._can_normalize_on_device())
+        # pin_memory needs a CUDA runtime; the cast and arithmetic do not.
+        with patch.object(torch.Tensor, "pin_memory", lambda tensor: tensor):
+            out = embedder._normalize_pixels_on_device(pixel_values)
+
+        mean = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(1, 3, 1, 1)
+        std = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(1, 3, 1, 1)
+        expected = (raw.astype(np.float32) / 255 - mean) / std
+        self.assertEqual(out.dtype, torch.float32)
+        np.testing.assert_allclose(out.numpy(), expected, rtol=1e-5, atol=1e-6)
+
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -90,6 +90,42 @@ class TestFlorencePerfProfile(unittest.TestCase):
         self.assertGreaterEqual(svc.ground_phrases.call_count, 1)
         self.assertEqual(svc.vqa.call_count, 1)
 
+    def test_caption_batch_retries_only_empty_captions_at_next_level(self):
+        svc = FlorenceService.__new__(FlorenceService)
+        calls = []
+
+        def _fake_batch(images, task, text=None, profile=None):
+            calls.append((task, len(images)))
+            if task == "<MORE_DETAILED_CAPTION>":
+                return [{task: "A black leather wallet."}, {task: ""}]
+            return [{task: "A silver key."} for _ in images]
+
+        svc._run_task_batch = _fake_batch
+        crops = [Image.new("RGB", (32, 32), "black"), Image.new("RGB", (32, 32), "white")]
+
+        captions = svc.caption_batch(crops, detailed=True, profile="balanced")
+
+        self.assertEqual(captions, ["A black leather wallet.", "A silver key."])
+        self.assertEqual(calls, [("<MORE_DETAILED_CAPTION>", 2), ("<DETAILED_CAPTION>", 1)])
+
+    def test_caption_batch_returns_none_for_crop_whose_batch_raises(self):
+        svc = FlorenceService.__new__(FlorenceService)
+        bad_crop = Image.new("RGB", (32, 32), "white")
+
+        def _fake_batch(images, task, text=None, profile=None):
+            # The bad crop gets no caption at the first level, and every
+            # retry that includes it raises.
+            if task != "<MORE_DETAILED_CAPTION>" and any(image is bad_crop for image in images):
+                raise RuntimeError("decode failed")
+            return [{task: "A black leather wallet."}, {task: ""}]
+
+        svc._run_task_batch = _fake_batch
+        crops = [Image.new("RGB", (32, 32), "black"), bad_crop]
+
+        captions = svc.caption_batch(crops, detailed=True, profile="balanced")
+
+        self.assertEqual(captions, ["A black leather wallet.", None])
+
 
 if __name__ == "__main__":
     unittest.main()
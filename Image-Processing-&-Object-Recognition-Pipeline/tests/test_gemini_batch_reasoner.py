@@ -0,0 +1,159 @@
+import json
+import sys
+import threading
+import types
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from PIL import Image
+
+from app.config.settings import settings
+from app.services.gemini_reasoner import (
+    GeminiReasoner,
+    GeminiTransientError,
+    Phase1BatchReasoner,
+)
+
+
+EVIDENCE = {
+    "detection": {"label": "Wallet"},
+    "canonical_label": "Wallet",
+    "crop_analysis": {
+        "color_vqa": "Blue",
+        "caption": "blue wallet",
+        "ocr_text": "",
+        "grounded_features": [],
+        "grounded_defects": [],
+        "grounded_attachments": [],
+        "raw": {},
+    },
+}
+
+PHASE1_ANSWER = {
+    "status": "accepted",
+    "label": "Wallet",
+    "color": "Blue",
+    "final_description": "A blue wallet with a plain exterior.",
+    "detailed_description": "A blue wallet with a plain exterior.",
+    "category_details": {"features": [], "defects": [], "attachments": []},
+    "key_count": None,
+    "evidence_used": {"caption": [], "ocr": [], "grounding": [], "color": ["PRIMARY_COLOR"], "key_count": []},
+    "unsupported_claims": [],
+    "label_change_reason": None,
+}
+
+
+@pytest.fixture
+def fake_genai_types():
+    # google-genai is optional here; run_phase1_batch_job only needs UploadFileConfig.
+    genai = types.ModuleType("google.genai")
+    genai.types = SimpleNamespace(UploadFileConfig=lambda **kwargs: kwargs)
+    google = types.ModuleType("google")
+    google.genai = genai
+    with patch.dict(sys.modules, {"google": google, "google.genai": genai}):
+        yield
+
+
+def _reasoner_with_client(state: str):
+    reasoner = GeminiReasoner()
+    client = MagicMock()
+    client.files.upload.return_value = SimpleNamespace(name="files/pp1")
+    client.batches.create.return_value = SimpleNamespace(
+        name="batches/pp1",
+        state=SimpleNamespace(name=state),
+        dest=SimpleNamespace(file_name="files/pp1-out"),
+    )
+    reasoner._client = client
+    return reasoner, client
+
+
+def test_batch_job_success_returns_parsed_results_by_key(fake_genai_types):
+    reasoner, client = _reasoner_with_client("JOB_STATE_SUCCEEDED")
+    submitted = {}
+
+    def _upload(file, config):
+        with open(file, encoding="utf-8") as handle:
+            submitted["lines"] = [json.loads(line) for line in handle]
+        return SimpleNamespace(name="files/pp1")
+
+    client.files.upload.side_effect = _upload
+    answer = {"candidates": [{"content": {"parts": [{"text": json.dumps(PHASE1_ANSWER)}]}}]}
+    client.files.download.return_value = (
+        json.dumps({"key": "a", "response": answer}) + "\n" + "not json\n"
+    ).encode("utf-8")
+
+    results = reasoner.run_phase1_batch_job(
+        [
+            {"key": "a", "evidence": EVIDENCE, "crop_image": Image.new("RGB", (4, 4), "blue")},
+            {"key": "b", "evidence": EVIDENCE, "crop_image": None},
+        ]
+    )
+
+    assert [line["key"] for line in submitted["lines"]] == ["a", "b"]
+    assert len(submitted["lines"][0]["request"]["contents"][0]["parts"]) == 2
+    assert set(results) == {"a"}
+    assert results["a"]["status"] == "accepted"
+    assert results["a"]["label"] == "Wallet"
+    assert results["a"]["reasoning_meta"]["batch_job"] == "batches/pp1"
+    assert reasoner._last_request_meta == {}
+    client.batches.get.assert_not_called()
+
+
+def test_batch_thinking_config_matches_interactive_pp1_call():
+    reasoner = GeminiReasoner()
+
+    with patch.object(reasoner, "model_name", "models/gemini-2.5-flash"):
+        assert reasoner._build_pp1_batch_generation_config()["thinking_config"] == {
+            "thinkingBudget": max(0, int(settings.PP2_REASONER_THINKING_BUDGET))
+        }
+    with patch.object(reasoner, "model_name", "models/gemini-3-flash-preview"), patch.object(
+        settings, "PP1_GEMINI_THINKING_LEVEL", "Low"
+    ):
+        assert reasoner._build_pp1_batch_generation_config()["thinking_config"] == {"thinkingLevel": "low"}
+
+
+def test_batch_job_failed_state_raises_transient_error(fake_genai_types):
+    reasoner, client = _reasoner_with_client("JOB_STATE_FAILED")
+
+    with pytest.raises(GeminiTransientError) as excinfo:
+        reasoner.run_phase1_batch_job([{"key": "a", "evidence": EVIDENCE, "crop_image": None}])
+
+    assert excinfo.value.provider_status == "JOB_STATE_FAILED"
+    client.files.download.assert_not_called()
+
+
+def test_batch_job_timeout_raises_deadline_exceeded(fake_genai_types):
+    reasoner, client = _reasoner_with_client("JOB_STATE_RUNNING")
+
+    with patch.object(settings, "PP1_GEMINI_BATCH_TIMEOUT_S", 0):
+        with pytest.raises(GeminiTransientError) as excinfo:
+            reasoner.run_phase1_batch_job([{"key": "a", "evidence": EVIDENCE, "crop_image": None}])
+
+    assert excinfo.value.provider_status == "DEADLINE_EXCEEDED"
+    client.files.download.assert_not_called()
+
+
+def test_failed_job_raises_one_shared_exception_in_every_waiter():
+    job_error = GeminiTransientError("batch failed", provider_status="JOB_STATE_FAILED")
+    inner = Mock(spec=GeminiReasoner)
+    inner.run_phase1_batch_job.side_effect = job_error
+    batch_reasoner = Phase1BatchReasoner(inner, max_items=3, idle_s=5.0)
+    raised = []
+
+    def _call():
+        try:
+            batch_reasoner.run_phase1(EVIDENCE)
+        except GeminiTransientError as exc:
+            raised.append(exc)
+
+    workers = [threading.Thread(target=_call) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(5)
+    batch_reasoner.close()
+
+    inner.run_phase1_batch_job.assert_called_once()
+    assert len(raised) == 3
+    assert all(exc is job_error for exc in raised)
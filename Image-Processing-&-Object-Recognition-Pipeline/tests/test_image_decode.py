@@ -0,0 +1,50 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+import app.domain.image_decode as image_decode
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+class TestDecodeRgbBytes(unittest.TestCase):
+    def test_non_rgb_png_is_converted_with_pillow(self):
+        data = _encode(Image.new("L", (12, 8), 128), "PNG")
+
+        image, fmt = image_decode.decode_rgb_bytes(data)
+
+        self.assertEqual(fmt, "PNG")
+        self.assertEqual(image.mode, "RGB")
+        self.assertEqual(image.size, (12, 8))
+
+    def test_jpeg_uses_turbojpeg_when_available(self):
+        turbo = MagicMock()
+        turbo.decode.return_value = np.zeros((8, 12, 3), dtype=np.uint8)
+        data = _encode(Image.new("RGB", (12, 8), "red"), "JPEG")
+
+        with patch.object(image_decode, "_get_turbojpeg", return_value=(turbo, 0)):
+            image, fmt = image_decode.decode_rgb_bytes(data)
+
+        turbo.decode.assert_called_once_with(data, pixel_format=0)
+        self.assertEqual((fmt, image.mode, image.size), ("JPEG", "RGB", (12, 8)))
+
+    def test_jpeg_falls_back_to_pillow_when_turbojpeg_fails(self):
+        turbo = MagicMock()
+        turbo.decode.side_effect = OSError("corrupt")
+        data = _encode(Image.new("RGB", (12, 8), "red"), "JPEG")
+
+        with patch.object(image_decode, "_get_turbojpeg", return_value=(turbo, 0)):
+            image, fmt = image_decode.decode_rgb_bytes(data)
+
+        self.assertEqual((fmt, image.mode, image.size), ("JPEG", "RGB", (12, 8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,74 +1,99 @@
+import base64
+import copy
 import io
 import os
-import sys
 import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock, patch
 
 import numpy as np
 from fastapi.testclient import TestClient
 from PIL import Image
 
+from conftest import load_app_module, stub_heavy_service_modules
+
 
 # Patch heavy model services before importing pipeline/app modules.
-mock_yolo_module = MagicMock()
-mock_florence_module = MagicMock()
-mock_dino_module = MagicMock()
-
-mock_yolo_module.YoloService = MagicMock()
-mock_florence_module.FlorenceService = MagicMock()
-mock_dino_module.DINOEmbedder = MagicMock()
-
-patched_modules = {
-    "app.services.yolo_service": mock_yolo_module,
-    "app.services.florence_service": mock_florence_module,
-    "app.services.dino_embedder": mock_dino_module,
-}
-original_modules = {name: sys.modules.get(name) for name in patched_modules}
-
-for name, module in patched_modules.items():
-    sys.modules[name] = module
-
-from app.services.gemini_reasoner import (
-    GeminiFatalError,
-    GeminiReasoner,
-    GeminiTransientError,
-    RETRYABLE_UNAVAILABLE_MESSAGE,
-)
-from app.services.unified_pipeline import UnifiedPipeline
-from app.main import app
-import app.main as main_module
-
-# Restore module table so unrelated tests use real implementations.
-for name, module in original_modules.items():
-    if module is None:
-        del sys.modules[name]
-    else:
-        sys.modules[name] = module
+with stub_heavy_service_modules():
+    from app.services.gemini_reasoner import (
+        GeminiFatalError,
+        GeminiReasoner,
+        GeminiTransientError,
+        Phase1BatchReasoner,
+        RETRYABLE_UNAVAILABLE_MESSAGE,
+    )
+    from app.config.settings import settings
+    from app.services.crop_cache import CropResultCache
+    from app.services.unified_pipeline import UnifiedPipeline
+
+
+def _encode_test_jpeg() -> bytes:
+    # Only the bytes' decodability matters, so skip libjpeg's quality and
+    # Huffman-optimisation passes.
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 40), "white").save(buf, format="JPEG", quality=1, optimize=False)
+    return buf.getvalue()
+
+
+# Encoded once; every test uploads or writes the same bytes.
+_IMAGE_BYTES = _encode_test_jpeg()
+
 
+class _TempImageTestCase(unittest.TestCase):
+    """Writes the fixture JPEG once into a per-class temporary directory."""
 
-def _write_temp_image() -> str:
-    img = Image.new("RGB", (40, 40), "white")
-    handle = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-    img.save(handle, format="JPEG")
-    handle.close()
-    return handle.name
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.image_path = os.path.join(cls._tmp.name, "img.jpg")
+        with open(cls.image_path, "wb") as handle:
+            handle.write(_IMAGE_BYTES)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+        super().tearDownClass()
 
 
 def _image_bytes() -> bytes:
-    buf = io.BytesIO()
-    Image.new("RGB", (40, 40), "white").save(buf, format="JPEG")
-    return buf.getvalue()
+    return _IMAGE_BYTES
+
+
+def _build_pipeline_prototype():
+    proto = UnifiedPipeline.__new__(UnifiedPipeline)
+    proto.perf_profile = "balanced"
+    proto.max_detections = 1
+    proto.include_gemini_image = False
+    proto._gemini_fail_count = 0
+    proto._gemini_open_until = 0.0
+    proto._last_reasoner_error = None
+    return proto
+
+
+# Plain configuration shared by every test pipeline; copied, never mutated.
+_PIPELINE_PROTO = _build_pipeline_prototype()
+
+# Stub DINO outputs shared by every test pipeline. Read-only, so a pipeline
+# that normalised them in place would fail loudly instead of leaking state.
+_EMB_768 = np.array([0.1, 0.2, 0.3], dtype=float)
+_EMB_128 = np.array([0.4, 0.5, 0.6], dtype=float)
+_EMB_768.setflags(write=False)
+_EMB_128.setflags(write=False)
 
 
 def _build_test_pipeline(gemini_behavior):
-    pipeline = UnifiedPipeline.__new__(UnifiedPipeline)
-    pipeline.yolo = MagicMock()
-    pipeline.florence = MagicMock()
-    pipeline.gemini = MagicMock()
-    pipeline.dino = MagicMock()
+    # Service mocks stay per test: tests assert on their calls, and
+    # process_pp1 writes clamped boxes back onto the detection.
+    pipeline = copy.copy(_PIPELINE_PROTO)
+    pipeline.yolo = Mock()
+    pipeline.florence = Mock()
+    pipeline.gemini = Mock()
+    pipeline.dino = Mock()
 
     detection = SimpleNamespace(label="Wallet", confidence=0.95, bbox=(2, 2, 30, 30))
     pipeline.yolo.detect_objects.return_value = [detection]
@@ -80,37 +105,24 @@ def _build_test_pipeline(gemini_behavior):
         "grounded_attachments": [],
         "raw": {},
     }
-    if isinstance(gemini_behavior, Exception):
-        pipeline.gemini.run_phase1.side_effect = gemini_behavior
-    elif callable(gemini_behavior):
+    if isinstance(gemini_behavior, Exception) or callable(gemini_behavior):
         pipeline.gemini.run_phase1.side_effect = gemini_behavior
     else:
         pipeline.gemini.run_phase1.return_value = gemini_behavior
-    vec_768 = np.array([0.1, 0.2, 0.3], dtype=float)
-    vec_128 = np.array([0.4, 0.5, 0.6], dtype=float)
-    pipeline.dino.embed_768.return_value = vec_768
-    pipeline.dino.embed_128.return_value = vec_128
-    pipeline.dino.embed_both.return_value = (vec_768, vec_128)
+    pipeline.dino.embed_768.return_value = _EMB_768
+    pipeline.dino.embed_128.return_value = _EMB_128
+    pipeline.dino.embed_both.return_value = (_EMB_768, _EMB_128)
     pipeline._pp1_thread_pool = MagicMock()
     pipeline._pp1_thread_pool.submit.side_effect = RuntimeError("thread pool disabled for test")
-    pipeline.perf_profile = "balanced"
-    pipeline.max_detections = 1
-    pipeline.include_gemini_image = False
-    pipeline._gemini_fail_count = 0
-    pipeline._gemini_open_until = 0.0
     return pipeline
 
 
-class TestUnifiedPipelineGeminiFallback(unittest.TestCase):
+class TestUnifiedPipelineGeminiFallback(_TempImageTestCase):
     def test_transient_gemini_error_degrades_to_composed_response(self):
         pipeline = _build_test_pipeline(
             GeminiTransientError("503 UNAVAILABLE", status_code=503, provider_status="UNAVAILABLE")
         )
-        path = _write_temp_image()
-        try:
-            out = pipeline.process_pp1(path)
-        finally:
-            os.remove(path)
+        out = pipeline.process_pp1(self.image_path)
 
         self.assertEqual(len(out), 1)
         row = out[0]
@@ -133,11 +145,7 @@ class TestUnifiedPipelineGeminiFallback(unittest.TestCase):
         pipeline = _build_test_pipeline(
             GeminiFatalError("401 unauthorized", status_code=401, provider_status="UNAUTHENTICATED")
         )
-        path = _write_temp_image()
-        try:
-            out = pipeline.process_pp1(path)
-        finally:
-            os.remove(path)
+        out = pipeline.process_pp1(self.image_path)
 
         row = out[0]
         self.assertEqual(row["status"], "accepted_degraded")
@@ -159,11 +167,7 @@ class TestUnifiedPipelineGeminiFallback(unittest.TestCase):
                 "tags": ["wallet"],
             }
         )
-        path = _write_temp_image()
-        try:
-            out = pipeline.process_pp1(path)
-        finally:
-            os.remove(path)
+        out = pipeline.process_pp1(self.image_path)
 
         row = out[0]
         self.assertEqual(row["status"], "accepted")
@@ -206,11 +210,7 @@ class TestUnifiedPipelineGeminiFallback(unittest.TestCase):
             "color_vqa": "black",
             "raw": {},
         }
-        path = _write_temp_image()
-        try:
-            out = pipeline.process_pp1(path)
-        finally:
-            os.remove(path)
+        out = pipeline.process_pp1(self.image_path)
 
         desc = out[0]["final_description"]
         desc_lower = desc.lower()
@@ -241,12 +241,8 @@ class TestUnifiedPipelineGeminiFallback(unittest.TestCase):
                 },
             }
         )
-        path = _write_temp_image()
-        try:
-            with self.assertLogs("app.services.unified_pipeline", level="INFO") as captured:
-                pipeline.process_pp1(path)
-        finally:
-            os.remove(path)
+        with self.assertLogs("app.services.unified_pipeline", level="INFO") as captured:
+            pipeline.process_pp1(self.image_path)
 
         timing_lines = [line for line in captured.output if "PP1_TIMING" in line]
         self.assertEqual(len(timing_lines), 1)
@@ -281,29 +277,51 @@ class TestGeminiReasonerRetry(unittest.TestCase):
         self.assertEqual(generate.call_count, 2)
 
 
-class TestPP1EndpointResilience(unittest.TestCase):
-    def test_pp1_endpoint_returns_200_for_transient_gemini_fallback(self):
-        pipeline = _build_test_pipeline(
-            GeminiTransientError("503 UNAVAILABLE", status_code=503, provider_status="UNAVAILABLE")
-        )
+@asynccontextmanager
+async def _noop_lifespan(_app):
+    yield
 
-        original_pipeline = main_module.pipeline
-        original_lifespan = app.router.lifespan_context
 
-        @asynccontextmanager
-        async def noop_lifespan(_app):
-            yield
+class _AppClientTestCase(unittest.TestCase):
+    """Start one TestClient (with a no-op lifespan) per class instead of per test."""
 
-        main_module.pipeline = pipeline
-        app.router.lifespan_context = noop_lifespan
+    @classmethod
+    def setUpClass(cls):
+        cls.main_module = load_app_module()
+        cls.app = cls.main_module.app
+        cls._original_lifespan = cls.app.router.lifespan_context
+        cls.app.router.lifespan_context = _noop_lifespan
+        cls._client_cm = TestClient(cls.app)
+        cls.client = cls._client_cm.__enter__()
 
-        try:
-            with TestClient(app) as client:
-                files = [("files", ("test.jpg", _image_bytes(), "image/jpeg"))]
-                response = client.post("/pp1/analyze", files=files)
-        finally:
-            main_module.pipeline = original_pipeline
-            app.router.lifespan_context = original_lifespan
+    @classmethod
+    def tearDownClass(cls):
+        cls._client_cm.__exit__(None, None, None)
+        cls.app.router.lifespan_context = cls._original_lifespan
+
+    def setUp(self):
+        original_pipeline = self.main_module.pipeline
+        original_state = getattr(self.app.state, "unified_pipeline", None)
+
+        def _restore():
+            self.main_module.pipeline = original_pipeline
+            self.app.state.unified_pipeline = original_state
+            self.app.dependency_overrides.pop(self.main_module.get_unified_pipeline, None)
+
+        self.addCleanup(_restore)
+
+    def _post_pp1(self):
+        files = [("files", ("test.jpg", _image_bytes(), "image/jpeg"))]
+        return self.client.post("/pp1/analyze", files=files)
+
+
+class TestPP1EndpointResilience(_AppClientTestCase):
+    def test_pp1_endpoint_returns_200_for_transient_gemini_fallback(self):
+        self.main_module.pipeline = _build_test_pipeline(
+            GeminiTransientError("503 UNAVAILABLE", status_code=503, provider_status="UNAVAILABLE")
+        )
+
+        response = self._post_pp1()
 
         self.assertEqual(response.status_code, 200)
         payload = response.json()
@@ -313,6 +331,217 @@ class TestPP1EndpointResilience(unittest.TestCase):
         self.assertEqual(payload[0]["final_description"], payload[0]["detailed_description"])
 
 
+class TestPP1PipelineDependency(_AppClientTestCase):
+    def test_pp1_endpoint_uses_injected_pipeline(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        self.app.dependency_overrides[self.main_module.get_unified_pipeline] = lambda: pipeline
+
+        response = self._post_pp1()
+
+        self.assertEqual(response.status_code, 200)
+        pipeline.yolo.detect_objects.assert_called_once()
+
+    def test_pp1_endpoint_returns_500_without_pipeline(self):
+        self.main_module.pipeline = None
+        self.app.state.unified_pipeline = None
+
+        response = self._post_pp1()
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["detail"], "UnifiedPipeline not initialized.")
+
+
+class TestPP1Metrics(_AppClientTestCase):
+    def test_metrics_reports_crop_cache_hits_and_misses(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        pipeline._crop_cache = CropResultCache(4)
+        pipeline._crop_cache.put("a", 1)
+        pipeline._crop_cache.get("a")
+        pipeline._crop_cache.get("b")
+        self.main_module.pipeline = pipeline
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["pp1_crop_cache"],
+            {"hits": 1, "misses": 1, "size": 1, "maxsize": 4},
+        )
+
+
+class TestPP1DinoEmbeddingCache(_TempImageTestCase):
+    def test_crop_cache_holds_florence_only_and_dino_caches_itself(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        pipeline._crop_cache = CropResultCache(8)
+
+        pipeline.process_pp1(self.image_path)
+        pipeline.process_pp1(self.image_path)
+
+        # Florence is served from the crop cache on the repeat; DINO is asked
+        # each time because the embedder keeps its own embedding cache.
+        self.assertEqual(pipeline.florence.analyze_crop.call_count, 1)
+        self.assertEqual(pipeline.dino.embed_both.call_count, 2)
+        self.assertEqual(len(pipeline._crop_cache), 1)
+
+
+class TestPP1ReasonerCircuitBreaker(unittest.TestCase):
+    def test_concurrent_failures_are_all_counted_and_trip_breaker(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+
+        with patch.object(settings, "GEMINI_CB_FAILURE_THRESHOLD", 400), ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: pipeline._record_reasoner_failure(), range(800)))
+
+        self.assertEqual(pipeline._gemini_fail_count, 800)
+        self.assertGreater(pipeline._gemini_open_until, 0.0)
+
+    def test_repeated_exception_object_is_counted_once(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        job_error = GeminiTransientError("batch failed")
+
+        for _ in range(3):
+            pipeline._record_reasoner_failure(job_error)
+        pipeline._record_reasoner_failure(GeminiTransientError("another job failed"))
+
+        self.assertEqual(pipeline._gemini_fail_count, 2)
+
+
+class TestPP1GeminiBatchMode(_TempImageTestCase):
+    def _run_concurrently(self, fn, count):
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return list(pool.map(lambda _: fn(self.image_path), range(count)))
+
+    def test_failed_batch_job_counts_once_toward_breaker(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        inner = Mock(spec=GeminiReasoner)
+        inner.run_phase1_batch_job.side_effect = GeminiTransientError(
+            "batch failed", provider_status="JOB_STATE_FAILED"
+        )
+        pipeline.gemini = Phase1BatchReasoner(inner, max_items=3, idle_s=5.0)
+        try:
+            out = self._run_concurrently(pipeline.process_pp1, 3)
+        finally:
+            pipeline.gemini.close()
+
+        inner.run_phase1_batch_job.assert_called_once()
+        self.assertEqual([rows[0]["status"] for rows in out], ["accepted_degraded"] * 3)
+        self.assertEqual(pipeline._gemini_fail_count, 1)
+
+    def test_process_pp1_batch_reasons_through_one_batch_job(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        interactive = Mock(spec=GeminiReasoner)
+        interactive.run_phase1_batch_job.side_effect = lambda requests: {
+            request["key"]: {"status": "accepted", "label": "Wallet"} for request in requests
+        }
+        pipeline.gemini = interactive
+
+        with patch.object(settings, "PP1_USE_BATCH", True), patch.object(settings, "PP1_GEMINI_BATCH_MAX_ITEMS", 3):
+            out = pipeline.process_pp1_batch([self.image_path] * 3)
+
+        self.assertEqual([rows[0]["status"] for rows in out], ["accepted"] * 3)
+        interactive.run_phase1_batch_job.assert_called_once()
+        interactive.run_phase1.assert_not_called()
+        self.assertIs(pipeline.gemini, interactive)
+
+    def test_process_pp1_batch_runs_per_image_when_batch_mode_is_off(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+
+        out = pipeline.process_pp1_batch([self.image_path] * 2)
+
+        self.assertEqual([rows[0]["status"] for rows in out], ["accepted"] * 2)
+        self.assertEqual(pipeline.gemini.run_phase1.call_count, 2)
+
+
+class TestPP1ReasonerEmbeddingOverlap(_TempImageTestCase):
+    def test_dino_embedding_runs_while_reasoner_call_is_in_flight(self):
+        dino_started = threading.Event()
+        reasoner_started = threading.Event()
+        observed = {}
+
+        def _reasoner(evidence, crop_image=None):
+            reasoner_started.set()
+            observed["reasoner_saw_dino"] = dino_started.wait(2)
+            return {"status": "accepted", "label": "Wallet"}
+
+        pipeline = _build_test_pipeline(_reasoner)
+        vecs = pipeline.dino.embed_both.return_value
+
+        def _embed(crop):
+            dino_started.set()
+            observed["dino_saw_reasoner"] = reasoner_started.wait(2)
+            return vecs
+
+        pipeline.dino.embed_both.side_effect = _embed
+        pipeline._pp1_thread_pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            out = pipeline.process_pp1(self.image_path)
+        finally:
+            pipeline._pp1_thread_pool.shutdown(wait=True)
+
+        self.assertEqual(out[0]["status"], "accepted")
+        self.assertTrue(observed.get("reasoner_saw_dino"))
+        self.assertTrue(observed.get("dino_saw_reasoner"))
+
+
+class TestPP1ResponseTimings(_TempImageTestCase):
+    def _run(self):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        return pipeline.process_pp1(self.image_path)
+
+    def test_timings_omitted_from_response_by_default(self):
+        out = self._run()
+        self.assertNotIn("timings", out[0]["raw"])
+        self.assertIsInstance(out[0]["processing_time"], float)
+
+    def test_timings_included_when_enabled(self):
+        with patch.object(settings, "PP1_INCLUDE_TIMINGS_IN_RESPONSE", True):
+            out = self._run()
+        timings = out[0]["raw"]["timings"]
+        self.assertEqual(
+            list(timings),
+            ["detect_ms", "florence_ms", "florence_od_ms", "label_rerank_ms", "gemini_ms", "embeddings_ms", "total_ms"],
+        )
+
+
+class TestPP1TinyBoxGate(_TempImageTestCase):
+    def _run(self, detection):
+        pipeline = _build_test_pipeline({"status": "accepted", "label": "Wallet"})
+        pipeline.yolo.detect_objects.return_value = [detection]
+        return pipeline, pipeline.process_pp1(self.image_path)
+
+    def test_box_below_min_side_skips_downstream_models(self):
+        pipeline, out = self._run(SimpleNamespace(label="Wallet", confidence=0.95, bbox=(2, 2, 38, 6)))
+        self.assertEqual(out[0]["status"], "rejected")
+        pipeline.florence.analyze_crop.assert_not_called()
+        pipeline.gemini.run_phase1.assert_not_called()
+
+    def test_detection_below_confidence_floor_is_not_cropped(self):
+        with patch.object(settings, "PP1_MIN_DET_CONF", 0.5):
+            pipeline, out = self._run(SimpleNamespace(label="Wallet", confidence=0.3, bbox=(2, 2, 30, 30)))
+        self.assertEqual(out[0]["status"], "rejected")
+        pipeline.florence.analyze_crop.assert_not_called()
+
+    def test_detection_crops_skip_tiny_boxes_in_one_pass(self):
+        pipeline = UnifiedPipeline.__new__(UnifiedPipeline)
+        image = Image.new("RGB", (200, 200), "white")
+        boxes = np.array([[10, 10, 110, 90], [2, 2, 38, 6], [50, 50, 50, 80]], dtype=np.int64)
+
+        crops = pipeline._detection_crops(image, boxes)
+
+        self.assertEqual(crops[0].size, (100, 80))
+        self.assertIsNone(crops[1])
+        self.assertIsNone(crops[2])
+
+    def test_prefetched_captions_leave_uncaptioned_crops_as_none(self):
+        pipeline = UnifiedPipeline.__new__(UnifiedPipeline)
+        pipeline.florence = MagicMock()
+        pipeline.florence.caption_batch.return_value = ["A black wallet.", None, ""]
+        crop = Image.new("RGB", (40, 40), "white")
+
+        hints = pipeline._prefetch_detection_captions([crop, crop, None, crop], "balanced")
+
+        self.assertEqual(hints, ["A black wallet.", None, None, None])
+
+
 class TestCaptionConfirmsYoloLabel(unittest.TestCase):
     """Tests for the _caption_confirms_yolo_label helper used by the OD skip gate."""
 
@@ -492,6 +721,60 @@ class TestPP1ScoreAllLabels(unittest.TestCase):
         # No other label scores above MIN_WINNER_SCORE (3) from just "leather"
         self.assertEqual(result["final_label"], "Wallet")
 
+    def test_empty_text_evidence_skips_keyword_scoring(self):
+        """Crops without any text evidence should not run keyword scans."""
+        candidates = [
+            SimpleNamespace(label="Wallet", confidence=0.95),
+            SimpleNamespace(label="Smart Phone", confidence=0.40),
+        ]
+        analysis = {"caption": "", "ocr_text": "", "raw": {}}
+        with patch.object(UnifiedPipeline, "_score_label_keywords") as score_mock:
+            result = self.pipeline._rerank_label("Wallet", candidates, analysis)
+            strong = self.pipeline._derive_florence_strong_label(analysis)
+        score_mock.assert_not_called()
+        self.assertIsNone(strong)
+        self.assertFalse(result["applied"])
+        self.assertEqual(result["final_label"], "Wallet")
+        self.assertEqual(result["scores_by_label"]["Smart Phone"]["score"], 0)
+
+
+class TestPP1EmbeddingFormat(unittest.TestCase):
+    """Tests for the PP1_EMBED_FMT response embeddings block."""
+
+    def test_float_format_returns_lists(self):
+        vec_768 = np.linspace(-1.0, 1.0, 768, dtype=np.float32)
+        vec_128 = np.ones(128, dtype=np.float32)
+        payload = UnifiedPipeline._embeddings_payload(vec_768, vec_128)
+        self.assertEqual(len(payload["vector_dinov2"]), 768)
+        self.assertEqual(len(payload["vector_128d"]), 128)
+
+    def test_q8_format_round_trips_within_one_step(self):
+        vec_768 = np.linspace(-1.0, 1.0, 768, dtype=np.float32)
+        vec_128 = np.ones(128, dtype=np.float32)
+        with patch.object(settings, "PP1_EMBED_FMT", "q8"):
+            payload = UnifiedPipeline._embeddings_payload(vec_768, vec_128)
+
+        self.assertNotIn("vector_dinov2", payload)
+        self.assertEqual(len(payload["vector_128d"]), 128)
+        q8 = payload["vector_dinov2_q8"]
+        codes = np.frombuffer(base64.b64decode(q8["q"]), dtype=np.uint8)
+        decoded = codes.astype(np.float32) * q8["scale"] + q8["zero"]
+        self.assertEqual(q8["dim"], 768)
+        self.assertLessEqual(float(np.abs(decoded - vec_768).max()), q8["scale"])
+
+    def test_f16_format_encodes_both_vectors_as_base64(self):
+        vec_768 = np.linspace(-1.0, 1.0, 768, dtype=np.float32)
+        vec_128 = np.full(128, 0.5, dtype=np.float32)
+        with patch.object(settings, "PP1_EMBED_FMT", "f16"):
+            payload = UnifiedPipeline._embeddings_payload(vec_768, vec_128)
+
+        self.assertEqual(set(payload), {"vector_128d_b64", "vector_dinov2_b64"})
+        decoded_768 = np.frombuffer(base64.b64decode(payload["vector_dinov2_b64"]), dtype="<f2")
+        decoded_128 = np.frombuffer(base64.b64decode(payload["vector_128d_b64"]), dtype="<f2")
+        self.assertEqual(decoded_768.shape, (768,))
+        np.testing.assert_allclose(decoded_768, vec_768, atol=1e-3)
+        np.testing.assert_array_equal(decoded_128, np.full(128, 0.5, dtype=np.float16))
+
 
 if __name__ == "__main__":
     unittest.main()
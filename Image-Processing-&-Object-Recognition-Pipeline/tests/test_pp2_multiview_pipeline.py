@@ -2,72 +2,42 @@ import sys
 import time
 import unittest
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock
 from PIL import Image
 import numpy as np
 
-
-# Patch service imports before importing MultiViewPipeline to avoid heavy deps in unit tests.
-mock_yolo_module = MagicMock()
-mock_florence_module = MagicMock()
-mock_dino_module = MagicMock()
-
-mock_yolo_module.YoloService = MagicMock()
-mock_florence_module.FlorenceService = MagicMock()
-mock_dino_module.DINOEmbedder = MagicMock()
-
-patched_modules = {
-    "app.services.yolo_service": mock_yolo_module,
-    "app.services.florence_service": mock_florence_module,
-    "app.services.dino_embedder": mock_dino_module,
-}
-original_modules = {name: sys.modules.get(name) for name in patched_modules}
-
-for name, module in patched_modules.items():
-    sys.modules[name] = module
-
-from app.services.pp2_multiview_pipeline import MultiViewPipeline
-from app.services.gemini_reasoner import (
-    GeminiFatalError,
-    GeminiQuotaError,
-    GeminiReasoner,
-    GeminiTransientError,
-    PHASE1_PP1_RESPONSE_SCHEMA,
-    PHASE2_PP2_RESPONSE_SCHEMA,
-    PHASE2_PP2_SYSTEM_INSTRUCTION,
-)
-from app.services.pp2_fusion_service import MultiViewFusionService
-from app.services.unified_pipeline import UnifiedPipeline
-from app.schemas.pp2_schemas import (
-    PP2PerViewDetection,
-    PP2PerViewEmbedding,
-    PP2PerViewExtraction,
-    PP2PerViewResult,
-    PP2VerificationResult,
-)
-from app.config.settings import settings
-
-# Restore module table so unrelated tests use real implementations.
-for name, module in original_modules.items():
-    if module is None:
-        del sys.modules[name]
-    else:
-        sys.modules[name] = module
-
-
-class TestMultiViewPipelineNormalization(unittest.TestCase):
-    def setUp(self):
-        self.pipeline = MultiViewPipeline(
-            yolo=MagicMock(),
-            florence=MagicMock(),
-            dino=MagicMock(),
-            verifier=MagicMock(),
-            fusion=MagicMock(),
-            faiss=MagicMock(),
-        )
-
-    def test_normalize_list_grounded_features(self):
-        payload = {
+from conftest import stub_heavy_service_modules
+
+
+# Patch heavy model services before importing pipeline/app modules.
+with stub_heavy_service_modules():
+    from app.services.pp2_multiview_pipeline import MultiViewPipeline
+    from app.services.gemini_reasoner import (
+        GeminiFatalError,
+        GeminiQuotaError,
+        GeminiReasoner,
+        GeminiTransientError,
+        PHASE1_PP1_RESPONSE_SCHEMA,
+        PHASE2_PP2_RESPONSE_SCHEMA,
+        PHASE2_PP2_SYSTEM_INSTRUCTION,
+    )
+    from app.services.pp2_fusion_service import MultiViewFusionService
+    from app.services.unified_pipeline import UnifiedPipeline
+    from app.schemas.pp2_schemas import (
+        PP2PerViewDetection,
+        PP2PerViewEmbedding,
+        PP2PerViewExtraction,
+        PP2PerViewResult,
+        PP2VerificationResult,
+    )
+    from app.config.settings import settings
+
+
+# (payload, {dotted path in the normalized payload: expected value})
+_NORMALIZE_CASES = [
+    (
+        # List grounded_features is folded into a dict with the side fields.
+        {
             "caption": "sample",
             "ocr_text": "text",
             "grounded_features": ["logo", 123, None, " "],
@@ -75,20 +45,18 @@ class TestMultiViewPipelineNormalization(unittest.TestCase):
             "grounded_attachments": ["key ring"],
             "color_vqa": "black",
             "key_count": 2,
-        }
-
-        normalized = self.pipeline._normalize_extraction_payload(payload)
-        grounded = normalized["grounded_features"]
-
-        self.assertIsInstance(grounded, dict)
-        self.assertEqual(grounded["features"], ["logo", "123"])
-        self.assertEqual(grounded["defects"], ["scratch"])
-        self.assertEqual(grounded["attachments"], ["key ring"])
-        self.assertEqual(grounded["color"], "black")
-        self.assertEqual(grounded["key_count"], 2)
-
-    def test_normalize_dict_grounded_features_preserves_existing_color(self):
-        payload = {
+        },
+        {
+            "grounded_features.features": ["logo", "123"],
+            "grounded_features.defects": ["scratch"],
+            "grounded_features.attachments": ["key ring"],
+            "grounded_features.color": "black",
+            "grounded_features.key_count": 2,
+        },
+    ),
+    (
+        # Dict grounded_features keeps its own color over color_vqa.
+        {
             "caption": "sample",
             "grounded_features": {
                 "brand": "Acme",
@@ -99,49 +67,58 @@ class TestMultiViewPipelineNormalization(unittest.TestCase):
             "grounded_attachments": ["lanyard"],
             "color_vqa": "black",
             "key_count": 1,
-        }
-
-        normalized = self.pipeline._normalize_extraction_payload(payload)
-        grounded = normalized["grounded_features"]
-
-        self.assertEqual(grounded["brand"], "Acme")
-        self.assertEqual(grounded["color"], "brown")
-        self.assertEqual(grounded["defects"], ["scratch", "dent"])
-        self.assertEqual(grounded["attachments"], ["lanyard"])
-        self.assertEqual(grounded["key_count"], 1)
-
-    def test_normalize_invalid_grounded_features_fallback(self):
-        payload = {
-            "caption": "sample",
-            "grounded_features": "logo",
-        }
-
-        normalized = self.pipeline._normalize_extraction_payload(payload)
-        grounded = normalized["grounded_features"]
+        },
+        {
+            "grounded_features.brand": "Acme",
+            "grounded_features.color": "brown",
+            "grounded_features.defects": ["scratch", "dent"],
+            "grounded_features.attachments": ["lanyard"],
+            "grounded_features.key_count": 1,
+        },
+    ),
+    (
+        # Unusable grounded_features falls back to an empty dict.
+        {"caption": "sample", "grounded_features": "logo"},
+        {"grounded_features": {}},
+    ),
+    (
+        # ocr_text wins over the legacy ocr key.
+        {"caption": "sample", "ocr_text": "preferred", "ocr": "fallback", "grounded_features": {}},
+        {"ocr_text": "preferred"},
+    ),
+    (
+        # Legacy ocr list is joined when ocr_text is absent.
+        {"caption": "sample", "ocr": ["AB", "123"], "grounded_features": {}},
+        {"ocr_text": "AB 123"},
+    ),
+]
+
+
+def _dig(payload, dotted_path):
+    for key in dotted_path.split("."):
+        payload = payload[key]
+    return payload
 
-        self.assertIsInstance(grounded, dict)
-        self.assertEqual(grounded, {})
-
-    def test_ocr_prefers_ocr_text_over_ocr(self):
-        payload = {
-            "caption": "sample",
-            "ocr_text": "preferred",
-            "ocr": "fallback",
-            "grounded_features": {},
-        }
 
-        normalized = self.pipeline._normalize_extraction_payload(payload)
-        self.assertEqual(normalized["ocr_text"], "preferred")
-
-    def test_ocr_fallback_to_ocr_and_list_join(self):
-        payload = {
-            "caption": "sample",
-            "ocr": ["AB", "123"],
-            "grounded_features": {},
-        }
+class TestMultiViewPipelineNormalization(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = MultiViewPipeline(
+            yolo=Mock(),
+            florence=Mock(),
+            dino=Mock(),
+            verifier=MagicMock(),
+            fusion=MagicMock(),
+            faiss=MagicMock(),
+        )
 
-        normalized = self.pipeline._normalize_extraction_payload(payload)
-        self.assertEqual(normalized["ocr_text"], "AB 123")
+    def test_normalize_extraction_payload_table(self):
+        for index, (payload, expected) in enumerate(_NORMALIZE_CASES):
+            with self.subTest(case=index):
+                normalized = self.pipeline._normalize_extraction_payload(payload)
+                self.assertIsInstance(normalized["grounded_features"], dict)
+                for path, value in expected.items():
+                    self.assertEqual(_dig(normalized, path), value, path)
 
     def test_build_phase2_category_details_extracts_lists(self):
         details = self.pipeline._build_phase2_category_details(
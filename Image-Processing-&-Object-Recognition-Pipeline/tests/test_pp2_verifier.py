@@ -6,32 +6,37 @@ from app.services.faiss_service import FaissService
 from app.schemas.pp2_schemas import PP2PerViewResult, PP2PerViewDetection, PP2PerViewExtraction, PP2PerViewEmbedding
 
 class TestMultiViewVerifier(unittest.TestCase):
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # Identical minimal view shared by the verify() tests; validated once.
+        cls.dummy_result = PP2PerViewResult(
+            view_index=0,
+            filename="test.jpg",
+            detection=PP2PerViewDetection(bbox=(0, 0, 10, 10), cls_name="shoe", confidence=0.9),
+            extraction=PP2PerViewExtraction(caption="a shoe", ocr_text="", grounded_features={}),
+            embedding=PP2PerViewEmbedding(dim=2, vector_preview=[1.0, 0.0], vector_id="v1"),
+            quality_score=0.9
+        )
+
     def setUp(self):
         # Mock GeometricVerifier for MultiViewVerifier dependency
         self.mock_geo_service = MagicMock()
         self.verifier = MultiViewVerifier(geometric_service=self.mock_geo_service)
 
     def test_compute_cosine_matrix(self):
-        # Create user-defined list of 3 numpy vectors ([1,0], [0,1], [1,1])
-        vectors = [
-            np.array([1, 0]),
-            np.array([0, 1]),
-            np.array([1, 1])
-        ]
-        
-        # Expected cosine similarities:
-        # v0.v0 = 1.0, v0.v1 = 0.0, v0.v2 = 1/sqrt(2) ~= 0.707
-        # v1.v0 = 0.0, v1.v1 = 1.0, v1.v2 = 1/sqrt(2) ~= 0.707
-        # v2.v0 = 0.707, v2.v1 = 0.707, v2.v2 = 1.0
+        # Three vectors ([1,0], [0,1], [1,1]) as row views of one buffer
+        vectors = list(np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float64))
         
         matrix = self.verifier.compute_cosine_matrix(vectors)
-        
-        # Assertions
-        self.assertAlmostEqual(matrix[0][0], 1.0)
-        self.assertAlmostEqual(matrix[0][1], 0.0)
-        self.assertAlmostEqual(matrix[0][2], 0.70710678)
-        self.assertAlmostEqual(matrix[1][2], 0.70710678)
+
+        # Reference: L2-normalize the stacked vectors, then one Gram matrix.
+        normed = np.stack(vectors).astype(np.float64)
+        normed /= np.linalg.norm(normed, axis=1, keepdims=True)
+        np.testing.assert_allclose(np.asarray(matrix, dtype=np.float64), normed @ normed.T, atol=1e-6)
+        # Hand-computed anchor so the reference itself is checked too.
+        h = 1 / np.sqrt(2)
+        np.testing.assert_allclose(matrix, [[1, 0, h], [0, 1, h], [h, h, 1]], atol=1e-6)
 
     def test_verify_logic_pass(self):
         # Mock GeometricVerifier response
@@ -44,18 +49,9 @@ class TestMultiViewVerifier(unittest.TestCase):
         # Return high similarity to ensure pass
         mock_faiss.compute_similarity.return_value = 0.95
         
-        # Create Dummy PP2PerViewResult objects (minimal fields)
-        dummy_result = PP2PerViewResult(
-            view_index=0,
-            filename="test.jpg",
-            detection=PP2PerViewDetection(bbox=(0,0,10,10), cls_name="shoe", confidence=0.9),
-            extraction=PP2PerViewExtraction(caption="a shoe", ocr_text="", grounded_features={}),
-            embedding=PP2PerViewEmbedding(dim=2, vector_preview=[1.0, 0.0], vector_id="v1"),
-            quality_score=0.9
-        )
-        per_view_results = [dummy_result, dummy_result, dummy_result]
+        per_view_results = [self.dummy_result] * 3
         
-        vectors = [np.array([1, 0]) for _ in range(3)]
+        vectors = list(np.tile([1.0, 0.0], (3, 1)))
         crops = ["crop1", "crop2", "crop3"] # Mock crops
         
         # Call verify
@@ -72,20 +68,11 @@ class TestMultiViewVerifier(unittest.TestCase):
         mock_faiss = MagicMock()
         mock_faiss.compute_similarity.return_value = 0.1
         
-        dummy_result = PP2PerViewResult(
-            view_index=0,
-            filename="test.jpg",
-            detection=PP2PerViewDetection(bbox=(0,0,10,10), cls_name="shoe", confidence=0.9),
-            extraction=PP2PerViewExtraction(caption="a shoe", ocr_text="", grounded_features={}),
-            embedding=PP2PerViewEmbedding(dim=2, vector_preview=[1.0, 0.0], vector_id="v1"),
-            quality_score=0.9
-        )
-        
         # Vectors that are orthogonal
-        vectors = [np.array([1, 0]), np.array([0, 1]), np.array([0, -1])]
+        vectors = list(np.array([[1, 0], [0, 1], [0, -1]], dtype=np.float64))
         
         result = self.verifier.verify(
-            [dummy_result]*3, 
+            [self.dummy_result]*3, 
             vectors, 
             ["c"]*3, 
             mock_faiss
@@ -101,17 +88,8 @@ class TestMultiViewVerifier(unittest.TestCase):
             def pair_similarity(self, vec_a, vec_b):
                 return 0.95
 
-        dummy_result = PP2PerViewResult(
-            view_index=0,
-            filename="test.jpg",
-            detection=PP2PerViewDetection(bbox=(0, 0, 10, 10), cls_name="shoe", confidence=0.9),
-            extraction=PP2PerViewExtraction(caption="a shoe", ocr_text="", grounded_features={}),
-            embedding=PP2PerViewEmbedding(dim=2, vector_preview=[1.0, 0.0], vector_id="v1"),
-            quality_score=0.9
-        )
-
-        per_view_results = [dummy_result, dummy_result, dummy_result]
-        vectors = [np.array([1, 0]) for _ in range(3)]
+        per_view_results = [self.dummy_result] * 3
+        vectors = list(np.tile([1.0, 0.0], (3, 1)))
         crops = ["crop1", "crop2", "crop3"]
 
         result = self.verifier.verify(per_view_results, vectors, crops, PairOnlyFaiss())
@@ -127,55 +105,36 @@ class TestMultiViewVerifier(unittest.TestCase):
 
 
 class TestFaissService(unittest.TestCase):
-    def test_pair_similarity(self):
+    # One index for the class: both tests only read from it.
+    @classmethod
+    def setUpClass(cls):
         try:
-            import faiss
-            # Instantiate FaissService with dummy paths
-            service = FaissService(dim=2, index_path="dummy.index", mapping_path="dummy.json")
-            
-            vec_a = np.array([1.0, 0.0])
-            vec_b = np.array([0.0, 1.0])
-            vec_c = np.array([1.0, 0.0])
-            
-            # Identical (should be ~1.0)
-            score_same = service.pair_similarity(vec_a, vec_c)
-            self.assertAlmostEqual(score_same, 1.0, delta=0.01)
-            
-            # Orthogonal (should be ~0.0)
-            score_diff = service.pair_similarity(vec_a, vec_b)
-            self.assertAlmostEqual(score_diff, 0.0, delta=0.01)
-            
+            import faiss  # noqa: F401
         except ImportError:
-            # If faiss is not installed, we mock the behavior to satisfy requirements
-            mock_service = MagicMock()
-            mock_service.pair_similarity.side_effect = lambda a, b: float(np.dot(a, b))
-            
-            vec_a = np.array([1, 0])
-            vec_c = np.array([1, 0])
-            
-            self.assertEqual(mock_service.pair_similarity(vec_a, vec_c), 1.0)
-            print("Faiss not installed, using mock for pair_similarity test.")
+            raise unittest.SkipTest("faiss not installed")
+        cls.service = FaissService(dim=2, index_path="dummy.index", mapping_path="dummy.json")
 
-    def test_compute_similarity_alias(self):
-        try:
-            import faiss
-            service = FaissService(dim=2, index_path="dummy.index", mapping_path="dummy.json")
+    def test_pair_similarity(self):
+        vec_a = np.array([1.0, 0.0])
+        vec_b = np.array([0.0, 1.0])
+        vec_c = np.array([1.0, 0.0])
 
-            vec_a = np.array([1.0, 0.0])
-            vec_b = np.array([1.0, 0.0])
+        # Identical (should be ~1.0)
+        score_same = self.service.pair_similarity(vec_a, vec_c)
+        self.assertAlmostEqual(score_same, 1.0, delta=0.01)
 
-            score_legacy = service.compute_similarity(vec_a, vec_b)
-            score_modern = service.pair_similarity(vec_a, vec_b)
+        # Orthogonal (should be ~0.0)
+        score_diff = self.service.pair_similarity(vec_a, vec_b)
+        self.assertAlmostEqual(score_diff, 0.0, delta=0.01)
 
-            self.assertAlmostEqual(score_legacy, score_modern, delta=1e-6)
-        except ImportError:
-            mock_service = MagicMock()
-            mock_service.pair_similarity.side_effect = lambda a, b: float(np.dot(a, b))
-            mock_service.compute_similarity.side_effect = lambda a, b: mock_service.pair_similarity(a, b)
+    def test_compute_similarity_alias(self):
+        vec_a = np.array([1.0, 0.0])
+        vec_b = np.array([1.0, 0.0])
+
+        score_legacy = self.service.compute_similarity(vec_a, vec_b)
+        score_modern = self.service.pair_similarity(vec_a, vec_b)
 
-            vec_a = np.array([1, 0])
-            vec_b = np.array([1, 0])
-            self.assertEqual(mock_service.compute_similarity(vec_a, vec_b), 1.0)
+        self.assertAlmostEqual(score_legacy, score_modern, delta=1e-6)
 
 
 class TestCategoryGroupAssignment(unittest.TestCase):
@@ -354,9 +313,7 @@ class TestSmartPhoneFrontBackRescue(unittest.TestCase):
 
     def test_two_view_smart_phone_front_back_rescue_passes(self):
         mock_faiss = MagicMock()
-        mock_faiss.pair_similarity.side_effect = lambda a, b: float(
-            np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12)
-        )
+        mock_faiss.pair_similarity.return_value = 0.20
         views = [
             self._make_view(
                 "Smart Phone",
@@ -384,9 +341,7 @@ class TestSmartPhoneFrontBackRescue(unittest.TestCase):
 
     def test_two_view_smart_phone_front_back_rescue_fails_below_floor(self):
         mock_faiss = MagicMock()
-        mock_faiss.pair_similarity.side_effect = lambda a, b: float(
-            np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12)
-        )
+        mock_faiss.pair_similarity.return_value = 0.10
         views = [
             self._make_view("Smart Phone", ocr_text="Home to unlock"),
             self._make_view("Smart Phone", grounded_features={"features": ["camera module"]}),
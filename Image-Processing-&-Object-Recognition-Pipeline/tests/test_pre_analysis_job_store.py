@@ -81,8 +81,7 @@ class TestPreAnalysisJobStore(unittest.TestCase):
         self.assertIsInstance(fetched["result"][0]["confidence"], float)
         self.assertEqual(fetched["result"][0]["bbox"], [1, 2, 3, 4])
         self.assertEqual(len(fetched["result"][0]["raw"]["embeddings"]), 2)
-        self.assertAlmostEqual(fetched["result"][0]["raw"]["embeddings"][0], 0.1, places=5)
-        self.assertAlmostEqual(fetched["result"][0]["raw"]["embeddings"][1], 0.2, places=5)
+        np.testing.assert_allclose(fetched["result"][0]["raw"]["embeddings"], [0.1, 0.2], atol=1e-5)
         self.assertIsInstance(fetched["result"][0]["raw"]["timings"]["total_ms"], float)
 
         redis_payload = json.loads(fake_redis.data[job_store._job_key(task_id)])
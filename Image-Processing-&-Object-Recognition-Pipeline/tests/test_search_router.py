@@ -1,5 +1,4 @@
 import io
-import sys
 from contextlib import asynccontextmanager
 from unittest.mock import MagicMock, patch
 
@@ -8,21 +7,12 @@ import pytest
 from fastapi.testclient import TestClient
 from PIL import Image
 
+from conftest import stub_heavy_service_modules
 
-mock_yolo_module = MagicMock()
-mock_florence_module = MagicMock()
-mock_dino_module = MagicMock()
 
-mock_yolo_module.YoloService = MagicMock()
-mock_florence_module.FlorenceService = MagicMock()
-mock_dino_module.DINOEmbedder = MagicMock()
-
-sys.modules["app.services.yolo_service"] = mock_yolo_module
-sys.modules["app.services.florence_service"] = mock_florence_module
-sys.modules["app.services.dino_embedder"] = mock_dino_module
-
-from app.main import app
-from app.services.image_search_reranker import build_color_histogram
+with stub_heavy_service_modules():
+    from app.main import app
+    from app.services.image_search_reranker import build_color_histogram
 
 
 def _solid_hist(color: tuple[int, int, int]) -> list[float]:
@@ -108,7 +98,8 @@ app.router.lifespan_context = mock_lifespan
 def _image_bytes(color=(255, 0, 0)) -> bytes:
     image = Image.new("RGB", (32, 32), color=color)
     buf = io.BytesIO()
-    image.save(buf, format="PNG")
+    # Lossless (histograms are compared) but uncompressed: zlib is pure overhead here.
+    image.save(buf, format="PNG", compress_level=0)
     return buf.getvalue()
 
 
@@ -166,6 +166,72 @@ class TestYoloServiceDetections(unittest.TestCase):
         self.assertEqual(self.service.model.call_count, 3)
         self.assertEqual(self.service.model.max_active, 1)
 
+    def test_detect_objects_coalesces_concurrent_calls_when_batching(self):
+        class _BatchModel:
+            def __init__(self):
+                self.names = {0: "Wallet"}
+                self.batch_sizes = []
+
+            def __call__(self, images, conf=0.25, verbose=False):
+                self.batch_sizes.append(len(images))
+                return [
+                    _FakeResult([_FakeBox(0, 0.9, [idx, idx, idx + 10, idx + 10])])
+                    for idx in range(len(images))
+                ]
+
+        self.service.model = _BatchModel()
+        self.service._warmup_done = True
+        results = {}
+
+        @contextmanager
+        def _guard(_op_name, _component):
+            yield
+
+        def _detect(idx):
+            results[idx] = self.service.detect_objects(f"img{idx}.jpg")
+
+        with patch.object(yolo_service_module.settings, "YOLO_MAX_BATCH", 3), patch.object(
+            yolo_service_module.settings, "YOLO_BATCH_WAIT_MS", 500
+        ), patch.object(yolo_service_module, "gpu_inference_guard", new=_guard):
+            threads = [threading.Thread(target=_detect, args=(idx,)) for idx in range(3)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(self.service.model.batch_sizes, [3])
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertTrue(all(len(dets) == 1 for dets in results.values()))
+
+    def test_large_pil_input_is_reduced_and_boxes_scaled_back(self):
+        class _SizeModel(_FakeModel):
+            def __call__(self, image_path_or_array, conf=0.25, verbose=False):
+                self.seen_size = image_path_or_array.size
+                return self._results
+
+        self.service.model = _SizeModel([_FakeResult([_FakeBox(0, 0.9, [10, 20, 100, 200])])])
+        image = yolo_service_module.Image.new("RGB", (4032, 3024))
+
+        with patch.object(yolo_service_module.settings, "YOLO_IMGSZ", 640):
+            detections = self.service.detect_objects(image)
+
+        self.assertEqual(self.service.model.seen_size, (1344, 1008))
+        self.assertEqual(detections[0].bbox, (30, 60, 300, 600))
+
+
+class TestTopKDetections(unittest.TestCase):
+    def test_large_list_matches_full_sort(self):
+        confs = [((i * 37) % 101) / 101.0 for i in range(200)]
+        detections = [
+            yolo_service_module.YoloDetection(label=str(i), confidence=c, bbox=(0, 0, 1, 1))
+            for i, c in enumerate(confs)
+        ]
+
+        top = yolo_service_module.top_k_detections(detections, 5)
+        expected = sorted(detections, key=lambda d: d.confidence, reverse=True)[:5]
+
+        self.assertEqual([d.label for d in top], [d.label for d in expected])
+
 
 if __name__ == "__main__":
     unittest.main()
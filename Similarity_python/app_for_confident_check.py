@@ -9,6 +9,7 @@ Module overview:
 
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
 import uuid
@@ -16,12 +17,18 @@ import tempfile
 import time
 import threading
 import cv2
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from pymongo import MongoClient
 from bson import ObjectId
 import requests
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used without it
+    orjson = None
+
 # Prevent transformers from importing TensorFlow in this service.
 # We use sentence-transformers with PyTorch path here.
 os.environ.setdefault("TRANSFORMERS_NO_TF", "1")
@@ -34,23 +41,64 @@ from gemini_batch_checker import gemini_batch_similarity
 MONGO_URI = os.getenv("MONGO_URI")
 SUSPICION_SERVICE_URL = os.getenv("PYTHON_SUSPICION_BACKEND_URL", "http://127.0.0.1:5005")
 
-client = MongoClient(MONGO_URI)
+# connect=False defers the socket until first use, so a gunicorn --preload
+# master never hands an already-open connection pool to forked workers.
+client = MongoClient(MONGO_URI, connect=False)
 db = client["findassure"]
 
 users_col = db["users"]
 verification_col = db["verification_sessions"]
 behavior_col = db["behavior_sessions"]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. Keys stay sorted like Flask's default,
+    and dates/other non-native values still go through DefaultJSONProvider.default.
+    """
+
+    _options = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson is not None else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 nlp = LocalNLP()
 
 TMP_DIR = tempfile.gettempdir()
 MAX_WORKERS = 5
+# Long-lived pool shared by all requests, so each verification does not pay
+# thread start-up for its video transcription fan-out.
+VIDEO_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="verify-video")
+# Separate pool for whole-request stages (face analysis, the Gemini call) so
+# they never queue behind per-video transcription work.
+STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="verify-stage")
+# Copy buffer for writing uploaded answer videos to TMP_DIR.
+UPLOAD_SAVE_BUFFER_SIZE = 1024 * 1024
 # These thresholds keep the scoring policy explicit: low audio confidence and
 # high guessing-risk reduce trust even when text similarity appears strong.
 LOW_AUDIO_OWNER_THRESHOLD = 0.50
 HIGH_GUESSING_RISK_THRESHOLD = 0.70
 AVG_GUESSING_RISK_REJECT_THRESHOLD = 0.40
 PER_QUESTION_AUDIO_WEIGHT = 0.15
+# Optionally skip the Gemini call when a local rule verdict (empty or
+# contradicting answer) scores below EARLY_REJECT_LOCAL_THRESHOLD. Off by
+# default: a confident Gemini score overrides the local one in fusion, which
+# rescues answers the rule checks misread (e.g. "it's not broken, it is fine"
+# flagged as contradicting "it is not broken").
+EARLY_REJECT_LOCAL_ENABLED = os.getenv("EARLY_REJECT_LOCAL_ENABLED", "false").strip().lower() in {"1", "true", "yes"}
+EARLY_REJECT_LOCAL_THRESHOLD = float(os.getenv("EARLY_REJECT_LOCAL_THRESHOLD", "0.05"))
+# Gemini scores at or above this replace the local score outright.
+GEMINI_TRUST_THRESHOLD = 0.80
 
 
 # -----------------------------
@@ -68,6 +116,49 @@ def to_percent(v):
     return None if v is None else f"{int(round(v * 100))}%"
 
 
+def to_percent_many(values):
+    """to_percent() over a whole score array in one pass; NaN entries become None."""
+    pct = np.round(np.asarray(values, dtype=np.float64) * 100).tolist()
+    return [None if p != p else f"{int(p)}%" for p in pct]
+
+
+def classify_statuses(scores):
+    """classify_status() over a whole score array."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.where(
+        scores >= 0.70, "match", np.where(scores >= 0.40, "partial_match", "mismatch")
+    ).tolist()
+
+
+def should_skip_gemini(missing_answer_count, prepared_pairs):
+    """
+    Decide from the cheap local stage whether the Gemini call can be skipped.
+    A missing transcript always rejects the attempt; low local rule verdicts
+    only skip Gemini when EARLY_REJECT_LOCAL_ENABLED is set.
+    """
+    if missing_answer_count > 0:
+        return True
+    if not EARLY_REJECT_LOCAL_ENABLED:
+        return False
+    early_scores = [early["fused"] for early, _ in prepared_pairs if early is not None]
+    return bool(early_scores) and min(early_scores) < EARLY_REJECT_LOCAL_THRESHOLD
+
+
+def fuse_local_gemini(local_arr, gem_arr):
+    """
+    Fuse per-question local and Gemini scores (NaN marks a missing Gemini
+    score). Rule 1: a confident Gemini score is trusted directly; otherwise
+    the two are averaged, and local stands alone where Gemini is missing.
+    """
+    local_arr = np.asarray(local_arr, dtype=np.float64)
+    gem_arr = np.asarray(gem_arr, dtype=np.float64)
+    return np.where(
+        np.isnan(gem_arr),
+        local_arr,
+        np.where(gem_arr >= GEMINI_TRUST_THRESHOLD, gem_arr, (local_arr * 0.5) + (gem_arr * 0.5)),
+    )
+
+
 def extract_face_score(face_confidence_result):
     """Average all per-video face overall scores into one face confidence score."""
     if not face_confidence_result:
@@ -116,6 +207,53 @@ def touch_owner(owner_id):
     )
 
 
+def process_single_video(answer_data, video_path):
+    """Transcribe one answer video and attach audio-confidence diagnostics."""
+    key = answer_data["video_key"]
+
+    try:
+        # Audio confidence + transcript extraction (new behavior).
+        audio_result = analyze_audio_confidence(video_path)
+        owner_text = (audio_result.get("transcript") or "").strip()
+
+        # Fallback to existing transcription path to avoid breaking old behavior.
+        # The video is still read by the concurrent face stage; verify_owner
+        # deletes it once every stage is done.
+        if not owner_text:
+            owner_text = extract_text(video_path, delete_source=False)
+        if not owner_text or not owner_text.strip():
+            print(f"Warning: Empty transcript for {key} (question {answer_data.get('question_id')})")
+        return {
+            "question_id": answer_data["question_id"],
+            "question_text": answer_data.get("question_text", ""),
+            "question_type": answer_data.get("question_type"),
+            "question_level": answer_data.get("question_level"),
+            "question_weight": answer_data.get("question_weight"),
+            "founder_answer": answer_data["founder_answer"],
+            "owner_answer": owner_text,
+            "audio_analysis": audio_result,
+            "success": True
+        }
+    except Exception as e:
+        print(f"Error processing {key}: {str(e)}")
+        return {
+            "question_id": answer_data.get("question_id", 0),
+            "question_text": answer_data.get("question_text", ""),
+            "question_type": answer_data.get("question_type"),
+            "question_level": answer_data.get("question_level"),
+            "question_weight": answer_data.get("question_weight"),
+            "founder_answer": answer_data.get("founder_answer", ""),
+            "owner_answer": "[Processing Error]",
+            "audio_analysis": {
+                "audio_confidence_score": 0.0,
+                "label": "audio_processing_failed",
+                "diagnostics": {},
+            },
+            "error": str(e),
+            "success": False
+        }
+
+
 def trigger_suspicion_async(data, saved_paths):
     """Send saved answer videos to the suspicion service without blocking the response."""
     expected_keys = []
@@ -175,7 +313,7 @@ def verify_owner():
             return jsonify({"error": "Missing data field"}), 400
 
         try:
-            data = json.loads(request.form["data"])
+            data = app.json.loads(request.form["data"])
         except Exception:
             return jsonify({"error": "Invalid JSON in data"}), 400
 
@@ -202,14 +340,24 @@ def verify_owner():
         # -----------------------------
         # Save all files once so they can be reused by multiple stages.
         # -----------------------------
+        # Uploads are written concurrently with large copy buffers instead of
+        # one after another in 16 KiB chunks.
         for a in answers:
             key = a["video_key"]
             if key not in request.files:
                 return jsonify({"error": f"Missing file: {key}"}), 400
+        save_futures = []
+        for a in answers:
+            key = a["video_key"]
             file = request.files[key]
             path = os.path.join(TMP_DIR, f"{uuid.uuid4().hex}_{file.filename}")
-            file.save(path)
             saved_paths[key] = path
+            save_futures.append(STAGE_EXECUTOR.submit(file.save, path, UPLOAD_SAVE_BUFFER_SIZE))
+        # Let every write finish before surfacing an error, so the cleanup in
+        # the outer finally never races a still-running save.
+        wait(save_futures)
+        for future in save_futures:
+            future.result()
 
         # Trigger behavior analysis in parallel for direct calls to :5000.
         # The verification route owns identity matching; behavior analysis is
@@ -230,84 +378,38 @@ def verify_owner():
             for a in answers
             if isinstance(a, dict) and a.get("video_key") in saved_paths
         ]
+        # The face stage only reads the saved videos, so it runs alongside
+        # transcription below instead of before it.
+        face_future = None
         if face_keys:
-            try:
-                face_video_inputs = [
-                    (k, saved_paths[k])
-                    for k in face_keys
-                    if k in saved_paths
-                ]
-                face_confidence_result = analyze_face_confidence_from_paths(
-                    face_video_inputs
-                )
-                face_check_status = "completed"
-            except Exception as e:
-                face_check_status = "failed"
-                face_check_error = str(e)
-                print(f"Face confidence check failed: {face_check_error}")
+            face_video_inputs = [
+                (k, saved_paths[k])
+                for k in face_keys
+                if k in saved_paths
+            ]
+            face_future = STAGE_EXECUTOR.submit(
+                analyze_face_confidence_from_paths, face_video_inputs
+            )
         else:
             print("Warning: No face videos provided. Face confidence was not evaluated.")
 
         # -----------------------------
         # VIDEO -> TEXT (PARALLEL)
         # -----------------------------
-        def process_single_video(answer_data):
-            """Transcribe one answer video and attach audio-confidence diagnostics."""
-            key = answer_data["video_key"]
-            video_path = saved_paths.get(key)
+        futures = [
+            VIDEO_EXECUTOR.submit(process_single_video, answer, saved_paths.get(answer["video_key"]))
+            for answer in answers
+        ]
+        enriched = [future.result() for future in futures]
 
+        if face_future is not None:
             try:
-                # Audio confidence + transcript extraction (new behavior).
-                audio_result = analyze_audio_confidence(video_path)
-                owner_text = (audio_result.get("transcript") or "").strip()
-
-                # Fallback to existing transcription path to avoid breaking old behavior.
-                if not owner_text:
-                    owner_text = extract_text(video_path)
-                if not owner_text or not owner_text.strip():
-                    print(f"Warning: Empty transcript for {key} (question {answer_data.get('question_id')})")
-                return {
-                    "question_id": answer_data["question_id"],
-                    "question_text": answer_data.get("question_text", ""),
-                    "question_type": answer_data.get("question_type"),
-                    "question_level": answer_data.get("question_level"),
-                    "question_weight": answer_data.get("question_weight"),
-                    "founder_answer": answer_data["founder_answer"],
-                    "owner_answer": owner_text,
-                    "audio_analysis": audio_result,
-                    "success": True
-                }
+                face_confidence_result = face_future.result()
+                face_check_status = "completed"
             except Exception as e:
-                print(f"Error processing {key}: {str(e)}")
-                return {
-                    "question_id": answer_data.get("question_id", 0),
-                    "question_text": answer_data.get("question_text", ""),
-                    "question_type": answer_data.get("question_type"),
-                    "question_level": answer_data.get("question_level"),
-                    "question_weight": answer_data.get("question_weight"),
-                    "founder_answer": answer_data.get("founder_answer", ""),
-                    "owner_answer": "[Processing Error]",
-                    "audio_analysis": {
-                        "audio_confidence_score": 0.0,
-                        "label": "audio_processing_failed",
-                        "diagnostics": {},
-                    },
-                    "error": str(e),
-                    "success": False
-                }
-            finally:
-                if video_path and os.path.exists(video_path):
-                    os.remove(video_path)
-                saved_paths[key] = None
-
-        enriched = []
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_map = {
-                executor.submit(process_single_video, answer): answer
-                for answer in answers
-            }
-            for future in as_completed(future_map):
-                enriched.append(future.result())
+                face_check_status = "failed"
+                face_check_error = str(e)
+                print(f"Face confidence check failed: {face_check_error}")
 
         enriched.sort(key=lambda x: x["question_id"])
 
@@ -361,10 +463,49 @@ def verify_owner():
             for x in enriched
         ]
 
-        gemini = gemini_batch_similarity(gemini_payload)
+        local_pairs = [
+            (
+                a["founder_answer"],
+                a["owner_answer"],
+                a.get("question_text", ""),
+                a.get("question_type"),
+                a.get("question_weight"),
+            )
+            for a in enriched
+        ]
+        # The rule checks are cheap; a missing transcript rejects the request
+        # whatever Gemini says, so its network round-trip and quota are skipped.
+        prepared_pairs = nlp.prepare_pairs(local_pairs)
+        skip_gemini = should_skip_gemini(missing_answer_count, prepared_pairs)
+
+        # Gemini is a slow network call and local NLP never needs its output,
+        # so run the two concurrently and join right before fusion.
+        gemini_future = None
+        if not skip_gemini:
+            gemini_future = STAGE_EXECUTOR.submit(gemini_batch_similarity, gemini_payload)
+
+        # Score every answer in one batch so SBERT encodes all pairs at once.
+        local_results = nlp.score_pairs_batch(local_pairs, prepared_pairs)
+
+        if gemini_future is not None:
+            gemini = gemini_future.result()
+        else:
+            gemini = {
+                "error": "GEMINI_SKIPPED",
+                "message": "Skipped: local checks already reject at least one answer",
+                "fallback_mode": True,
+            }
         gemini_failed = isinstance(gemini, dict) and "error" in gemini
 
-        if gemini_failed:
+        if skip_gemini:
+            gemini_details = []
+            gemini_recommendation = "LOCAL_NLP_ONLY"
+            gemini_reasoning = (
+                "Gemini check skipped: at least one answer is missing or clearly "
+                "does not match, so the local NLP result decides."
+            )
+            print("Gemini skipped: local checks already reject this attempt.")
+        elif gemini_failed:
             gemini_details = []
             gemini_recommendation = "LOCAL_NLP_ONLY"
             error_msg = gemini.get("message", "Gemini API unavailable")
@@ -389,113 +530,107 @@ def verify_owner():
         # -----------------------------
         # LOCAL NLP + FUSION
         # -----------------------------
-        results = []
-        semantic_scores = []
-        final_scores = []
-        question_weights = []
-        audio_scores = []
-        guessing_risk_scores = []
-        valid_audio_count = 0
-
-        for i, a in enumerate(enriched):
-            local = nlp.score_pair(
-                a["founder_answer"],
-                a["owner_answer"],
-                a.get("question_text", ""),
-                a.get("question_type"),
-                a.get("question_weight"),
-            )
-
-            local_score = float(local["fused"])
+        # Numeric per-question values are kept as parallel arrays (one slot per
+        # answer) so fusion and aggregation run as array operations; the
+        # per-question result dicts are only assembled for the response.
+        n_answers = len(enriched)
+        local_arr = np.fromiter(
+            (float(local["fused"]) for local in local_results), dtype=np.float64, count=n_answers
+        )
+        gem_arr = np.full(n_answers, np.nan)
+        for i, detail in enumerate(gemini_details[:n_answers]):
+            try:
+                gem_arr[i] = detail["similarityScore"] / 100.0
+            except Exception:
+                pass
+        fused_arr = fuse_local_gemini(local_arr, gem_arr)
+
+        question_types = []
+        type_adjustment_reasons = []
+        weights_arr = np.empty(n_answers)
+        audio_arr = np.empty(n_answers)
+        guessing_all = np.empty(n_answers)
+        audio_valid = np.zeros(n_answers, dtype=bool)
+
+        for i, (a, local) in enumerate(zip(enriched, local_results)):
             question_type = local.get("question_type") or a.get("question_type") or "descriptive"
-            question_weight = float(a.get("question_weight") or local.get("question_weight", 1.0) or 1.0)
-            question_level = a.get("question_level")
             type_adjustment_reason = local.get("type_adjustment_reason")
-            gem_score = None
-
-            if i < len(gemini_details):
-                try:
-                    gem_score = gemini_details[i]["similarityScore"] / 100.0
-                except Exception:
-                    gem_score = None
-
-            # Rule 1: trust Gemini directly when very confident.
-            if gem_score is None:
-                fused = local_score
-            elif gem_score >= 0.80:
-                fused = gem_score
-            else:
-                fused = (local_score * 0.5) + (gem_score * 0.5)
 
-            fused, final_type_adjustment_reason = nlp.apply_question_type_rules(
-                fused,
+            # Question-type rules inspect the answer text, so they stay per item.
+            fused_arr[i], final_type_adjustment_reason = nlp.apply_question_type_rules(
+                fused_arr[i],
                 question_type,
                 a["founder_answer"],
                 a["owner_answer"],
             )
             if final_type_adjustment_reason:
                 type_adjustment_reason = final_type_adjustment_reason
+            question_types.append(question_type)
+            type_adjustment_reasons.append(type_adjustment_reason)
 
+            weights_arr[i] = float(a.get("question_weight") or local.get("question_weight", 1.0) or 1.0)
             audio_data = a.get("audio_analysis") or {}
-            audio_label = audio_data.get("label")
-            audio_score = float(audio_data.get("audio_confidence_score", 0.0) or 0.0)
-            guessing_risk = float(audio_data.get("guessing_risk_score", 0.0) or 0.0)
-
+            audio_arr[i] = float(audio_data.get("audio_confidence_score", 0.0) or 0.0)
+            guessing_all[i] = float(audio_data.get("guessing_risk_score", 0.0) or 0.0)
             # Treat audio processing failures as "not evaluated" instead of hard 0%.
-            audio_is_valid = audio_label not in (None, "audio_processing_failed")
-            if audio_is_valid:
-                valid_audio_count += 1
-                audio_scores.append(audio_score)
-                guessing_risk_scores.append(guessing_risk)
-
-            semantic_scores.append(fused)
-            question_final = fused
-            if audio_is_valid:
-                question_final = (
-                    (fused * (1.0 - PER_QUESTION_AUDIO_WEIGHT)) +
-                    (audio_score * PER_QUESTION_AUDIO_WEIGHT)
-                )
+            audio_valid[i] = audio_data.get("label") not in (None, "audio_processing_failed")
 
-            final_scores.append(question_final)
-            question_weights.append(question_weight)
+        final_arr = np.where(
+            audio_valid,
+            (fused_arr * (1.0 - PER_QUESTION_AUDIO_WEIGHT)) + (audio_arr * PER_QUESTION_AUDIO_WEIGHT),
+            fused_arr,
+        )
+        valid_audio_count = int(np.count_nonzero(audio_valid))
+        guessing_arr = guessing_all[audio_valid]
+
+        local_pct = to_percent_many(local_arr)
+        gemini_pct = to_percent_many(gem_arr)
+        semantic_pct = to_percent_many(fused_arr)
+        final_pct = to_percent_many(final_arr)
+        audio_pct = to_percent_many(audio_arr)
+        guessing_pct = to_percent_many(guessing_all)
+        statuses = classify_statuses(final_arr)
 
+        results = []
+        for i, a in enumerate(enriched):
+            audio_data = a.get("audio_analysis") or {}
             results.append({
                 "question_id": a["question_id"],
                 "question_text": a.get("question_text"),
-                "question_type": question_type,
-                "question_level": question_level,
-                "question_weight": question_weight,
-                "type_adjustment_reason": type_adjustment_reason,
+                "question_type": question_types[i],
+                "question_level": a.get("question_level"),
+                "question_weight": float(weights_arr[i]),
+                "type_adjustment_reason": type_adjustment_reasons[i],
                 "founder_answer": a["founder_answer"],
                 "owner_transcript": a["owner_answer"],
-                "local_score": to_percent(local_score),
-                "gemini_score": to_percent(gem_score),
-                "semantic_similarity": to_percent(fused),
-                "final_similarity": to_percent(question_final),
-                "status": classify_status(question_final),
+                "local_score": local_pct[i],
+                "gemini_score": gemini_pct[i],
+                "semantic_similarity": semantic_pct[i],
+                "final_similarity": final_pct[i],
+                "status": statuses[i],
                 "gemini_analysis": gemini_details[i].get("analysis")
                 if i < len(gemini_details) and isinstance(gemini_details[i], dict) else None,
                 "audio_confidence": {
-                    "score": to_percent(audio_score),
+                    "score": audio_pct[i],
                     "label": audio_data.get("label"),
-                    "guessing_risk_score": to_percent(guessing_risk),
+                    "guessing_risk_score": guessing_pct[i],
                     "guessing_label": audio_data.get("guessing_label"),
                     "diagnostics": audio_data.get("diagnostics", {})
                 }
             })
 
-        total_question_weight = sum(question_weights) if question_weights else 0.0
+        total_question_weight = float(weights_arr.sum())
         semantic_avg_final = (
-            sum(score * weight for score, weight in zip(semantic_scores, question_weights)) / total_question_weight
+            float(np.dot(fused_arr, weights_arr)) / total_question_weight
             if total_question_weight > 0 else 0.0
         )
         question_avg_final = (
-            sum(score * weight for score, weight in zip(final_scores, question_weights)) / total_question_weight
+            float(np.dot(final_arr, weights_arr)) / total_question_weight
             if total_question_weight > 0 else 0.0
         )
-        avg_audio_confidence = sum(audio_scores) / len(audio_scores) if audio_scores else None
-        avg_guessing_risk = sum(guessing_risk_scores) / len(guessing_risk_scores) if guessing_risk_scores else 0.0
-        high_guessing_count = sum(1 for g in guessing_risk_scores if g >= HIGH_GUESSING_RISK_THRESHOLD)
+        avg_audio_confidence = float(audio_arr[audio_valid].mean()) if valid_audio_count else None
+        avg_guessing_risk = float(guessing_arr.mean()) if guessing_arr.size else 0.0
+        high_guessing_count = int(np.count_nonzero(guessing_arr >= HIGH_GUESSING_RISK_THRESHOLD))
         face_score = extract_face_score(face_confidence_result)
         face_decision = (
             face_confidence_result.get("final_decision")
@@ -549,7 +684,8 @@ def verify_owner():
         avg_final = max(0.0, avg_final - guessing_penalty)
 
         # Rule 2: reject if any single question is critically low.
-        min_score = min(final_scores)
+        min_index = int(np.argmin(final_arr))
+        min_score = float(final_arr[min_index])
         has_zero_match = min_score <= 0.25
 
         # Retry context (last 24h) for this owner/category.
@@ -591,7 +727,7 @@ def verify_owner():
         elif has_zero_match:
             is_owner = False
             rejection_reason = (
-                f"Critical failure: Question {final_scores.index(min_score) + 1} has "
+                f"Critical failure: Question {min_index + 1} has "
                 f"{to_percent(min_score)} similarity (<=25%). Owner failed at least one "
                 "critical question."
             )
@@ -638,7 +774,7 @@ def verify_owner():
                 is_owner = False
                 rejection_reason = (
                     "High guessing pattern detected across answers "
-                    f"({high_guessing_count}/{len(guessing_risk_scores)} high-risk responses)."
+                    f"({high_guessing_count}/{guessing_arr.size} high-risk responses)."
                 )
             # FINAL CALCULATION: If no rejections, check overall score >= 70%
             else:
@@ -1,24 +1,19 @@
 """Audio confidence and hesitation-risk analysis for answer videos.
 
 Module overview:
-- Extracts audio from uploaded videos and transcribes speech with timestamps.
+- Decodes audio from uploaded videos in memory and transcribes speech with timestamps.
 - Measures confidence from ASR quality, pauses, fillers, speech rate, and pitch stability.
 - Returns both a confidence score and a guessing-risk score for verification fusion.
 """
 
 import os
 import re
-import uuid
-import tempfile
 import subprocess
 from typing import Dict, List, Any
 
-from scipy.io import wavfile
 from scipy.signal import lfilter
 import numpy as np
-from transcription_backend import transcribe_audio
-
-TMP_DIR = tempfile.gettempdir()
+from transcription_backend import SAMPLE_RATE, decode_audio_pcm, transcribe_audio
 
 FILLER_WORDS = {
     "uh", "um", "ah", "erm", "hmm", "mm",
@@ -53,31 +48,6 @@ def _safe_round(v, n=3):
         return 0.0
 
 
-def extract_audio_from_video(video_path: str) -> str:
-    """Convert a video file into mono 16 kHz WAV for speech processing."""
-    if not os.path.exists(video_path):
-        raise FileNotFoundError(f"File not found: {video_path}")
-
-    audio_path = os.path.join(TMP_DIR, f"{uuid.uuid4().hex}.wav")
-
-    subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i", video_path,
-            "-vn",
-            "-acodec", "pcm_s16le",
-            "-ar", "16000",
-            "-ac", "1",
-            audio_path
-        ],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        check=True
-    )
-    return audio_path
-
-
 def _count_words(text: str) -> int:
     """Count transcript words used for speech rate and filler ratios."""
     if not text:
@@ -138,24 +108,23 @@ def _repetition_ratio(text: str) -> float:
     return max(0.0, 1.0 - (unique_tokens / len(tokens)))
 
 
-def _load_wav_mono(audio_path: str):
-    """Load a WAV file as a normalized mono float signal."""
-    sr, data = wavfile.read(audio_path)
+def _normalize_mono(data: np.ndarray) -> np.ndarray:
+    """Downmix to mono and peak-normalize a signal to [-1, 1]."""
     if data is None:
-        return sr, np.array([], dtype=np.float32)
+        return np.array([], dtype=np.float32)
 
     if data.ndim > 1:
         data = np.mean(data, axis=1)
 
-    data = data.astype(np.float32)
+    data = data.astype(np.float32, copy=False)
     if data.size == 0:
-        return sr, data
+        return data
 
     # Normalize to [-1, 1]
     max_abs = np.max(np.abs(data))
     if max_abs > 0:
         data = data / max_abs
-    return sr, data
+    return data
 
 
 def _estimate_pitch_autocorr(frame: np.ndarray, sr: int) -> float:
@@ -194,10 +163,10 @@ def _estimate_pitch_autocorr(frame: np.ndarray, sr: int) -> float:
     return float(sr / lag)
 
 
-def _acoustic_instability_metrics(audio_path: str) -> Dict[str, float]:
+def _acoustic_instability_metrics(samples: np.ndarray, sr: int) -> Dict[str, float]:
     """Estimate voice stability from short audio frames."""
     try:
-        sr, sig = _load_wav_mono(audio_path)
+        sig = _normalize_mono(samples)
         if sig.size < max(400, int(0.2 * sr)):
             return {
                 "energy_cv": 0.0,
@@ -432,11 +401,14 @@ def _start_latency_score(start_latency_sec: float) -> float:
 
 def analyze_audio_confidence(video_path: str) -> Dict[str, Any]:
     """Compute owner-answer confidence from transcript and acoustic evidence."""
-    audio_path = None
     try:
-        audio_path = extract_audio_from_video(video_path)
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"File not found: {video_path}")
+
+        # One in-memory decode feeds both Whisper and the acoustic metrics.
+        samples = decode_audio_pcm(video_path)
 
-        result = transcribe_audio(audio_path, with_word_timestamps=True)
+        result = transcribe_audio(samples, with_word_timestamps=True)
         transcript = (result.get("text") or "").strip()
         segments = result.get("segments") or []
 
@@ -462,7 +434,7 @@ def analyze_audio_confidence(video_path: str) -> Dict[str, Any]:
             pauses["long_pause_count"],
             pauses["very_long_pause_count"]
         )
-        acoustic = _acoustic_instability_metrics(audio_path)
+        acoustic = _acoustic_instability_metrics(samples, SAMPLE_RATE)
         acoustic_score = float(acoustic.get("acoustic_score", 1.0))
         acoustic_risk = float(acoustic.get("acoustic_risk", 0.0))
         # Additional reduction when a large fraction of clip is silence/gaps.
@@ -613,6 +585,3 @@ def analyze_audio_confidence(video_path: str) -> Dict[str, Any]:
             "error": str(e),
             "diagnostics": {}
         }
-    finally:
-        if audio_path and os.path.exists(audio_path):
-            os.remove(audio_path)
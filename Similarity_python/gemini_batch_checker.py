@@ -2,14 +2,22 @@
 
 Module overview:
 - Sends all question/answer pairs in one request to keep model reasoning consistent.
-- Expects strict JSON so the Flask route can merge Gemini output with local NLP scores.
+- Requests schema-enforced JSON so the Flask route can merge Gemini output with local NLP scores.
 - Returns a fallback marker on API errors instead of raising into the request path.
 """
 
+import copy
+import hashlib
 import os
 import json
+import threading
+import time
+from collections import OrderedDict
+
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,45 +25,127 @@ load_dotenv()
 GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent"
 
+# One pooled session for the process so TCP/TLS connections to the Gemini
+# endpoint are kept alive and reused across verification requests.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        # Transient gateway errors get two quick retries; the final response
+        # is still returned so raise_for_status() reports it as before.
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+# Successful Gemini verdicts keyed by a hash of the exact question/answer
+# batch. Repeat verification attempts with identical answers then skip the
+# network call and quota entirely.
+_CACHE_TTL_SECONDS = float(os.getenv("GEMINI_CACHE_TTL_SECONDS", "86400"))
+_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "512"))
+_cache_lock = threading.Lock()
+_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+
+
+def _cache_key(q_list):
+    """Content hash of the batch that determines the Gemini prompt."""
+    blob = json.dumps(q_list, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=32).hexdigest()
+
+
+def _cache_get(key):
+    """Return a copy of a fresh cached verdict, dropping it if expired."""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > _CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+    return copy.deepcopy(value)
+
+
+def _cache_put(key, value):
+    """Store a successful verdict, evicting the least recently used entries."""
+    if _CACHE_MAX_ENTRIES <= 0:
+        return
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), copy.deepcopy(value))
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Structured-output schema: Gemini enforces the verdict shape itself, so the
+# prompt no longer spells out a JSON example on every call.
+_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "overallScore": {"type": "INTEGER"},
+        "matchDetails": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "questionNumber": {"type": "INTEGER"},
+                    "question": {"type": "STRING"},
+                    "similarityScore": {"type": "INTEGER"},
+                    "analysis": {"type": "STRING"},
+                    "isMatch": {"type": "BOOLEAN"},
+                },
+                "required": ["questionNumber", "similarityScore", "analysis", "isMatch"],
+                "propertyOrdering": ["questionNumber", "question", "similarityScore", "analysis", "isMatch"],
+            },
+        },
+        "recommendation": {
+            "type": "STRING",
+            "enum": ["VERIFIED", "LIKELY_MATCH", "UNCERTAIN", "NOT_MATCH"],
+        },
+        "reasoning": {"type": "STRING"},
+    },
+    "required": ["overallScore", "matchDetails", "recommendation", "reasoning"],
+    "propertyOrdering": ["overallScore", "matchDetails", "recommendation", "reasoning"],
+}
+
+
+_PROMPT_PREFIX = (
+    "You are verifying whether the owner's answers match the founder's answers. "
+    "Score each question's similarity 0-100 with a short analysis, then give an "
+    "overall score, recommendation and reasoning.\n\n"
+)
+
 
 def gemini_batch_similarity(q_list):
     """Ask Gemini to score multiple founder/owner answer pairs in one call."""
     if not GEMINI_KEY:
         return {"error": "Missing GEMINI_API_KEY"}
 
-    block = "\n\n".join(
-        [
-            f"Question {i+1}: {q['question']}\n"
-            f"Founder's Answer: \"{q['founder']}\"\n"
-            f"Owner's Answer: \"{q['owner']}\""
-            for i, q in enumerate(q_list)
-        ]
+    cache_key = _cache_key(q_list)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # The static instructions are built once at import; per call only the
+    # question blocks are formatted, in a single join.
+    prompt = _PROMPT_PREFIX + "\n\n".join(
+        f"Question {i}: {q['question']}\n"
+        f"Founder's Answer: \"{q['founder']}\"\n"
+        f"Owner's Answer: \"{q['owner']}\""
+        for i, q in enumerate(q_list, 1)
     )
 
-    prompt = f"""
-You are an AI assistant verifying if the owner truly matches the founder's answers.
-
-Questions and Answers:
-{block}
-
-Return ONLY JSON:
-
-{{
-  "overallScore": <0-100>,
-  "matchDetails": [
-    {{
-      "questionNumber": 1,
-      "question": "<question>",
-      "similarityScore": <0-100>,
-      "analysis": "<short>",
-      "isMatch": <true/false>
-    }}
-  ],
-  "recommendation": "<VERIFIED | LIKELY_MATCH | UNCERTAIN | NOT_MATCH>",
-  "reasoning": "<overall explanation>"
-}}
-"""
-
     body = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
@@ -63,11 +153,13 @@ Return ONLY JSON:
             "topK": 20,
             "topP": 0.8,
             "maxOutputTokens": 2048,
+            "responseMimeType": "application/json",
+            "responseSchema": _RESPONSE_SCHEMA,
         },
     }
 
     try:
-        r = requests.post(f"{API_URL}?key={GEMINI_KEY}", json=body, timeout=40)
+        r = _SESSION.post(f"{API_URL}?key={GEMINI_KEY}", json=body, timeout=40)
         r.raise_for_status()  # Raise error for bad status codes
         data = r.json()
 
@@ -80,11 +172,17 @@ Return ONLY JSON:
                 "fallback_mode": True
             }
 
-        # Gemini may wrap JSON in Markdown fences; strip them before parsing.
+        # responseMimeType should yield bare JSON; decoding from the first "{"
+        # still tolerates Markdown fences or prose around it without copying.
         text = data["candidates"][0]["content"]["parts"][0]["text"]
-        text = text.replace("```json", "").replace("```", "").strip()
-
-        return json.loads(text)
+        start = text.find("{")
+        if start < 0:
+            raise ValueError("Gemini response contains no JSON object")
+        result, _ = _JSON_DECODER.raw_decode(text, start)
+        if isinstance(result, dict) and "error" not in result:
+            # Only real verdicts are cached; errors must stay retryable.
+            _cache_put(cache_key, result)
+        return result
 
     except requests.exceptions.HTTPError as e:
         # Handle HTTP errors (like 429 quota exceeded)
@@ -0,0 +1,21 @@
+"""Gunicorn settings for the similarity/verification service (Linux deployments).
+
+Run with:
+    gunicorn -c gunicorn.conf.py app_for_confident_check:app
+
+Module overview:
+- Preloads the app in the master so the spaCy/SBERT models are loaded once and
+  shared copy-on-write by every worker instead of once per worker.
+- Uses threaded workers: model inference and ffmpeg/Whisper work release the
+  GIL, and the request path already fans out to in-process thread pools.
+"""
+
+import os
+
+bind = os.getenv("SIMILARITY_BIND", "0.0.0.0:5000")
+preload_app = True
+workers = int(os.getenv("SIMILARITY_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("SIMILARITY_THREADS", "8"))
+# A verification request transcribes several videos and waits on Gemini.
+timeout = int(os.getenv("SIMILARITY_TIMEOUT", "300"))
@@ -13,10 +13,14 @@ os.environ.setdefault("TRANSFORMERS_NO_TF", "1")
 os.environ.setdefault("USE_FLAX", "0")
 
 import spacy
+import math
 import numpy as np
 import re
-from sentence_transformers import SentenceTransformer, util
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+import string
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from sentence_transformers import SentenceTransformer
 
 # Constants for text processing
 NEGATIONS = {
@@ -42,6 +46,53 @@ COLOR_WORDS = {
     "navy", "cyan", "teal"
 }
 
+# Founder answers are authored once and compared against many owner attempts,
+# so their embeddings are kept in a bounded LRU; owner text is not cached.
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("SBERT_EMBED_CACHE_MAX_ENTRIES", "10000"))
+# Keyword sets (one spaCy tagger/lemmatizer pass each) keyed by normalized
+# text; founder answers repeat across attempts and questions.
+KEYWORD_CACHE_MAX_ENTRIES = int(os.getenv("NLP_KEYWORD_CACHE_MAX_ENTRIES", "4096"))
+
+# SBERT inference backend. "onnx" runs the model's int8 dynamically quantized
+# ONNX export through onnxruntime (needs `optimum[onnxruntime]`), which is
+# markedly cheaper on CPU than the FP32 torch model; "torch" keeps the default.
+# Hosts without AVX-512 VNNI should point SBERT_ONNX_FILE at
+# onnx/model_quint8_avx2.onnx instead.
+SBERT_MODEL_NAME = "all-mpnet-base-v2"
+SBERT_BACKEND = os.getenv("SBERT_BACKEND", "torch").strip().lower()
+SBERT_ONNX_FILE = os.getenv("SBERT_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+# spaCy pipeline for tagging, lemmas and static word vectors. en_core_web_md
+# has the same 300-d vectors pruned to 20k rows at a fraction of the RAM;
+# en_core_web_sm has no static vectors, so spacy_sim would always score 0.
+SPACY_MODEL_NAME = os.getenv("SPACY_MODEL", "en_core_web_lg")
+# Intra-op threads for torch inference (SBERT on the torch backend). Half the
+# cores leaves room for Whisper and the request thread pools; 0 keeps torch's
+# own default.
+TORCH_NUM_THREADS = int(os.getenv("SBERT_TORCH_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Polarity words for the contradiction check: phrase -> (concept, polarity).
+# Founder and owner contradict when they use the same concept with opposite
+# polarity (e.g. "is" vs "isnt", "yes" vs "no").
+POLARITY_TERMS = {
+    "yes": ("yes_no", 1), "no": ("yes_no", -1),
+    "true": ("true_false", 1), "false": ("true_false", -1),
+    "correct": ("correct", 1), "incorrect": ("correct", -1),
+    "right": ("right_wrong", 1), "wrong": ("right_wrong", -1),
+    "positive": ("positive_negative", 1), "negative": ("positive_negative", -1),
+    "have": ("have", 1), "dont have": ("have", -1), "don't have": ("have", -1), "do not have": ("have", -1),
+    "has": ("has", 1), "doesnt have": ("has", -1), "doesn't have": ("has", -1), "does not have": ("has", -1),
+    "is": ("is", 1), "isnt": ("is", -1), "isn't": ("is", -1), "is not": ("is", -1),
+    "are": ("are", 1), "arent": ("are", -1), "aren't": ("are", -1), "are not": ("are", -1),
+    "was": ("was", 1), "wasnt": ("was", -1), "wasn't": ("was", -1), "was not": ("was", -1),
+    "were": ("were", 1), "werent": ("were", -1), "weren't": ("were", -1), "were not": ("were", -1),
+}
+# One alternation, longest phrases first, so "is not" is consumed as a
+# negation rather than also counting as "is"; word boundaries stop "is"
+# from matching inside "this".
+_POLARITY_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(POLARITY_TERMS, key=len, reverse=True))) + r")\b"
+)
+
 QUESTION_TYPE_CONFIG = {
     "boolean": {"weight": 1.15, "match_floor": 0.95, "mismatch_cap": 0.05},
     "numeric": {"weight": 1.20, "match_floor": 0.95, "mismatch_cap": 0.12},
@@ -51,35 +102,155 @@ QUESTION_TYPE_CONFIG = {
     "descriptive": {"weight": 1.00, "match_floor": None, "mismatch_cap": None},
 }
 
-def py(v):
-    """Convert numpy / scalar types to native Python types."""
+# Per-pair similarity features, in fuse_score() order.
+FEATURE_NAMES = ("tfidf", "char_ngram", "jaccard", "sbert", "spacy")
+
+# Lexical features compare two short keyword strings at a time, so they are
+# computed from token / n-gram Counters directly instead of fitting a
+# scikit-learn vectorizer per pair. Tokenization matches the sklearn defaults
+# the scores were tuned with (TfidfVectorizer words, char 3-6 grams).
+_WORD_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+_WHITESPACE_RUN_RE = re.compile(r"\s\s+")
+CHAR_NGRAM_RANGE = (3, 6)
+# Smoothed IDF of a two-document corpus, ln((1 + 2) / (1 + df)) + 1: 1.0 for a
+# term both answers use, ln(1.5) + 1 for a term only one side uses.
+_TWO_DOC_UNIQUE_IDF = math.log(1.5) + 1.0
+
+
+class _CharFilter(dict):
+    """
+    str.translate() table that keeps `keep` characters (and whitespace, if
+    asked) and maps every other code point to `replacement`. Decisions for
+    code points outside the prebuilt ASCII range are memoized on first sight.
+    """
+
+    def __init__(self, keep, replacement, keep_whitespace=False):
+        super().__init__()
+        self._keep = frozenset(keep)
+        self._replacement = replacement
+        self._keep_whitespace = keep_whitespace
+        for code in range(128):
+            self[code] = self.__missing__(code)
+
+    def __missing__(self, code):
+        ch = chr(code)
+        value = code if ch in self._keep or (self._keep_whitespace and ch.isspace()) else self._replacement
+        self[code] = value
+        return value
+
+
+# normalize(): everything but [a-z0-9'] and whitespace becomes a space.
+_NORMALIZE_TABLE = _CharFilter(string.ascii_lowercase + string.digits + "'", ord(" "), keep_whitespace=True)
+# Keyword lemmas: drop everything but [a-z0-9_-].
+_LEMMA_TABLE = _CharFilter(string.ascii_lowercase + string.digits + "_-", None)
+
+
+@lru_cache(maxsize=4096)
+def _char_ngrams(text, min_n=CHAR_NGRAM_RANGE[0], max_n=CHAR_NGRAM_RANGE[1]):
+    """
+    Counter of character n-grams, as CountVectorizer(analyzer="char") builds
+    them. Memoized because founder keyword strings recur across attempts;
+    callers must treat the returned Counter as read-only.
+    """
+    text = _WHITESPACE_RUN_RE.sub(" ", text.lower())
+    size = len(text)
+    return Counter(
+        text[i:i + n]
+        for n in range(min_n, min(max_n, size) + 1)
+        for i in range(size - n + 1)
+    )
+
+
+def _uniform_features(score):
+    """Feature dict for rule verdicts, which report one score for every feature."""
+    return dict.fromkeys(FEATURE_NAMES, score)
+
+
+@lru_cache(maxsize=4096)
+def _keyword_text(keywords):
+    """Sorted, space-joined form of a keyword frozenset, built once per set."""
+    return " ".join(sorted(keywords))
+
+
+def _counter_cosine(ca, cb, weight=None):
+    """Cosine similarity of two sparse count vectors, optionally term-weighted."""
+    if not ca or not cb:
+        return 0.0
+    shared = ca.keys() & cb.keys()
+    if weight is None:
+        dot = sum(ca[t] * cb[t] for t in shared)
+        na = math.sqrt(sum(c * c for c in ca.values()))
+        nb = math.sqrt(sum(c * c for c in cb.values()))
+    else:
+        dot = sum(ca[t] * cb[t] * weight(t, True) ** 2 for t in shared)
+        na = math.sqrt(sum((c * weight(t, t in shared)) ** 2 for t, c in ca.items()))
+        nb = math.sqrt(sum((c * weight(t, t in shared)) ** 2 for t, c in cb.items()))
+    denom = na * nb
+    return 0.0 if denom == 0 else dot / denom
+
+
+def configure_torch_threads(num_threads):
+    """Set torch's intra-op (and, if still possible, inter-op) thread counts."""
+    if not num_threads or num_threads <= 0:
+        return
     try:
-        # numpy scalars (.item()) and other objects
-        if hasattr(v, "item"):
-            return v.item()
-        # numpy arrays -> list
-        if isinstance(v, (np.ndarray,)):
-            return v.tolist()
-    except Exception:
-        pass
-    # fallback for builtin numerics/bools/None/str
-    return v
+        import torch
+
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:
+            # Only allowed before torch runs any parallel work in this process.
+            pass
+    except Exception as e:
+        print(f"Could not configure torch threads: {e}")
+
+def load_sbert():
+    """Load the SentenceTransformer on the configured backend, falling back to torch."""
+    if SBERT_BACKEND == "onnx":
+        try:
+            import onnxruntime as ort
+
+            session_options = ort.SessionOptions()
+            session_options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+            model = SentenceTransformer(
+                SBERT_MODEL_NAME,
+                backend="onnx",
+                model_kwargs={
+                    "file_name": SBERT_ONNX_FILE,
+                    "provider": "CPUExecutionProvider",
+                    "session_options": session_options,
+                },
+            )
+            print(f"SBERT loaded with ONNX Runtime ({SBERT_ONNX_FILE})")
+            return model
+        except Exception as e:
+            print(f"SBERT ONNX backend unavailable ({e}); using torch.")
+    return SentenceTransformer(SBERT_MODEL_NAME)
 
 class LocalNLP:
     """Local NLP scorer for comparing one expected answer with one spoken answer."""
 
-    def __init__(self):
-        """Load local NLP models and vectorizers once for repeated scoring."""
-        # Load spaCy model for tokenization, POS tagging, and vector similarity
-        self.nlp = spacy.load("en_core_web_lg")
+    def __init__(self, threads=None):
+        """
+        Load local NLP models and vectorizers once for repeated scoring.
+        `threads` overrides SBERT_TORCH_THREADS; pass 0 to leave torch's
+        thread settings alone (e.g. when the caller manages its own pool).
+        """
+        configure_torch_threads(TORCH_NUM_THREADS if threads is None else threads)
+        # Load spaCy model for tokenization, POS tagging, and vector similarity.
+        # Keyword extraction only reads POS, lemmas and stop-word flags, so the
+        # dependency parser and NER are never loaded. The attribute ruler stays:
+        # it maps tags to the POS values the lemmatizer and keyword filter use.
+        self.nlp = spacy.load(SPACY_MODEL_NAME, exclude=["parser", "ner"])
         # Load SentenceTransformer model for semantic embeddings
-        self.sbert = SentenceTransformer("all-mpnet-base-v2")
-        # Initialize TF-IDF vectorizer for keyword-based similarity
-        self.tfidf = TfidfVectorizer()
-        # Initialize character n-gram vectorizer for spelling/phrase similarity
-        self.char_vec = CountVectorizer(analyzer="char", ngram_range=(3, 6))
-        # Cache for embeddings to avoid recomputation
-        self.cache_emb = {}
+        self.sbert = load_sbert()
+        # LRU cache of founder-side embeddings; requests score concurrently.
+        self.cache_emb = OrderedDict()
+        self._emb_lock = threading.Lock()
+        # LRU cache of keyword sets by normalized text.
+        self.cache_kw = OrderedDict()
+        self._kw_lock = threading.Lock()
 
     # -----------------------------
     # BASIC TEXT UTILS
@@ -89,10 +260,9 @@ class LocalNLP:
         """Lowercase text and remove noisy characters before comparison."""
         if not text:
             return ""
-        t = text.lower()
-        t = re.sub(r"[^a-z0-9\s']", " ", t)
-        t = re.sub(r"\s+", " ", t).strip()
-        return t
+        # Translate-then-split is the C-level equivalent of replacing
+        # [^a-z0-9\s'] with spaces and collapsing whitespace runs.
+        return " ".join(text.lower().translate(_NORMALIZE_TABLE).split())
 
     def tokenize(self, text):
         """Run spaCy tokenization on normalized text."""
@@ -102,8 +272,49 @@ class LocalNLP:
         """
         Dynamically extract meaningful keywords from text
         (nouns, verbs, adjectives, proper nouns + negations)
+
+        Results are cached by normalized text and returned as frozensets.
+        """
+        return self._keywords_for_norm(self.normalize(text))
+
+    def _keywords_for_norm(self, norm):
+        """extract_keywords() for text that has already been normalized."""
+        keywords = self._cached_keywords(norm)
+        if keywords is None:
+            keywords = self._keywords_from_doc(self.nlp(norm))
+            self._remember_keywords(norm, keywords)
+        return keywords
+
+    def prefetch_keywords(self, texts):
+        """
+        Fill the keyword cache for all uncached texts with one nlp.pipe() pass,
+        so the tagger/lemmatizer runs batched instead of once per string.
         """
-        doc = self.tokenize(text)
+        pending = [
+            norm for norm in dict.fromkeys(self.normalize(t) for t in texts)
+            if norm and self._cached_keywords(norm) is None
+        ]
+        for norm, doc in zip(pending, self.nlp.pipe(pending, batch_size=32)):
+            self._remember_keywords(norm, self._keywords_from_doc(doc))
+
+    def _cached_keywords(self, norm):
+        """Return the cached keyword set for normalized text (refreshing its LRU slot) or None."""
+        with self._kw_lock:
+            keywords = self.cache_kw.get(norm)
+            if keywords is not None:
+                self.cache_kw.move_to_end(norm)
+            return keywords
+
+    def _remember_keywords(self, norm, keywords):
+        """Store a keyword set, evicting the least recently used entries."""
+        with self._kw_lock:
+            self.cache_kw[norm] = keywords
+            self.cache_kw.move_to_end(norm)
+            while len(self.cache_kw) > KEYWORD_CACHE_MAX_ENTRIES:
+                self.cache_kw.popitem(last=False)
+
+    def _keywords_from_doc(self, doc):
+        """Keyword filter over an analyzed spaCy Doc; see extract_keywords()."""
         keywords = set()
 
         for t in doc:
@@ -121,16 +332,28 @@ class LocalNLP:
 
             # Keep nouns, verbs, adjectives, proper nouns
             if t.pos_ in {"NOUN", "VERB", "ADJ", "PROPN"}:
-                kw = re.sub(r"[^a-z0-9_-]", "", t.lemma_.lower())
+                kw = t.lemma_.lower().translate(_LEMMA_TABLE)
                 if kw:
                     keywords.add(kw)
 
-        return keywords
+        return frozenset(keywords)
 
     # -----------------------------
     # KEYWORD COVERAGE CHECK
     # -----------------------------
 
+    def polarities(self, norm_text):
+        """Set of (concept, +1/-1) polarity words found in normalized text."""
+        return {POLARITY_TERMS[m] for m in _POLARITY_RE.findall(norm_text)}
+
+    def is_opposite_answer(self, founder_norm, owner_norm):
+        """True when both answers use the same polarity concept with opposite signs."""
+        founder_polarity = self.polarities(founder_norm)
+        if not founder_polarity:
+            return False
+        owner_polarity = self.polarities(owner_norm)
+        return any((concept, -sign) in owner_polarity for concept, sign in founder_polarity)
+
     def keyword_coverage(self, founder_kw, owner_kw):
         """
         Measures how much of the founder keywords
@@ -260,72 +483,151 @@ class LocalNLP:
     # SIMILARITY METHODS
     # -----------------------------
 
-    def _cosine_sparse(self, X):
-        """Calculate cosine similarity for two sparse vector rows."""
-        a = X[0].toarray().ravel()
-        b = X[1].toarray().ravel()
-        denom = np.linalg.norm(a) * np.linalg.norm(b)
-        return 0.0 if denom == 0 else float(np.dot(a, b) / denom)
-
     def tfidf_sim(self, A, B):
         """Compare keyword sets using TF-IDF cosine similarity."""
         if not A or not B:
             return 0.0
-        X = self.tfidf.fit_transform([" ".join(A), " ".join(B)])
-        return float(np.clip(self._cosine_sparse(X), 0, 1))
+        ca = Counter(_WORD_TOKEN_RE.findall(" ".join(A).lower()))
+        cb = Counter(_WORD_TOKEN_RE.findall(" ".join(B).lower()))
+        sim = _counter_cosine(ca, cb, lambda term, shared: 1.0 if shared else _TWO_DOC_UNIQUE_IDF)
+        return float(np.clip(sim, 0, 1))
 
     def char_ngram_sim(self, a, b):
         """Compare text using character n-grams to catch spelling/phrase similarity."""
         if not a or not b:
             return 0.0
-        X = self.char_vec.fit_transform([a, b])
-        return float(np.clip(self._cosine_sparse(X), 0, 1))
+        return float(np.clip(_counter_cosine(_char_ngrams(a), _char_ngrams(b)), 0, 1))
 
     def jaccard(self, A, B):
         """Calculate set-overlap similarity between founder and owner keywords."""
-        return 0.0 if not A or not B else float(len(A & B) / len(A | B))
+        if not A or not B:
+            return 0.0
+        # |A | B| = |A| + |B| - |A & B|; only the intersection set is built.
+        shared = len(A & B)
+        return float(shared / (len(A) + len(B) - shared))
+
+    def _cached_embedding(self, text):
+        """Return the cached embedding for text (refreshing its LRU slot) or None."""
+        with self._emb_lock:
+            emb = self.cache_emb.get(text)
+            if emb is not None:
+                self.cache_emb.move_to_end(text)
+            return emb
+
+    def _remember_embedding(self, text, emb):
+        """Store an embedding, evicting the least recently used entries."""
+        with self._emb_lock:
+            self.cache_emb[text] = emb
+            self.cache_emb.move_to_end(text)
+            while len(self.cache_emb) > EMBED_CACHE_MAX_ENTRIES:
+                self.cache_emb.popitem(last=False)
 
     def embed(self, text):
-        """Return a cached SentenceTransformer embedding for the text."""
-        # Check if embedding is already cached
-        if text in self.cache_emb:
-            return self.cache_emb[text]
-        # Compute embedding using SentenceTransformer
-        emb = self.sbert.encode(text, convert_to_numpy=True)
-        # Cache the embedding for future use
-        self.cache_emb[text] = emb
+        """Return a cached, unit-normalized SentenceTransformer embedding for (founder) text."""
+        emb = self._cached_embedding(text)
+        if emb is None:
+            emb = self.sbert.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+            self._remember_embedding(text, emb)
         return emb
 
-    def sbert_sim(self, a, b):
-        """Compare answer meaning using SentenceTransformer embeddings."""
+    def embed_batch(self, founder_texts, owner_texts):
+        """
+        Embed every uncached founder text and every owner text in one encode()
+        call. Founder embeddings go into the LRU cache; owner embeddings, which
+        rarely repeat, are returned as a {text: embedding} dict instead.
+        """
+        founder_pending = [
+            t for t in dict.fromkeys(founder_texts) if t and self._cached_embedding(t) is None
+        ]
+        owner_unique = [t for t in dict.fromkeys(owner_texts) if t]
+        texts = list(dict.fromkeys(founder_pending + owner_unique))
+        if not texts:
+            return {}
+        # A single call lets encode() length-sort the founder and owner texts
+        # together, so short owner answers are not padded up to the longest
+        # founder answer of a separate batch (and vice versa).
+        embs = dict(zip(
+            texts,
+            self.sbert.encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True),
+        ))
+        for text in founder_pending:
+            self._remember_embedding(text, embs[text])
+        return {t: embs[t] for t in owner_unique}
+
+    def sbert_sim(self, a, b, b_emb=None):
+        """
+        Compare answer meaning using SentenceTransformer embeddings.
+        `a` is the founder side (cached); `b` is the owner side, embedded fresh
+        unless a precomputed `b_emb` is supplied.
+        """
         if not a or not b:
             return 0.0
-        sim = float(util.cos_sim(self.embed(a), self.embed(b)))
+        if b_emb is None:
+            # One forward pass for the owner text and a cache-missed founder text.
+            b_emb = self.embed_batch([a], [b])[b]
+        # Embeddings are stored unit-length, so cosine is a plain dot product.
+        sim = float(np.dot(self.embed(a), b_emb))
         return float(np.clip((sim + 1) / 2, 0, 1))
 
-    def spacy_sim(self, a, b):
-        """Compare answer meaning using spaCy vector similarity."""
+    def spacy_vector(self, text):
+        """
+        Unit-length spaCy document vector for text (zeros if it has none).
+        Doc.vector only averages the static word vectors, so the text is
+        tokenized without running the tagger or lemmatizer.
+        """
+        vec = self.nlp.make_doc(text).vector
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def spacy_vectors(self, texts):
+        """spacy_vector() for many texts, computing each distinct string once."""
+        return {t: self.spacy_vector(t) for t in dict.fromkeys(texts) if t}
+
+    def spacy_sim(self, a, b, vectors=None):
+        """
+        Compare answer meaning using spaCy vector similarity.
+        `vectors` may map a/b to vectors precomputed by spacy_vectors().
+        """
         if not a or not b:
             return 0.0
-        va, vb = self.nlp(a).vector, self.nlp(b).vector
-        denom = np.linalg.norm(va) * np.linalg.norm(vb)
-        return 0.0 if denom == 0 else float(np.clip(np.dot(va, vb) / denom, 0, 1))
+        vectors = vectors or {}
+        va = vectors[a] if a in vectors else self.spacy_vector(a)
+        vb = vectors[b] if b in vectors else self.spacy_vector(b)
+        return float(np.clip(np.dot(va, vb), 0, 1))
 
     # -----------------------------
     # FEATURE + FUSION
     # -----------------------------
 
-    def compute_features(self, founder, owner, fk, ok):
-        """Calculate all local similarity features for one answer pair."""
-        sf = " ".join(sorted(fk))
-        so = " ".join(sorted(ok))
+    def compute_features(self, founder, owner, fk, ok, owner_emb=None, precomputed=None):
+        """
+        Calculate all local similarity features for one answer pair.
+        `precomputed` carries batch results from score_pairs_batch() (the
+        request's spaCy vectors); anything missing is computed here.
+        """
+        sf = _keyword_text(frozenset(fk))
+        so = _keyword_text(frozenset(ok))
+        precomputed = precomputed or {}
+
+        if fk == ok:
+            # Identical keyword sets give identical strings, so every lexical
+            # feature and SBERT (same text, same embedding) are exactly 1.0;
+            # skip the encoder. spaCy stays computed: an all-OOV text has a
+            # zero vector and scores 0 there.
+            return {
+                "tfidf": 1.0,
+                "char_ngram": 1.0,
+                "jaccard": 1.0,
+                "sbert": 1.0,
+                "spacy": float(self.spacy_sim(sf, so, precomputed.get("spacy_vectors"))),
+            }
 
         return {
             "tfidf": float(self.tfidf_sim(fk, ok)),
             "char_ngram": float(self.char_ngram_sim(sf, so)),
             "jaccard": float(self.jaccard(fk, ok)),
-            "sbert": float(self.sbert_sim(sf, so)),
-            "spacy": float(self.spacy_sim(sf, so)),
+            "sbert": float(self.sbert_sim(sf, so, owner_emb)),
+            "spacy": float(self.spacy_sim(sf, so, precomputed.get("spacy_vectors"))),
         }
 
     def fuse_score(self, f, coverage):
@@ -347,6 +649,65 @@ class LocalNLP:
 
     def score_pair(self, founder, owner, question_text="", question_type=None, question_weight=None):
         """Return the final local similarity score and reasoning for one question."""
+        early, ctx = self._prepare_pair(founder, owner, question_text, question_type, question_weight)
+        if early is not None:
+            return early
+        return self._finish_pair(founder, owner, ctx)
+
+    def score_many(self, founder, owners, question_text="", question_type=None, question_weight=None):
+        """
+        Score one founder answer against many owner answers, in order.
+        The question type is resolved once; founder keywords, keyword text,
+        embedding and spaCy vector are computed once and shared by every pair.
+        """
+        resolved_question_type = question_type or self.infer_question_type(question_text, founder)
+        return self.score_pairs_batch([
+            (founder, owner, question_text, resolved_question_type, question_weight)
+            for owner in owners
+        ])
+
+    def prepare_pairs(self, pairs):
+        """
+        Run only the cheap rule checks for many pairs. The result can be passed
+        to score_pairs_batch(), letting callers inspect early verdicts (empty,
+        contradictory, generic answers) before any embedding work is done.
+        """
+        # Most pairs reach keyword extraction, so tag every answer in one batch.
+        self.prefetch_keywords(text for pair in pairs for text in pair[:2] if text)
+        return [self._prepare_pair(*pair) for pair in pairs]
+
+    def score_pairs_batch(self, pairs, prepared=None):
+        """
+        Score many (founder, owner, question_text, question_type, question_weight)
+        tuples, encoding every SBERT input for the whole batch in one call.
+        Results are identical to calling score_pair() on each tuple in order.
+        """
+        if prepared is None:
+            prepared = self.prepare_pairs(pairs)
+        # Only pairs that reach feature fusion need embeddings; early exits
+        # (exact/opposite/subset/generic/low-coverage) never touch SBERT.
+        pending = [ctx for early, ctx in prepared if early is None]
+        # Pairs with identical keyword sets never reach the encoder either.
+        to_embed = [ctx for ctx in pending if ctx["founder_kw"] != ctx["owner_kw"]]
+        owner_embs = self.embed_batch(
+            [ctx["founder_kw_text"] for ctx in to_embed],
+            [ctx["owner_kw_text"] for ctx in to_embed],
+        )
+        # Repeated answers (the same founder text under two questions, an owner
+        # echoing the founder) are vectorized once per request.
+        spacy_vecs = self.spacy_vectors(
+            [ctx["founder_kw_text"] for ctx in pending] + [ctx["owner_kw_text"] for ctx in pending]
+        )
+        for ctx in pending:
+            ctx["owner_emb"] = owner_embs.get(ctx["owner_kw_text"])
+            ctx["precomputed"] = {"spacy_vectors": spacy_vecs}
+        return [
+            early if early is not None else self._finish_pair(pair[0], pair[1], ctx)
+            for pair, (early, ctx) in zip(pairs, prepared)
+        ]
+
+    def _prepare_pair(self, founder, owner, question_text="", question_type=None, question_weight=None):
+        """Run the cheap rule checks; return (final_result, None) or (None, feature context)."""
         resolved_question_type = question_type or self.infer_question_type(question_text, founder)
         config = QUESTION_TYPE_CONFIG.get(resolved_question_type, QUESTION_TYPE_CONFIG["descriptive"])
         resolved_question_weight = float(question_weight) if question_weight is not None else float(config["weight"])
@@ -359,7 +720,7 @@ class LocalNLP:
                 "question_type": resolved_question_type,
                 "question_weight": resolved_question_weight,
                 "type_adjustment_reason": None,
-            }
+            }, None
 
         # Normalize for comparison
         founder_norm = self.normalize(founder)
@@ -374,48 +735,20 @@ class LocalNLP:
                 "question_type": resolved_question_type,
                 "question_weight": resolved_question_weight,
                 "type_adjustment_reason": "exact_match",
-                "features": {
-                    "tfidf": 1.0,
-                    "char_ngram": 1.0,
-                    "jaccard": 1.0,
-                    "sbert": 1.0,
-                    "spacy": 1.0
-                }
-            }
+                "features": _uniform_features(1.0)
+            }, None
 
         # Check for opposite/negation answers
-        opposite_pairs = [
-            ("yes", "no"), ("no", "yes"),
-            ("true", "false"), ("false", "true"),
-            ("correct", "incorrect"), ("incorrect", "correct"),
-            ("right", "wrong"), ("wrong", "right"),
-            ("positive", "negative"), ("negative", "positive"),
-            ("have", "dont have"), ("have", "do not have"),
-            ("has", "doesnt have"), ("has", "does not have"),
-            ("is", "isnt"), ("is", "is not"),
-            ("are", "arent"), ("are", "are not"),
-            ("was", "wasnt"), ("was", "was not"),
-            ("were", "werent"), ("were", "were not")
-        ]
-        
-        for pair1, pair2 in opposite_pairs:
-            if (pair1 in founder_norm and pair2 in owner_norm) or \
-               (pair2 in founder_norm and pair1 in owner_norm):
-                return {
-                    "fused": 0.0,
-                    "coverage": 0.0,
-                    "reason": "opposite_answer",
-                    "question_type": resolved_question_type,
-                    "question_weight": resolved_question_weight,
-                    "type_adjustment_reason": "opposite_answer",
-                    "features": {
-                        "tfidf": 0.0,
-                        "char_ngram": 0.0,
-                        "jaccard": 0.0,
-                        "sbert": 0.0,
-                        "spacy": 0.0
-                    }
-                }
+        if self.is_opposite_answer(founder_norm, owner_norm):
+            return {
+                "fused": 0.0,
+                "coverage": 0.0,
+                "reason": "opposite_answer",
+                "question_type": resolved_question_type,
+                "question_weight": resolved_question_weight,
+                "type_adjustment_reason": "opposite_answer",
+                "features": _uniform_features(0.0)
+            }, None
 
         # Check for substring/word subset matches
         founder_words = set(founder_norm.split())
@@ -431,14 +764,8 @@ class LocalNLP:
                     "question_type": resolved_question_type,
                     "question_weight": resolved_question_weight,
                     "type_adjustment_reason": "word_subset_match",
-                    "features": {
-                        "tfidf": substring_score,
-                        "char_ngram": substring_score,
-                        "jaccard": substring_score,
-                        "sbert": substring_score,
-                        "spacy": substring_score
-                    }
-                }
+                    "features": _uniform_features(substring_score)
+                }, None
             
             common_words = founder_words & owner_words
             if common_words:
@@ -452,18 +779,12 @@ class LocalNLP:
                         "question_type": resolved_question_type,
                         "question_weight": resolved_question_weight,
                         "type_adjustment_reason": "high_word_overlap",
-                        "features": {
-                            "tfidf": word_overlap_score,
-                            "char_ngram": word_overlap_score,
-                            "jaccard": word_overlap_score,
-                            "sbert": word_overlap_score,
-                            "spacy": word_overlap_score
-                        }
-                    }
-
-        # Extract keywords
-        founder_kw = self.extract_keywords(founder)
-        owner_kw = self.extract_keywords(owner)
+                        "features": _uniform_features(word_overlap_score)
+                    }, None
+
+        # Extract keywords (reusing the normalized text from above)
+        founder_kw = self._keywords_for_norm(founder_norm)
+        owner_kw = self._keywords_for_norm(owner_norm)
 
         # Handle generic answers
         if self.is_generic_answer(owner_kw):
@@ -473,7 +794,7 @@ class LocalNLP:
                 "question_type": resolved_question_type,
                 "question_weight": resolved_question_weight,
                 "type_adjustment_reason": None,
-            }
+            }, None
 
         # Check keyword coverage
         coverage = self.keyword_coverage(founder_kw, owner_kw)
@@ -487,13 +808,31 @@ class LocalNLP:
                 "question_type": resolved_question_type,
                 "question_weight": resolved_question_weight,
                 "type_adjustment_reason": None,
-            }
+            }, None
+
+        return None, {
+            "question_type": resolved_question_type,
+            "question_weight": resolved_question_weight,
+            "founder_kw": founder_kw,
+            "owner_kw": owner_kw,
+            "founder_kw_text": _keyword_text(founder_kw),
+            "owner_kw_text": _keyword_text(owner_kw),
+            "coverage": coverage,
+        }
+
+    def _finish_pair(self, founder, owner, ctx):
+        """Compute similarity features for a pair that passed the rule checks."""
+        resolved_question_type = ctx["question_type"]
+        resolved_question_weight = ctx["question_weight"]
+        coverage = ctx["coverage"]
 
         # Compute similarity features
-        feats = self.compute_features(founder, owner, founder_kw, owner_kw)
+        feats = self.compute_features(
+            founder, owner, ctx["founder_kw"], ctx["owner_kw"], ctx.get("owner_emb"), ctx.get("precomputed")
+        )
         fused = self.fuse_score(feats, coverage)
         fused, type_reason = self.apply_question_type_rules(
-            float(py(fused)),
+            fused,
             resolved_question_type,
             founder,
             owner,
@@ -501,9 +840,11 @@ class LocalNLP:
 
         # Return final result
         return {
-            "features": {k: py(v) for k, v in feats.items()},
-            "fused": float(py(fused)),
-            "coverage": float(py(coverage)),
+            # compute_features() and the fusion/rule steps already yield
+            # native floats, so the result needs no numpy conversion pass.
+            "features": feats,
+            "fused": fused,
+            "coverage": coverage,
             "reason": "ok",
             "question_type": resolved_question_type,
             "question_weight": resolved_question_weight,
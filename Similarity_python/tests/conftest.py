@@ -0,0 +1,89 @@
+import sys
+from contextlib import contextmanager
+from types import ModuleType
+from unittest.mock import MagicMock, Mock
+
+
+def _build_app_dependency_stubs() -> dict:
+    # The verification app loads spaCy/SBERT, Whisper, MongoDB and Flask at
+    # import time; the policy helpers under test need none of them.
+    flask = ModuleType("flask")
+    flask.Flask = MagicMock()
+    flask.request = Mock()
+    flask.jsonify = Mock()
+
+    flask_json = ModuleType("flask.json")
+    provider = ModuleType("flask.json.provider")
+    provider.DefaultJSONProvider = type("DefaultJSONProvider", (), {"__init__": lambda self, app: None})
+
+    pymongo = ModuleType("pymongo")
+    pymongo.MongoClient = MagicMock()
+
+    bson = ModuleType("bson")
+    bson.ObjectId = Mock()
+
+    video = ModuleType("video_to_text")
+    video.extract_text = Mock()
+
+    audio = ModuleType("audio_confidence")
+    audio.analyze_audio_confidence = Mock()
+
+    local_nlp = ModuleType("local_nlp_checker")
+    local_nlp.LocalNLP = Mock()
+
+    gemini = ModuleType("gemini_batch_checker")
+    gemini.gemini_batch_similarity = Mock()
+
+    modules = (flask, flask_json, provider, pymongo, bson, video, audio, local_nlp, gemini)
+    return {module.__name__: module for module in modules}
+
+
+def _build_nlp_dependency_stubs() -> dict:
+    # local_nlp_checker imports spaCy and sentence-transformers at module
+    # level; the lexical and rule helpers under test use neither.
+    spacy = ModuleType("spacy")
+    spacy.load = Mock()
+
+    sentence_transformers = ModuleType("sentence_transformers")
+    sentence_transformers.SentenceTransformer = Mock()
+
+    return {module.__name__: module for module in (spacy, sentence_transformers)}
+
+
+@contextmanager
+def _stubbed_modules(stubs: dict):
+    """Install stub modules for the duration of the block, then restore the module table."""
+    originals = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    try:
+        yield stubs
+    finally:
+        for name, module in originals.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+@contextmanager
+def stub_app_dependencies():
+    """
+    Swap the app's heavy dependencies for lightweight stubs while it is
+    imported, then restore the module table.
+    """
+    with _stubbed_modules(_build_app_dependency_stubs()) as stubs:
+        yield stubs
+
+
+def load_app_module():
+    """Import app_for_confident_check (under the dependency stubs) on first use."""
+    with stub_app_dependencies():
+        import app_for_confident_check as app_module
+    return app_module
+
+
+def load_nlp_module():
+    """Import the real local_nlp_checker with spaCy and SBERT stubbed out."""
+    with _stubbed_modules(_build_nlp_dependency_stubs()):
+        import local_nlp_checker as nlp_module
+    return nlp_module
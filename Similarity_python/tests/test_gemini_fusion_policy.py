@@ -0,0 +1,51 @@
+import math
+import unittest
+from unittest.mock import patch
+
+from conftest import load_app_module
+
+# Founder "it is broken" vs owner "it is not broken": the polarity check sees
+# contradicting answers and returns a 0.0 rule verdict, the low local score
+# that may short-circuit Gemini.
+OPPOSITE_PAIR = ({"fused": 0.0, "reason": "opposite_answer"}, None)
+SCORED_PAIR = (None, {"coverage": 1.0})
+
+
+class TestShouldSkipGemini(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app_module()
+
+    def test_missing_transcript_skips_gemini(self):
+        self.assertTrue(self.app.should_skip_gemini(1, [SCORED_PAIR]))
+
+    def test_low_local_verdict_still_calls_gemini_by_default(self):
+        with patch.object(self.app, "EARLY_REJECT_LOCAL_ENABLED", False):
+            self.assertFalse(self.app.should_skip_gemini(0, [OPPOSITE_PAIR, SCORED_PAIR]))
+
+    def test_low_local_verdict_skips_gemini_when_enabled(self):
+        with patch.object(self.app, "EARLY_REJECT_LOCAL_ENABLED", True):
+            self.assertTrue(self.app.should_skip_gemini(0, [OPPOSITE_PAIR, SCORED_PAIR]))
+            self.assertFalse(self.app.should_skip_gemini(0, [SCORED_PAIR]))
+
+
+class TestFuseLocalGemini(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app_module()
+
+    def test_confident_gemini_overrides_local_opposite_verdict(self):
+        fused = self.app.fuse_local_gemini([0.0], [0.92])
+        self.assertAlmostEqual(fused[0], 0.92)
+
+    def test_unconfident_gemini_is_averaged_with_local(self):
+        fused = self.app.fuse_local_gemini([0.4], [0.6])
+        self.assertAlmostEqual(fused[0], 0.5)
+
+    def test_missing_gemini_score_keeps_local(self):
+        fused = self.app.fuse_local_gemini([0.3, 0.0], [math.nan, 0.85])
+        self.assertEqual(fused.tolist(), [0.3, 0.85])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import math
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from conftest import load_nlp_module
+
+# Keyword-set pairs shaped like real founder/owner answers: identical,
+# partial overlap, disjoint, repeated stems, digits, hyphens and one-letter
+# tokens the word pattern drops.
+KEYWORD_PAIRS = [
+    ({"black", "wallet"}, {"black", "wallet"}),
+    ({"black", "wallet"}, {"black", "purse"}),
+    ({"black", "leather", "wallet", "zip"}, {"brown", "leather", "wallet"}),
+    ({"iphone", "13", "pro", "case"}, {"iphone", "case", "blue"}),
+    ({"key", "ring", "car-key"}, {"car", "key", "ring"}),
+    ({"silver", "watch"}, {"gold", "bracelet"}),
+    ({"a", "red", "umbrella"}, {"red", "umbrella", "x"}),
+    ({"student", "id", "card", "nsbm"}, {"nsbm", "id"}),
+]
+
+# Whole answers for the character n-gram feature, including whitespace runs
+# and strings shorter than the largest n-gram.
+TEXT_PAIRS = [
+    ("black leather wallet", "black leather wallet"),
+    ("black leather wallet", "blak lether wallet"),
+    ("samsung galaxy s21", "galaxy s21 samsung phone"),
+    ("it has a  scratch   on the back", "there is a scratch on the back"),
+    ("red", "rde"),
+    ("car keys with a blue tag", "house keys"),
+]
+
+
+def _sklearn_tfidf_sim(a, b):
+    # The per-pair TfidfVectorizer fit tfidf_sim used before the Counter rewrite.
+    X = TfidfVectorizer().fit_transform([" ".join(a), " ".join(b)]).toarray()
+    denom = np.linalg.norm(X[0]) * np.linalg.norm(X[1])
+    return 0.0 if denom == 0 else float(np.clip(np.dot(X[0], X[1]) / denom, 0, 1))
+
+
+def _sklearn_char_ngram_sim(a, b):
+    # The per-pair char CountVectorizer fit char_ngram_sim used before the rewrite.
+    X = CountVectorizer(analyzer="char", ngram_range=(3, 6)).fit_transform([a, b]).toarray()
+    denom = np.linalg.norm(X[0]) * np.linalg.norm(X[1])
+    return 0.0 if denom == 0 else float(np.clip(np.dot(X[0], X[1]) / denom, 0, 1))
+
+
+class TestLexicalSimilarity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nlp_module = load_nlp_module()
+        cls.nlp = cls.nlp_module.LocalNLP.__new__(cls.nlp_module.LocalNLP)
+
+    def test_tfidf_sim_matches_sklearn_vectorizer(self):
+        for founder_kw, owner_kw in KEYWORD_PAIRS:
+            with self.subTest(founder=sorted(founder_kw), owner=sorted(owner_kw)):
+                self.assertAlmostEqual(
+                    self.nlp.tfidf_sim(founder_kw, owner_kw),
+                    _sklearn_tfidf_sim(founder_kw, owner_kw),
+                    places=12,
+                )
+
+    def test_char_ngram_sim_matches_sklearn_vectorizer(self):
+        for founder, owner in TEXT_PAIRS:
+            with self.subTest(founder=founder, owner=owner):
+                self.assertAlmostEqual(
+                    self.nlp.char_ngram_sim(founder, owner),
+                    _sklearn_char_ngram_sim(founder, owner),
+                    places=12,
+                )
+
+    def test_tfidf_sim_pinned_values(self):
+        unique_idf = math.log(1.5) + 1.0
+        self.assertAlmostEqual(self.nlp.tfidf_sim({"black", "wallet"}, {"black", "wallet"}), 1.0, places=12)
+        self.assertAlmostEqual(
+            self.nlp.tfidf_sim({"black", "wallet"}, {"black", "purse"}),
+            1.0 / (1.0 + unique_idf ** 2),
+            places=12,
+        )
+        self.assertEqual(self.nlp.tfidf_sim({"silver"}, {"gold"}), 0.0)
+
+    def test_pairs_without_scorable_tokens_score_zero(self):
+        # The sklearn fit raised "empty vocabulary" here; both now score 0.
+        self.assertEqual(self.nlp.tfidf_sim({"a"}, {"b"}), 0.0)
+        self.assertEqual(self.nlp.char_ngram_sim("ab", "ab"), 0.0)
+        self.assertEqual(self.nlp.tfidf_sim(set(), {"wallet"}), 0.0)
+        self.assertEqual(self.nlp.char_ngram_sim("", "wallet"), 0.0)
+
+
+class TestOppositeAnswer(unittest.TestCase):
+    # (founder_norm, owner_norm, expected). Rows marked "changed" differ from
+    # the old substring scan, which matched "is" inside "this", counted
+    # "is not" as "is" too, and never saw apostrophe negations.
+    CASES = [
+        ("yes", "no", True),
+        ("no", "yes", True),
+        ("it is red", "it isn't red", True),
+        ("it is red", "it is not red", True),
+        ("the phone was lost on monday", "it wasnt lost", True),
+        ("right pocket", "wrong pocket", True),
+        ("i have the keys", "i don't have the keys", True),  # changed
+        ("it is not red", "the wallet is not red", False),  # changed
+        ("this wallet", "it isnt mine", False),  # changed
+        ("black leather", "brown leather", False),
+        ("they were here", "we are not here", False),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.nlp_module = load_nlp_module()
+        cls.nlp = cls.nlp_module.LocalNLP.__new__(cls.nlp_module.LocalNLP)
+
+    def test_is_opposite_answer_table(self):
+        for founder, owner, expected in self.CASES:
+            with self.subTest(founder=founder, owner=owner):
+                self.assertIs(self.nlp.is_opposite_answer(founder, owner), expected)
+
+    def test_polarities_consume_negated_phrase_once(self):
+        self.assertEqual(self.nlp.polarities("this is not red"), {("is", -1)})
+        self.assertEqual(self.nlp.polarities("this wallet"), set())
+
+    def test_prepare_pair_reports_opposite_answer(self):
+        result, ctx = self.nlp._prepare_pair("Yes, it is mine", "No, it is not", question_type="boolean")
+
+        self.assertIsNone(ctx)
+        self.assertEqual(result["reason"], "opposite_answer")
+        self.assertEqual(result["fused"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,31 @@
 """Shared Whisper transcription backend for Similarity services.
 
 Module overview:
-- Lazily loads faster-whisper once and reuses the model across requests.
+- Lazily loads faster-whisper once and shares it across concurrent requests.
 - Selects CUDA or CPU settings from environment variables with a CPU fallback.
 - Normalizes segment and word timing output for audio confidence analysis.
+- Decodes a media file's audio track to 16 kHz mono samples with one ffmpeg pipe.
 """
 
 import os
+import subprocess
 import threading
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
+import numpy as np
 from dotenv import load_dotenv
 from faster_whisper import WhisperModel
 
 load_dotenv()
 
+# Whisper's native input rate; decode_audio_pcm() resamples to it.
+SAMPLE_RATE = 16000
+# CTranslate2 intra-op threads for CPU inference; 0 keeps its default (4).
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+# CTranslate2 model workers. transcribe() calls from concurrent request
+# threads run in parallel up to this count instead of queueing on one worker.
+WHISPER_NUM_WORKERS = max(1, int(os.getenv("WHISPER_NUM_WORKERS", "2")))
+
 _model_lock = threading.Lock()
 _model_instance: WhisperModel | None = None
 _model_config: Tuple[str, str, str] | None = None
@@ -66,6 +77,8 @@ def _get_model() -> tuple[WhisperModel, str, str]:
                     candidate_model,
                     device=candidate_device,
                     compute_type=candidate_compute_type,
+                    cpu_threads=WHISPER_CPU_THREADS,
+                    num_workers=WHISPER_NUM_WORKERS,
                 )
                 _model_config = (candidate_model, candidate_device, candidate_compute_type)
                 return _model_instance, candidate_device, candidate_compute_type
@@ -75,8 +88,40 @@ def _get_model() -> tuple[WhisperModel, str, str]:
         raise RuntimeError(f"Failed to initialize faster-whisper model: {last_error}")
 
 
-def transcribe_audio(audio_path: str, with_word_timestamps: bool = False) -> Dict[str, Any]:
-    """Transcribe audio and return plain Python metadata for downstream scoring."""
+def decode_audio_pcm(media_path: str, timeout: float | None = None) -> np.ndarray:
+    """
+    Decode the audio track of a video/audio file into float32 mono samples
+    at SAMPLE_RATE, in [-1, 1].
+
+    A single ffmpeg process demuxes, decodes and resamples, streaming raw
+    s16le PCM over stdout, so no intermediate WAV touches the disk. Raises
+    subprocess.CalledProcessError (with stderr) or TimeoutExpired on failure.
+    """
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-i", media_path,
+            "-vn",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE), "-ac", "1",
+            "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20,
+        check=True,
+        timeout=timeout,
+    )
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def transcribe_audio(audio_path: Union[str, np.ndarray], with_word_timestamps: bool = False) -> Dict[str, Any]:
+    """
+    Transcribe audio and return plain Python metadata for downstream scoring.
+
+    audio_path may also be a float32 16 kHz mono sample array (see
+    decode_audio_pcm), which faster-whisper accepts directly.
+    """
     model, device, compute_type = _get_model()
     segments_iter, info = model.transcribe(
         audio_path,
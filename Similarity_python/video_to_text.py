@@ -1,46 +1,40 @@
 """Video-to-text helper for owner answer videos.
 
 Module overview:
-- Extracts a temporary WAV audio stream from a video file.
+- Decodes the video's audio track to 16 kHz mono PCM straight into memory.
 - Delegates transcription to the shared Whisper backend.
-- Cleans temporary media files after the transcript is produced.
+- Cleans the temporary video file after the transcript is produced.
 """
 
 import os
 import subprocess
-from transcription_backend import transcribe_audio
 
-def extract_text(file_path: str) -> str:
+from transcription_backend import decode_audio_pcm, transcribe_audio
+
+def extract_text(file_path: str, delete_source: bool = True) -> str:
     """
     Convert video to audio and transcribe using Whisper
     Thread-safe implementation with lock
+
+    delete_source=False leaves the input video in place for callers that
+    still need it (e.g. face analysis running concurrently on the same file).
     """
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Convert video to audio (works with mp4, mov, etc.)
-    # Create a unique output filename to avoid FFmpeg in-place editing error
-    base_path, ext = os.path.splitext(file_path)
-    audio = base_path + "_audio.wav"
-
-    # Extract audio from video using FFmpeg (suppress verbose output)
+    # Decode audio (works with mp4, mov, etc.) straight into memory with a
+    # single ffmpeg call; no intermediate WAV is written and read back.
     try:
-        subprocess.run(
-            ['ffmpeg', '-y', '-i', file_path, '-ar', '16000', '-ac', '1', audio],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
-            timeout=30
-        )
+        audio = decode_audio_pcm(file_path, timeout=30)
     except subprocess.TimeoutExpired:
         raise Exception("FFmpeg audio extraction timed out")
     except subprocess.CalledProcessError as e:
         raise Exception(f"FFmpeg failed to extract audio: {e}")
-    
-    # Check if audio file was created
-    if not os.path.exists(audio) or os.path.getsize(audio) == 0:
-        raise Exception("Audio extraction failed - no audio file created")
+
+    # Check if any audio was decoded
+    if audio.size == 0:
+        raise Exception("Audio extraction failed - no audio data produced")
 
     try:
         result = transcribe_audio(audio, with_word_timestamps=False)
@@ -50,12 +44,8 @@ def extract_text(file_path: str) -> str:
 
     print("Transcription:", text)
 
-    # Cleanup temporary audio file
-    if os.path.exists(audio):
-        os.remove(audio)
-    
     # Cleanup temporary video file
-    if os.path.exists(file_path):
+    if delete_source and os.path.exists(file_path):
         os.remove(file_path)
 
     return text
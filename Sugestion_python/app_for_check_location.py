@@ -7,36 +7,80 @@ Module overview:
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import json
 import os
+from functools import lru_cache
 from typing import List, Dict, Set
 
-from building_location_matcher import BuildingLocationMatcher
+from building_location_matcher import BuildingLocationMatcher, HallInfo
 from ground_location_matcher import GroundLocationMatcher
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by request.get_json() and
+    jsonify(). Keys stay sorted like Flask's default.
+    """
+
+    _options = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def _pretty_json(obj) -> str:
+    """Indented JSON for the request/response debug logs."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all routes
 
+# Distinct (location, floor, hall, stage) expansions remembered per matcher.
+MATCH_CACHE_MAX_ENTRIES = 4096
+
 GROUND_LOCATIONS = []
 BUILDING_FLOORS = {}
 
 
+def _read_json(path: str):
+    """Parse a map JSON file, with orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 def load_location_data():
     """Load hand-maintained map JSON into in-memory lookup data."""
     global GROUND_LOCATIONS, BUILDING_FLOORS
 
     data_folder = "data"
 
-    with open(os.path.join(data_folder, "map.json"), "r") as f:
-        GROUND_LOCATIONS = json.load(f)
+    GROUND_LOCATIONS = _read_json(os.path.join(data_folder, "map.json"))
 
+    # One directory pass, in the same order os.listdir() gave.
     BUILDING_FLOORS = {}
-    for f_name in os.listdir(data_folder):
-        if f_name.endswith(".json") and f_name != "map.json":
-            building = f_name.replace(".json", "")
-            with open(os.path.join(data_folder, f_name), "r") as f:
-                BUILDING_FLOORS[building] = json.load(f)
+    with os.scandir(data_folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.name != "map.json":
+                building = entry.name.replace(".json", "")
+                BUILDING_FLOORS[building] = _read_json(entry.path)
 
 
 load_location_data()
@@ -51,10 +95,15 @@ class LocationMatcher:
 
         self.ground_lookup = {loc["actual_location"]: loc for loc in ground_data}
         self.building_lookup = self._build_building_lookup()
+        self.hall_to_building = {hall: info.building for hall, info in self.building_lookup.items()}
 
         self.ground_matcher = GroundLocationMatcher(self.ground_lookup)
         self.building_matcher = BuildingLocationMatcher(self.building_lookup, building_data)
         self.entrance_to_building = self._build_entrance_mapping()
+        # Map expansion depends only on the owner's location fields and the
+        # static map data, so repeated requests reuse it. Item filtering
+        # depends on the posted items and always runs.
+        self._cached_match_locations = lru_cache(maxsize=MATCH_CACHE_MAX_ENTRIES)(self._match_locations)
 
     def _build_entrance_mapping(self):
         mapping = {}
@@ -73,11 +122,7 @@ class LocationMatcher:
                 f_id = str(floor.get("floor_id"))
                 for hall in floor.get("hall_list", []):
                     hall_name = hall["actual_location"]
-                    lookup[hall_name] = {
-                        "building": building,
-                        "floor_id": f_id,
-                        "directions": hall.get("directions"),
-                    }
+                    lookup[hall_name] = HallInfo(building, f_id, hall.get("directions"))
         return lookup
 
     def get_matched_items(self, owner: Dict):
@@ -89,6 +134,30 @@ class LocationMatcher:
         category_data = owner.get("categary_data", [])
         floor_int = self._to_int_floor(floor)
 
+        try:
+            loc_type, matched = self._cached_match_locations(owner_loc, floor, hall, stage)
+        except TypeError:
+            # Unhashable JSON values (lists/objects) cannot be cache keys.
+            loc_type, matched = self._match_locations(owner_loc, floor, hall, stage)
+
+        matched_ids = self._filter_items(category_data, owner_loc, floor_int, hall, stage, matched)
+
+        if not matched_ids:
+            # If the selected stage is too narrow, broaden only the item filter.
+            # This avoids returning an empty list when map data is sparse.
+            matched = frozenset()
+            matched_ids = self._filter_items(category_data, owner_loc, floor_int, hall, 3, matched)
+
+        return {
+            "location_type": loc_type,
+            "matched_locations": sorted(matched),
+            "matched_ids": matched_ids
+        }
+
+    def _match_locations(self, owner_loc, floor, hall, stage):
+        """Pick the matcher for the owner's location fields; return (location type, matched names)."""
+        floor_int = self._to_int_floor(floor)
+
         if hall:
             # Hall matching requires floor context; fall back to provided floor if parse failed.
             floor_for_match = floor_int if floor_int is not None else floor
@@ -108,19 +177,8 @@ class LocationMatcher:
             matched = self.ground_matcher.match(owner_loc, stage)
             loc_type = "ground_location"
 
-        matched_ids = self._filter_items(category_data, owner_loc, floor_int, hall, stage, matched)
-
-        if not matched_ids:
-            # If the selected stage is too narrow, broaden only the item filter.
-            # This avoids returning an empty list when map data is sparse.
-            matched = set()
-            matched_ids = self._filter_items(category_data, owner_loc, floor_int, hall, 3, matched)
-
-        return {
-            "location_type": loc_type,
-            "matched_locations": sorted(list(matched)),
-            "matched_ids": matched_ids
-        }
+        # Frozen because cached results are shared between requests.
+        return loc_type, frozenset(matched)
 
     def _is_building_location(self, location: str):
         if location in self.ground_lookup:
@@ -143,6 +201,11 @@ class LocationMatcher:
         actual_building = self.entrance_to_building.get(owner_loc, owner_loc)
         is_entrance = owner_loc in self.entrance_to_building
         owner_floor_int = self._to_int_floor(owner_floor)
+        nearby_floors = (
+            (owner_floor_int, owner_floor_int + 1, owner_floor_int - 1)
+            if owner_floor_int is not None else ()
+        )
+        hall_to_building = self.hall_to_building
 
         for item in items:
             for found in item.get("found_location", []):
@@ -159,10 +222,7 @@ class LocationMatcher:
                     if stage == 1:
                         ok = loc == actual_building and floor_int == owner_floor_int
                     elif stage == 2:
-                        ok = (
-                            loc == actual_building and
-                            floor_int in [owner_floor_int, owner_floor_int + 1, owner_floor_int - 1]
-                        )
+                        ok = loc == actual_building and floor_int in nearby_floors
                     elif stage == 3:
                         ok = loc == actual_building
 
@@ -171,7 +231,7 @@ class LocationMatcher:
                         continue
                     if loc in matched_locations:
                         ok = True
-                    elif hall in matched_locations and self.building_lookup.get(hall, {}).get("building") == loc:
+                    elif hall in matched_locations and hall_to_building.get(hall) == loc:
                         ok = True
 
                 if ok:
@@ -181,6 +241,11 @@ class LocationMatcher:
         return matched_ids
 
 
+# The map data is static after startup and matching never mutates the
+# matcher, so its lookup tables are built once and shared by all requests.
+MATCHER = LocationMatcher(GROUND_LOCATIONS, BUILDING_FLOORS)
+
+
 @app.route("/api/find-items", methods=["POST"])
 def find_items():
     """Validate the HTTP payload, run location matching, and return candidate item IDs."""
@@ -191,7 +256,7 @@ def find_items():
     # Debug log: print full incoming JSON body in terminal.
     try:
         print("\n[Suggestion API] Incoming /api/find-items payload:")
-        print(json.dumps(data, indent=2, ensure_ascii=False))
+        print(_pretty_json(data))
     except Exception:
         print("[Suggestion API] Incoming /api/find-items payload (raw):", request.get_data(as_text=True))
 
@@ -209,16 +274,14 @@ def find_items():
     if stage == 4:
         # Stage 4 means location confidence is unavailable, so category items
         # are returned without spatial filtering.
-        all_ids = []
-        all_locations = set()
-
-        for item in data.get("categary_data", []):
-            all_ids.append(item["id"])
-
-            for found in item.get("found_location", []):
-                loc = found.get("location")
-                if loc:
-                    all_locations.add(loc)
+        category_data = data.get("categary_data", [])
+        all_ids = [item["id"] for item in category_data]
+        all_locations = {
+            found["location"]
+            for item in category_data
+            for found in item.get("found_location", [])
+            if found.get("location")
+        }
 
         response_payload = {
             "success": True,
@@ -227,12 +290,11 @@ def find_items():
             "matched_item_ids": all_ids
         }
         print("[Suggestion API] Response payload:")
-        print(json.dumps(response_payload, indent=2, ensure_ascii=False))
+        print(_pretty_json(response_payload))
         return jsonify(response_payload), 200
 
     try:
-        matcher = LocationMatcher(GROUND_LOCATIONS, BUILDING_FLOORS)
-        result = matcher.get_matched_items(data)
+        result = MATCHER.get_matched_items(data)
 
         response_payload = {
             "success": True,
@@ -241,7 +303,7 @@ def find_items():
             "matched_item_ids": result["matched_ids"]
         }
         print("[Suggestion API] Response payload:")
-        print(json.dumps(response_payload, indent=2, ensure_ascii=False))
+        print(_pretty_json(response_payload))
         return jsonify(response_payload)
 
     except Exception as e:
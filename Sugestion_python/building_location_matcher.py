@@ -6,16 +6,43 @@ Module overview:
 - Leaves item filtering to the API coordinator so this class stays map-focused.
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+class HallInfo(NamedTuple):
+    """Static location of one hall, as stored in the building lookup."""
+
+    building: str
+    floor_id: str
+    directions: Optional[Dict[str, str]]
 
 
 class BuildingLocationMatcher:
     """Expands building locations according to the owner's confidence stage."""
 
-    def __init__(self, building_lookup: Dict, building_data: Dict):
+    def __init__(self, building_lookup: Dict[str, HallInfo], building_data: Dict):
         self.building_lookup = building_lookup
         self.building_data = building_data
 
+        # Hall names per (building, floor_id) and per building, so floor and
+        # building expansion read only the halls they return.
+        self.halls_by_floor: Dict[Tuple[str, str], List[str]] = {}
+        self.halls_by_building: Dict[str, List[str]] = {}
+        for hall_name, info in building_lookup.items():
+            self.halls_by_floor.setdefault((info.building, info.floor_id), []).append(hall_name)
+            self.halls_by_building.setdefault(info.building, []).append(hall_name)
+
+        # Reverse adjacency: hall -> halls whose left/right/front points at it.
+        self.hall_reverse: Dict[str, Set[str]] = {}
+        for hall_name, info in building_lookup.items():
+            if hall_name == "n/a":
+                continue
+            directions = info.directions or {}
+            for direction in ["left", "right", "front"]:
+                target = directions.get(direction)
+                if target:
+                    self.hall_reverse.setdefault(target, set()).add(hall_name)
+
     def match_with_hall(self, building: str, floor: int, hall_name: str, stage: int) -> Set[str]:
         """Match a named hall, then optionally adjacent and reverse-adjacent halls."""
         matched = set()
@@ -26,44 +53,32 @@ class BuildingLocationMatcher:
         if stage >= 2:
             hall_info = self.building_lookup.get(hall_name)
             if hall_info:
-                directions = hall_info.get("directions", {})
+                directions = hall_info.directions or {}
                 for direction in ["left", "right", "front"]:
                     adj_hall = directions.get(direction)
                     if adj_hall and adj_hall != "n/a":
                         matched.add(adj_hall)
 
         if stage >= 3:
-            for h_name, info in self.building_lookup.items():
-                if h_name == "n/a":
-                    continue
-                if info["building"] == building and info["floor_id"] == str(floor):
-                    directions = info.get("directions", {})
-                    for direction in ["left", "right", "front"]:
-                        if directions.get(direction) == hall_name:
-                            matched.add(h_name)
-                            break
+            floor_str = str(floor)
+            for h_name in self.hall_reverse.get(hall_name, ()):
+                info = self.building_lookup[h_name]
+                if info.building == building and info.floor_id == floor_str:
+                    matched.add(h_name)
 
         return matched
 
     def match_with_floor(self, building: str, floor: int, stage: int) -> Set[str]:
         """Match halls on the same floor, nearby floors, or the whole building."""
-        matched = set()
-        floor_str = str(floor)
-
-        for hall_name, info in self.building_lookup.items():
-            if hall_name != "n/a" and info["building"] == building and info["floor_id"] == floor_str:
-                matched.add(hall_name)
+        matched = set(self.halls_by_floor.get((building, str(floor)), ()))
+        matched.discard("n/a")
 
         if stage >= 2:
-            for hall_name, info in self.building_lookup.items():
-                if info["building"] == building:
-                    if info["floor_id"] in [str(floor + 1), str(floor - 1)]:
-                        matched.add(hall_name)
+            matched.update(self.halls_by_floor.get((building, str(floor + 1)), ()))
+            matched.update(self.halls_by_floor.get((building, str(floor - 1)), ()))
 
         if stage >= 3:
-            for hall_name, info in self.building_lookup.items():
-                if info["building"] == building:
-                    matched.add(hall_name)            
+            matched.update(self.halls_by_building.get(building, ()))
 
         return matched
 
@@ -71,6 +86,9 @@ class BuildingLocationMatcher:
         """Handle requests that know the building but not the exact floor or hall."""
         matched = set()
 
+        # ground_lookup is keyed by actual_location, so the entrance is a key.
+        entrance = building + "_entrance"
+
         # Stage 1 is strict: only the named building is considered.
         if stage == 1:
             matched.add(building)
@@ -81,9 +99,8 @@ class BuildingLocationMatcher:
         if stage == 2:
             matched.add(building)
             # Add ONLY the entrance, not the whole halls
-            for ground_name, info in ground_lookup.items():
-                if building + "_entrance" == info["actual_location"]:
-                    matched.add(info["actual_location"])
+            if entrance in ground_lookup:
+                matched.add(entrance)
             return matched
 
         # Stage 3 includes nearby ground points while still avoiding all halls.
@@ -91,9 +108,8 @@ class BuildingLocationMatcher:
             matched.add(building)
 
             # Add entrance
-            for ground_name, info in ground_lookup.items():
-                if building + "_entrance" == info["actual_location"]:
-                    matched.add(info["actual_location"])
+            if entrance in ground_lookup:
+                matched.add(entrance)
 
             # Add ground adjacents (no halls)
             if building in ground_lookup:
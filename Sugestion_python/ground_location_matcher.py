@@ -15,6 +15,15 @@ class GroundLocationMatcher:
     def __init__(self, ground_lookup: Dict):
         self.ground_lookup = ground_lookup
 
+        # Reverse adjacency: location -> ground locations with a direction
+        # pointing at it (placeholder targets included, as the scan matched them).
+        self.reverse_adjacent: Dict[str, Set[str]] = {}
+        for loc_name, info in ground_lookup.items():
+            if loc_name == "n/a":
+                continue
+            for adj_loc in info.get("directions", {}).values():
+                self.reverse_adjacent.setdefault(adj_loc, set()).add(loc_name)
+
     def match(self, location: str, stage: int) -> Set[str]:
         """Return all ground locations allowed by the requested confidence stage."""
         matched = set()
@@ -26,15 +35,9 @@ class GroundLocationMatcher:
             matched.update(self.get_adjacent(location))
 
         if stage >= 3:
-            owner_adjacent = self.get_adjacent(location)
-            for loc_name, info in self.ground_lookup.items():
-                if loc_name in matched or loc_name == "n/a":
-                    continue
-                directions = info.get("directions", {})
-                for adj_loc in directions.values():
-                    if adj_loc == location or adj_loc in owner_adjacent:
-                        matched.add(loc_name)
-                        break
+            # Locations pointing at the owner's location or at any neighbour.
+            for target in {location} | self.get_adjacent(location):
+                matched.update(self.reverse_adjacent.get(target, ()))
 
         return matched
 
@@ -0,0 +1,20 @@
+"""Gunicorn settings for the location suggestion service (Linux deployments).
+
+Run with:
+    gunicorn -c gunicorn.conf.py app_for_check_location:app
+
+Module overview:
+- Preloads the app in the master so the campus map JSON and the shared
+  LocationMatcher are built once and inherited by every worker.
+- Uses threaded workers: requests are short, in-memory set lookups, so a few
+  threads per worker cover JSON parsing and client I/O without extra processes.
+"""
+
+import os
+
+bind = os.getenv("SUGGESTION_BIND", "0.0.0.0:5004")
+preload_app = True
+workers = int(os.getenv("SUGGESTION_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("SUGGESTION_THREADS", "4"))
+timeout = int(os.getenv("SUGGESTION_TIMEOUT", "30"))